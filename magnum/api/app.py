@@ -24,7 +24,6 @@ from magnum.api import config as api_config
 from magnum.api import middleware
 from magnum.common import config as common_config
 from magnum.common import service
-from magnum.common.utils import print_debug
 
 CONF = magnum.conf.CONF
 
@@ -19,12 +19,13 @@ import six
 from magnum.api.controllers import versions
 from magnum.api import versioned_method
 from magnum.common import exception
+from magnum.common import tracing
 from magnum.i18n import _
+import pecan
 from pecan import rest
 from webob import exc
 import wsme
 from wsme import types as wtypes
-from magnum.common.utils import print_debug
 
 
 # name of attribute to keep version method information
@@ -40,8 +41,8 @@ class APIBase(wtypes.Base):
     """The time in UTC at which the object is updated"""
 
     def as_dict(self):
-        print_debug("APIBase.as_dict called")
         """Render this object as a dict of its fields."""
+        tracing.trace("APIBase.as_dict")
         return {k: getattr(self, k)
                 for k in self.fields
                 if hasattr(self, k) and
@@ -53,7 +54,7 @@ class APIBase(wtypes.Base):
         :param except_list: A list of fields that won't be touched.
 
         """
-        print_debug("APIBase.unset_fields_except called")
+        tracing.trace("APIBase.unset_fields_except")
         if except_list is None:
             except_list = []
 
@@ -62,6 +63,51 @@ class APIBase(wtypes.Base):
                 setattr(self, k, wsme.Unset)
 
 
+class VersionedMethodDispatcher(object):
+    """Select the method matching the API version of the request.
+
+    Replaces the versioned methods of a controller class. The method to
+    call for a version is looked up in the versioned methods of the class
+    once, and then kept in a table, so that attributes of controllers are
+    looked up as usual and versioned methods at the cost of a dict lookup.
+    """
+
+    def __init__(self, name, default):
+        self.name = name
+        # The last definition of the method, returned when it is looked up
+        # on the class rather than on a controller.
+        self.default = default
+        self._table = {}
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.default
+
+        ver = pecan.request.version
+        key = (owner, ver.major, ver.minor)
+        try:
+            func = self._table[key]
+        except KeyError:
+            func = self._table[key] = self._select(owner, ver)
+        return func.__get__(instance, owner)
+
+    def _select(self, owner, ver):
+        """Select the correct method based on version
+
+        @return: Returns the correct versioned method
+        @raises: HTTPNotAcceptable if there is no method which
+             matches the name and version constraints
+        """
+        for func in getattr(owner, VER_METHOD_ATTR)[self.name]:
+            if ver.matches(func.start_version, func.end_version):
+                return func.func
+
+        raise exc.HTTPNotAcceptable(_(
+            "Version %(ver)s was requested but the requested API %(api)s "
+            "is not supported for this version.") % {'ver': ver,
+                                                     'api': self.name})
+
+
 class ControllerMetaclass(type):
     """Controller metaclass.
 
@@ -70,8 +116,8 @@ class ControllerMetaclass(type):
     """
 
     def __new__(mcs, name, bases, cls_dict):
-        print_debug("ControllerMetaclass.__new__ called")
         """Adds version function dictionary to the class."""
+        tracing.trace("ControllerMetaclass.__new__")
 
         versioned_methods = None
 
@@ -89,6 +135,10 @@ class ControllerMetaclass(type):
 
         if versioned_methods:
             cls_dict[VER_METHOD_ATTR] = versioned_methods
+            for method_name in versioned_methods:
+                if method_name in cls_dict:
+                    cls_dict[method_name] = VersionedMethodDispatcher(
+                        method_name, cls_dict[method_name])
 
         return super(ControllerMetaclass, mcs).__new__(mcs, name, bases,
                                                        cls_dict)
@@ -98,40 +148,6 @@ class ControllerMetaclass(type):
 class Controller(rest.RestController):
     """Base Rest Controller"""
 
-    def __getattribute__(self, key):
-        print_debug("Controller.__getattribute__ called")
-        print("Key: {}".format(key))
-        def version_select():
-            """Select the correct method based on version
-
-            @return: Returns the correct versioned method
-            @raises: HTTPNotAcceptable if there is no method which
-                 matches the name and version constraints
-            """
-
-            from pecan import request
-            ver = request.version
-
-            func_list = self.versioned_methods[key]
-            for func in func_list:
-                if ver.matches(func.start_version, func.end_version):
-                    return func.func
-
-            raise exc.HTTPNotAcceptable(_(
-                "Version %(ver)s was requested but the requested API %(api)s "
-                "is not supported for this version.") % {'ver': ver,
-                                                         'api': key})
-
-        try:
-            version_meth_dict = object.__getattribute__(self, VER_METHOD_ATTR)
-        except AttributeError:
-            # No versioning on this class
-            return object.__getattribute__(self, key)
-        if version_meth_dict and key in version_meth_dict:
-            return version_select().__get__(self, self.__class__)
-
-        return object.__getattribute__(self, key)
-
     # NOTE: This decorator MUST appear first (the outermost
     # decorator) on an API method for it to work correctly
     @classmethod
@@ -161,7 +177,7 @@ class Controller(rest.RestController):
         @raises: ApiVersionsIntersect if an version overlap is found between
             method versions.
         """
-        print_debug("Controller.api_version called")
+        tracing.trace("Controller.api_version")
 
         def decorator(f):
             obj_min_ver = versions.Version('', '', '', min_ver)
@@ -215,7 +231,7 @@ class Controller(rest.RestController):
         :param func_list: list of VersionedMethod objects
         :return: boolean
         """
-        print_debug("Controller.check_for_versions_intersection called")
+        tracing.trace("Controller.check_for_versions_intersection")
 
         pairs = []
         counter = 0
@@ -36,8 +36,8 @@ from magnum.api.controllers.v1 import stats
 from magnum.api.controllers import versions as ver
 from magnum.api import expose
 from magnum.api import http_error
+from magnum.common import tracing
 from magnum.i18n import _
-from magnum.common.utils import print_debug
 
 
 LOG = logging.getLogger(__name__)
@@ -205,11 +205,11 @@ class Controller(controllers_base.Controller):
         # NOTE: The reason why convert() it's being called for every
         #       request is because we need to get the host url from
         #       the request object to make the links.
-        print_debug("Controller.get called")
+        tracing.trace("Controller.get")
         return V1.convert()
 
     def _check_version(self, version, headers=None):
-        print_debug("Controller._check_version called")
+        tracing.trace("Controller._check_version")
         if headers is None:
             headers = {}
         # ensure that major version in the URL matches the header
@@ -237,7 +237,7 @@ class Controller(controllers_base.Controller):
 
     @pecan.expose()
     def _route(self, args):
-        print_debug("VersionController._route called")
+        tracing.trace("VersionController._route")
         version = ver.Version(
             pecan.request.headers, MIN_VER_STR, MAX_VER_STR)
 
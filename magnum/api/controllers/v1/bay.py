@@ -335,6 +335,7 @@ class BaysController(base.Controller):
         bays = objects.Cluster.list(pecan.request.context, limit,
                                     marker_obj, sort_key=sort_key,
                                     sort_dir=sort_dir)
+        objects.Cluster.preload_rollups(pecan.request.context, bays)
 
         return BayCollection.convert_with_links(bays, limit,
                                                 url=resource_url,
@@ -37,11 +37,11 @@ from magnum.api import validation
 from magnum.common import exception
 from magnum.common import name_generator
 from magnum.common import policy
+from magnum.common import tracing
 import magnum.conf
 from magnum.i18n import _
 from magnum import objects
 from magnum.objects import fields
-from magnum.common.utils import print_debug
 
 LOG = logging.getLogger(__name__)
 CONF = magnum.conf.CONF
@@ -359,6 +359,7 @@ class ClustersController(base.Controller):
         clusters = objects.Cluster.list(pecan.request.context, limit,
                                         marker_obj, sort_key=sort_key,
                                         sort_dir=sort_dir)
+        objects.Cluster.preload_rollups(pecan.request.context, clusters)
 
         return ClusterCollection.convert_with_links(clusters, limit,
                                                     url=resource_url,
@@ -379,12 +380,12 @@ class ClustersController(base.Controller):
         :param sort_key: column to sort results by. Default: id.
         :param sort_dir: direction to sort. "asc" or "desc". Default: asc.
         """
-        print_debug("ClustersController.get_all() called")
         context = pecan.request.context
         policy.enforce(context, 'cluster:get_all',
                        action='cluster:get_all')
-        return self._get_clusters_collection(marker, limit, sort_key,
-                                             sort_dir)
+        with tracing.span("ClustersController.get_all", limit=limit):
+            return self._get_clusters_collection(marker, limit, sort_key,
+                                                 sort_dir)
 
     @expose.expose(ClusterCollection, types.uuid, int, wtypes.text,
                    wtypes.text)
@@ -15,8 +15,8 @@
 
 from webob import exc
 
+from magnum.common import tracing
 from magnum.i18n import _
-from magnum.common.utils import print_debug
 
 #
 # For each newly added microversion change, update the API version history
@@ -64,7 +64,7 @@ class Version(object):
         :param from_string: create the version from string not headers
         :raises: webob.HTTPNotAcceptable
         """
-        print_debug("Version.__init__ called")
+        tracing.trace("Version.__init__")
 
         if from_string:
             (self.major, self.minor) = tuple(int(i)
@@ -76,7 +76,7 @@ class Version(object):
                                                              latest_version)
 
     def __repr__(self):
-        print_debug("Version.__repr__ called")
+        tracing.trace("Version.__repr__")
         return '%s.%s' % (self.major, self.minor)
 
     @staticmethod
@@ -89,7 +89,7 @@ class Version(object):
         :returns: a tuple of (major, minor) version numbers
         :raises: webob.HTTPNotAcceptable
         """
-        print_debug("Version.parse_headers called")
+        tracing.trace("Version.parse_headers")
         version_hdr = headers.get(Version.string, default_version)
 
         try:
@@ -115,18 +115,18 @@ class Version(object):
         return version
 
     def is_null(self):
-        print_debug("Version.is_null called")
+        tracing.trace("Version.is_null")
         return self.major == 0 and self.minor == 0
 
     def matches(self, start_version, end_version):
-        print_debug("Version.matches called")
+        tracing.trace("Version.matches")
         if self.is_null():
             raise ValueError
 
         return start_version <= self <= end_version
 
     def __lt__(self, other):
-        print_debug("Version.__lt__ called")
+        tracing.trace("Version.__lt__")
         if self.major < other.major:
             return True
         if self.major == other.major and self.minor < other.minor:
@@ -134,7 +134,7 @@ class Version(object):
         return False
 
     def __gt__(self, other):
-        print_debug("Version.__gt__ called")
+        tracing.trace("Version.__gt__")
         if self.major > other.major:
             return True
         if self.major == other.major and self.minor > other.minor:
@@ -142,17 +142,17 @@ class Version(object):
         return False
 
     def __eq__(self, other):
-        print_debug("Version.__eq__ called")
+        tracing.trace("Version.__eq__")
         return self.major == other.major and self.minor == other.minor
 
     def __le__(self, other):
-        print_debug("Version.__le__ called")
+        tracing.trace("Version.__le__")
         return self < other or self == other
 
     def __ne__(self, other):
-        print_debug("Version.__ne__ called")
+        tracing.trace("Version.__ne__")
         return not self.__eq__(other)
 
     def __ge__(self, other):
-        print_debug("Version.__ge__ called")
+        tracing.trace("Version.__ge__")
         return self > other or self == other
@@ -12,14 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_log import log as logging
 from pecan import hooks
 
 from magnum.common import context
+from magnum.common import policy
 from magnum.conductor import api as conductor_api
 import magnum.conf.keystone
 
 
 CONF = magnum.conf.CONF
+LOG = logging.getLogger(__name__)
 
 
 class ContextHook(hooks.PecanHook):
@@ -76,6 +79,15 @@ class ContextHook(hooks.PecanHook):
             domain_name=domain_name,
             roles=roles)
 
+    def after(self, state):
+        ctx = getattr(state.request, 'context', None)
+        if not isinstance(ctx, context.RequestContext):
+            return
+        LOG.debug('%(method)s %(path)s made %(checks)d policy checks and '
+                  '%(keystone_calls)d Keystone calls to build their targets',
+                  dict(policy.stats(ctx), method=state.request.method,
+                       path=state.request.path))
+
 
 class RPCHook(hooks.PecanHook):
     """Attach the rpcapi object to the request so controllers can get to it."""
@@ -20,6 +20,7 @@ from typing import Optional
 from oslo_concurrency import processutils
 from oslo_log import log as logging
 from oslo_reports import guru_meditation_report as gmr
+from oslo_service import service as os_service
 from paste.urlmap import URLMap
 from werkzeug import serving
 
@@ -27,6 +28,7 @@ import magnum.conf
 from magnum.api import app as api_app
 from magnum.common import profiler
 from magnum.common import service
+from magnum.common import wsgi_service
 from magnum.i18n import _
 from magnum.objects import base
 from magnum import version
@@ -67,6 +69,7 @@ def main():
 
     # SSL configuration, True if enabled_ssl is True
     use_ssl = CONF.api.enabled_ssl  # type: bool
+    ssl_context = _get_ssl_configs(use_ssl)
 
     # Create the WSGI server and start it
     host, port = CONF.api.host, CONF.api.port
@@ -78,6 +81,10 @@ def main():
     LOG.info('Serving on %(proto)s://%(host)s:%(port)s',
              dict(proto="https" if use_ssl else "http", host=host, port=port))
 
+    if CONF.api.server_mode == 'prefork':
+        _serve_prefork(app, use_ssl)
+        return
+
     workers = CONF.api.workers  # type: Optional[int]
     if not workers:
         workers = processutils.get_worker_count()  # get the number of CPU's core of the host
@@ -86,4 +93,15 @@ def main():
 
     # Run the server
     serving.run_simple(host, port, app, processes=workers,
-                       ssl_context=_get_ssl_configs(use_ssl))
+                       ssl_context=ssl_context)
+
+
+def _serve_prefork(app, use_ssl):
+    server = wsgi_service.WSGIService('magnum_api', app, use_ssl=use_ssl)
+    LOG.info('Server will handle requests in %(workers)s processes, each '
+             'serving up to %(threads)s concurrent requests',
+             {'workers': server.workers, 'threads': CONF.api.threads})
+
+    launcher = os_service.ProcessLauncher(CONF, restart_method='mutate')
+    launcher.launch_service(server, workers=server.workers)
+    launcher.wait()
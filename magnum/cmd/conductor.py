@@ -68,7 +68,9 @@ def main():
     # NOTE(mnaser): We create the periodic tasks here so that they
     #               can be attached to the main process and not
     #               duplicated in all the children if multiple
-    #               workers are being used.
+    #               workers are being used. Set
+    #               [conductor]periodic_sync_sharding to split the
+    #               polling between the conductor hosts instead.
     server.create_periodic_tasks()
     server.start()
 
@@ -0,0 +1,77 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process caches for values looked up from other services."""
+
+import threading
+
+import cachetools
+
+
+class TTLCache(object):
+    """Thread-safe TTL cache which counts its hits and misses.
+
+    A ``ttl`` of 0 disables caching: every lookup calls the loader and
+    counts as a miss.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self._cache = cachetools.TTLCache(maxsize=maxsize, ttl=ttl)
+        self._enabled = bool(ttl and maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key, loader):
+        """Return the value cached for ``key``, calling ``loader`` if none.
+
+        The loader is called outside of the lock, so that a slow lookup
+        does not hold up the other keys. Concurrent misses of a key may
+        therefore each call the loader.
+        """
+        with self._lock:
+            if self._enabled:
+                try:
+                    value = self._cache[key]
+                except KeyError:
+                    pass
+                else:
+                    self.hits += 1
+                    return value
+            self.misses += 1
+
+        value = loader()
+        if self._enabled:
+            with self._lock:
+                self._cache[key] = value
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def invalidate_matching(self, predicate):
+        """Drop the values of all the keys for which predicate is true."""
+        with self._lock:
+            for key in [key for key in self._cache if predicate(key)]:
+                self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        """Return the hit and miss counts and the number of cached keys."""
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._cache)}
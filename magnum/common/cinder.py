@@ -15,12 +15,17 @@
 from oslo_config import cfg
 from oslo_log import log as logging
 
+from magnum.common import cache
 from magnum.common import clients
 from magnum.common import exception
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+# Name of the first volume type, per region and project. Created on first use,
+# see _get_volume_type_cache.
+_volume_type_cache = None
+
 
 def get_default_docker_volume_type(context):
     return (CONF.cinder.default_docker_volume_type or
@@ -37,10 +42,45 @@ def get_default_etcd_volume_type(context):
             _get_random_volume_type(context))
 
 
-def _get_random_volume_type(context):
+def _get_volume_type_cache():
+    global _volume_type_cache
+    if _volume_type_cache is None:
+        _volume_type_cache = cache.TTLCache(
+            maxsize=CONF.cinder.volume_type_cache_size,
+            ttl=CONF.cinder.volume_type_cache_ttl)
+    return _volume_type_cache
+
+
+def reset_volume_type_cache():
+    """Drop the cache, so that it is rebuilt from the current options."""
+    global _volume_type_cache
+    _volume_type_cache = None
+
+
+def volume_type_cache_stats():
+    """Return the hit and miss counts of the volume type cache."""
+    return _get_volume_type_cache().stats()
+
+
+def _get_first_volume_type(context):
     c_client = clients.OpenStackClients(context).cinder()
     volume_types = c_client.volume_types.list()
     if volume_types:
         return volume_types[0].name
+    return None
+
+
+def _get_random_volume_type(context):
+    # The volume types visible to a project only change when an operator
+    # changes them, cache the one picked rather than listing them for each
+    # of the volumes of every cluster.
+    key = (CONF.cinder_client.region_name, context.project_id)
+    volume_type_cache = _get_volume_type_cache()
+    volume_type = volume_type_cache.get_or_load(
+        key, lambda: _get_first_volume_type(context))
+    if volume_type:
+        return volume_type
     else:
+        # Look again next time, the volume types may have been created.
+        volume_type_cache.invalidate(key)
         raise exception.VolumeTypeNotFound()
@@ -62,6 +62,9 @@ class RequestContext(context.RequestContext):
         self.trust_id = trust_id
         self.all_tenants = all_tenants
         self.password = password
+        # Number of policy checks made with this context and of Keystone
+        # calls made to build their targets, see policy.stats.
+        self.policy_stats = {'checks': 0, 'keystone_calls': 0}
         if is_admin is None:
             self.is_admin = policy.check_is_admin(self)
         else:
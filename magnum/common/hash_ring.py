@@ -0,0 +1,77 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Consistent hash ring used to share work between magnum services."""
+
+import bisect
+import hashlib
+
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+def _hash(key):
+    digest = hashlib.sha256(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+class HashRing(object):
+    """Map keys onto a set of hosts.
+
+    Every host is placed ``replicas`` times on the ring, so that keys are
+    spread evenly and only the keys of a host that leaves or joins the ring
+    move to another host.
+    """
+
+    def __init__(self, hosts, replicas=64):
+        self.hosts = frozenset(hosts)
+        self._ring = sorted((_hash('%s-%d' % (host, i)), host)
+                            for host in self.hosts
+                            for i in range(replicas))
+        self._keys = [position for position, _host in self._ring]
+
+    def get_host(self, key):
+        """Return the host owning ``key``, or None if the ring is empty."""
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._keys, _hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class ServiceHashRing(object):
+    """Hash ring over the live hosts running a magnum binary.
+
+    The caller tells which hosts are live, e.g. from the heartbeats stored
+    in the magnum_service table, so that the ring rebalances once a host
+    stops reporting. The local host is always a member, to keep its share
+    polled while its own heartbeat is late.
+    """
+
+    def __init__(self, binary, host):
+        self.binary = binary
+        self.host = host
+        self.ring = HashRing([host])
+
+    def refresh(self, hosts):
+        """Rebuild the ring if the set of live ``hosts`` changed."""
+        hosts = set(hosts)
+        hosts.add(self.host)
+        if hosts != self.ring.hosts:
+            LOG.info("Rebuilding %(binary)s hash ring with hosts %(hosts)s",
+                     {'binary': self.binary, 'hosts': sorted(hosts)})
+            self.ring = HashRing(hosts)
+        return self.ring
+
+    def owns(self, key):
+        """Whether ``key`` is handled by the local host."""
+        return self.ring.get_host(key) == self.host
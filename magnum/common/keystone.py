@@ -19,6 +19,7 @@ import keystoneclient.exceptions as kc_exception
 from keystoneclient.v3 import client as kc_v3
 from oslo_log import log as logging
 
+from magnum.common import cache
 from magnum.common import exception
 import magnum.conf
 from magnum.conf import keystone as ksconf
@@ -27,6 +28,11 @@ from magnum.i18n import _
 CONF = magnum.conf.CONF
 LOG = logging.getLogger(__name__)
 
+# Trustee domain id and project of trustee users, looked up with the
+# domain admin credentials. Created on first use, see _get_trustee_cache.
+_trustee_cache = None
+_TRUSTEE_DOMAIN_KEY = 'trustee_domain_id'
+
 
 class KeystoneClientV3(object):
     """Keystone client wrapper so we can encapsulate logic in one place."""
@@ -264,6 +270,7 @@ class KeystoneClientV3(object):
         return user
 
     def delete_trustee(self, trustee_id):
+        _get_trustee_cache().invalidate(('user_project', trustee_id))
         try:
             self.domain_admin_client.users.delete(trustee_id)
         except kc_exception.NotFound:
@@ -325,3 +332,59 @@ def is_octavia_enabled():
         return True
 
     return False
+
+
+def _get_trustee_cache():
+    global _trustee_cache
+    if _trustee_cache is None:
+        _trustee_cache = cache.TTLCache(
+            maxsize=CONF.trust.trustee_cache_size + 1,
+            ttl=CONF.trust.trustee_cache_ttl)
+    return _trustee_cache
+
+
+def reset_trustee_cache():
+    """Drop the cache, so that it is rebuilt from the current options."""
+    global _trustee_cache
+    _trustee_cache = None
+
+
+def trustee_cache_stats():
+    """Return the hit and miss counts of the trustee cache."""
+    return _get_trustee_cache().stats()
+
+
+def _admin_client():
+    # Put the import here to avoid circular importing.
+    from magnum.common import context
+    return KeystoneClientV3(context.make_admin_context(all_tenants=True))
+
+
+def get_trustee_domain_id(counters=None):
+    """Return the id of the trustee domain.
+
+    The id is kept in memory for ``[trust]trustee_cache_ttl`` seconds, to
+    spare authenticating as the domain admin on every lookup.
+
+    :param counters: dict whose ``keystone_calls`` item is incremented when
+                     the id has to be looked up in Keystone
+    """
+    def load():
+        if counters is not None:
+            counters['keystone_calls'] = counters.get('keystone_calls', 0) + 1
+        return _admin_client().trustee_domain_id
+
+    return _get_trustee_cache().get_or_load(_TRUSTEE_DOMAIN_KEY, load)
+
+
+def get_trustee_user_project(user_id):
+    """Return the id of the project a trustee user was created for.
+
+    Trustee users have no project of their own, their name is made of the
+    UUID and the project id of the cluster they belong to.
+    """
+    def load():
+        user_name = _admin_client().client.users.get(user_id).name
+        return user_name.split('_', 2)[1]
+
+    return _get_trustee_cache().get_or_load(('user_project', user_id), load)
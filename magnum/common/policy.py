@@ -19,11 +19,10 @@ import decorator
 from oslo_config import cfg
 from oslo_policy import opts
 from oslo_policy import policy
-from oslo_utils import importutils
 import pecan
 
-from magnum.common import clients
 from magnum.common import exception
+from magnum.common import keystone
 from magnum.common import policies
 
 
@@ -104,21 +103,32 @@ def enforce(context, rule=None, target=None,
     if target is None:
         target = {'project_id': context.project_id,
                   'user_id': context.user_id}
-    add_policy_attributes(target)
+    # Contexts which do not come from magnum have no counters.
+    counters = getattr(context, 'policy_stats', None)
+    if counters is not None:
+        counters['checks'] += 1
+    add_policy_attributes(target, counters=counters)
     return enforcer.enforce(rule, target, credentials,
                             do_raise=do_raise, exc=exc, *args, **kwargs)
 
 
-def add_policy_attributes(target):
+def add_policy_attributes(target, counters=None):
     """Adds extra information for policy enforcement to raw target object"""
-    context = importutils.import_module('magnum.common.context')
-    admin_context = context.make_admin_context()
-    admin_osc = clients.OpenStackClients(admin_context)
-    trustee_domain_id = admin_osc.keystone().trustee_domain_id
-    target['trustee_domain_id'] = trustee_domain_id
+    target['trustee_domain_id'] = keystone.get_trustee_domain_id(
+        counters=counters)
     return target
 
 
+def stats(context):
+    """Return the number of policy checks of a request and of Keystone calls.
+
+    The trustee domain id, which is part of every policy target, is cached
+    for ``[trust]trustee_cache_ttl`` seconds, so only the checks made after
+    it expired should call Keystone.
+    """
+    return dict(context.policy_stats)
+
+
 def check_is_admin(context):
     """Whether or not user is admin according to policy setting.
 
@@ -19,6 +19,9 @@ from oslo_service import service
 
 from magnum.common import profiler
 from magnum.common import rpc
+from magnum.common.x509 import key_pool
+from magnum.conductor import k8s_api
+from magnum.conductor import k8s_watch
 import magnum.conf
 from magnum.objects import base as objects_base
 from magnum.service import periodic
@@ -44,6 +47,9 @@ class Service(service.Service):
 
     def start(self):
         self._server.start()
+        pool = key_pool.get_pool()
+        if pool is not None:
+            pool.refill()
 
     def create_periodic_tasks(self):
         if CONF.periodic_enable:
@@ -54,6 +60,9 @@ class Service(service.Service):
         if self._server:
             self._server.stop()
             self._server.wait()
+        key_pool.reset_pool()
+        k8s_watch.stop_all_watchers()
+        k8s_api.close_all_sessions()
         super(Service, self).stop()
 
     @classmethod
@@ -16,6 +16,7 @@ from oslo_log import log as logging
 from typing import List, Optional
 
 from magnum.common import config
+from magnum.common import tracing
 import magnum.conf
 
 CONF = magnum.conf.CONF
@@ -35,3 +36,4 @@ def prepare_service(argv: Optional[List[str]] = None):
     config.set_config_defaults()
 
     logging.setup(CONF, 'magnum')
+    tracing.setup(CONF)
@@ -0,0 +1,151 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Lightweight tracing of the request and RPC paths.
+
+Traces are events and spans recorded into a bounded in-memory ring buffer,
+which is dumped in the Guru Meditation Report of the service. Tracing is
+disabled by default, ``trace`` and ``span`` then do nothing, so they can be
+left on hot paths. Call sites pass attributes as keyword arguments rather
+than formatting messages, which is only done when the buffer is dumped.
+
+Example::
+
+    tracing.trace('build_url', resource=resource)
+
+    with tracing.span('HeatPoller.poll_and_check', cluster=cluster.uuid):
+        ...
+"""
+
+import collections
+import datetime
+import threading
+import time
+
+from oslo_reports import guru_meditation_report as gmr
+from oslo_reports.models import with_default_views
+
+# Recorded events, None while tracing is disabled.
+_buffer = None
+
+Event = collections.namedtuple('Event',
+                               'timestamp thread name duration attrs')
+
+
+def _noop_trace(name, **attrs):
+    pass
+
+
+def _record_trace(name, **attrs):
+    buffer = _buffer
+    if buffer is not None:
+        buffer.append(Event(time.time(), threading.get_ident(), name, None,
+                            attrs))
+
+
+class _Span(object):
+
+    __slots__ = ('name', 'attrs', 'start')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        buffer = _buffer
+        if buffer is not None:
+            buffer.append(Event(self.start, threading.get_ident(), self.name,
+                                time.time() - self.start, self.attrs))
+        return False
+
+
+class _NoopSpan(object):
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Record an event named ``name`` with the given attributes. Rebound by
+# enable and disable, so that a disabled trace is a single empty call.
+trace = _noop_trace
+
+
+def span(name, **attrs):
+    """Return a context manager recording its duration as a span."""
+    if _buffer is None:
+        return _NOOP_SPAN
+    return _Span(name, attrs)
+
+
+def enabled():
+    return _buffer is not None
+
+
+def enable(size):
+    """Record up to the ``size`` latest events."""
+    global _buffer, trace
+    _buffer = collections.deque(maxlen=size)
+    trace = _record_trace
+
+
+def disable():
+    """Stop recording, and drop the recorded events."""
+    global _buffer, trace
+    trace = _noop_trace
+    _buffer = None
+
+
+def events():
+    """Return the recorded events, oldest first."""
+    buffer = _buffer
+    return list(buffer) if buffer is not None else []
+
+
+def format_event(event):
+    timestamp = datetime.datetime.utcfromtimestamp(event.timestamp)
+    line = '%s [%x] %s' % (timestamp.isoformat(), event.thread, event.name)
+    if event.duration is not None:
+        line += ' (%.3fms)' % (event.duration * 1000)
+    if event.attrs:
+        line += ' ' + ' '.join('%s=%s' % item
+                               for item in sorted(event.attrs.items()))
+    return line
+
+
+def report():
+    """Guru Meditation Report section listing the recorded events."""
+    return with_default_views.ModelWithDefaultViews(
+        {'events': [format_event(event) for event in events()]})
+
+
+def setup(conf):
+    """Enable tracing if ``trace_buffer_size`` is set.
+
+    The recorded events are added to the Guru Meditation Report.
+    """
+    if not conf.trace_buffer_size:
+        disable()
+        return
+
+    enable(conf.trace_buffer_size)
+    gmr.TextGuruMeditation.register_section('Traces', report)
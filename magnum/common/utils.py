@@ -19,6 +19,7 @@
 """Utilities and helper functions."""
 
 import contextlib
+import functools
 import os
 import random
 import re
@@ -49,11 +50,20 @@ MEMORY_UNITS = {
     'M': 10 ** 6,
     'G': 10 ** 9,
     'T': 10 ** 12,
-    'p': 10 ** 15,
+    'P': 10 ** 15,
     'E': 10 ** 18,
     '': 1
 }
 
+# A number followed by either a binary or decimal suffix, or an exponent.
+_K8S_QUANTITY_RE = re.compile(
+    r"(\d+\.\d*|\.\d+|\d+)"
+    r"(?:([KMGTPE]i|[mkMGTPE])|[Ee]([+-]?(?:\d+\.\d*|\.\d+|\d+)))?")
+
+# Number of distinct quantity strings whose value is kept. Quantities
+# repeat heavily across pods, e.g. 500m or 1Gi.
+_K8S_QUANTITY_CACHE_SIZE = 1024
+
 DOCKER_MEMORY_UNITS = {
     'b': 1,
     'k': 2 ** 10,
@@ -189,6 +199,7 @@ def is_name_safe(name):
     return True
 
 
+@functools.lru_cache(maxsize=_K8S_QUANTITY_CACHE_SIZE)
 def get_k8s_quantity(quantity):
     """This function is used to get k8s quantity.
 
@@ -215,22 +226,25 @@ def get_k8s_quantity(quantity):
              is a unsupported value
     """
 
-    signed_num_regex = r"(^\d+\.\d+)|(^\d+\.)|(\.\d+)|(^\d+)"
-    matched_signed_number = re.search(signed_num_regex, quantity)
-    if matched_signed_number is None:
-        raise exception.UnsupportedK8sQuantityFormat()
-    else:
-        signed_number = matched_signed_number.group(0)
-    suffix = quantity.replace(signed_number, '', 1)
-    if suffix == '':
-        return float(quantity)
-    if re.search(r"^(Ki|Mi|Gi|Ti|Pi|Ei|m|k|M|G|T|P|E|'')$", suffix):
-        return float(signed_number) * MEMORY_UNITS[suffix]
-    elif re.search(r"^[E|e][+|-]?(\d+\.\d+$)|(\d+\.$)|(\.\d+$)|(\d+$)",
-                   suffix):
-        return float(signed_number) * (10 ** float(suffix[1:]))
-    else:
+    matched = _K8S_QUANTITY_RE.fullmatch(quantity)
+    if matched is None:
         raise exception.UnsupportedK8sQuantityFormat()
+    number, unit, exponent = matched.groups()
+    if exponent is not None:
+        return float(number) * (10 ** float(exponent))
+    return float(number) * MEMORY_UNITS[unit or '']
+
+
+def get_k8s_quantities(quantities):
+    """Parse a list of Kubernetes quantities at once.
+
+    :param quantities: List of quantity strings, see `get_k8s_quantity`.
+    :returns: List of the quantity numbers, in the same order.
+    :raises: exception.UnsupportedK8sQuantityFormat if any of the quantity
+             strings is a unsupported value
+    """
+    parse = get_k8s_quantity
+    return [parse(quantity) for quantity in quantities]
 
 
 def get_docker_quantity(quantity):
@@ -307,7 +321,3 @@ def get_openstack_ca():
             return fd.read()
     else:
         return ''
-
-
-def print_debug(msg: str):
-    print("\033[32mDEBUG: %s\033[0m" % msg)
@@ -0,0 +1,59 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_concurrency import processutils
+from oslo_service import service
+from oslo_service import sslutils
+from oslo_service import wsgi
+
+import magnum.conf
+
+CONF = magnum.conf.CONF
+
+
+class WSGIService(service.ServiceBase):
+    """Serves a WSGI application from long-lived worker processes.
+
+    The service is meant to be launched in ``workers`` processes by an
+    oslo.service ProcessLauncher. Each worker keeps its DB engine, policy
+    enforcer and client caches across requests, and serves up to
+    ``[api]threads`` requests at once in green threads.
+    """
+
+    def __init__(self, name, app, use_ssl=False):
+        self.name = name
+        self.app = app
+        self.workers = CONF.api.workers or processutils.get_worker_count()
+        if use_ssl:
+            # oslo.service reads the certificate from the [ssl] group.
+            sslutils.register_opts(CONF)
+            CONF.set_override('cert_file', CONF.api.ssl_cert_file,
+                              group='ssl')
+            CONF.set_override('key_file', CONF.api.ssl_key_file,
+                              group='ssl')
+        self.server = wsgi.Server(CONF, name, app,
+                                  host=CONF.api.host,
+                                  port=CONF.api.port,
+                                  pool_size=CONF.api.threads,
+                                  use_ssl=use_ssl)
+
+    def start(self):
+        self.server.start()
+
+    def stop(self):
+        self.server.stop()
+
+    def wait(self):
+        self.server.wait()
+
+    def reset(self):
+        self.server.reset()
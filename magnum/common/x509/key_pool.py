@@ -0,0 +1,227 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Pool of RSA private keys generated ahead of time.
+
+Generating a RSA key takes from tens of milliseconds to seconds of CPU,
+depending on its size, during which the eventlet hub is blocked. The pool
+generates keys in worker processes, so that certificates can be issued
+without waiting for a new key.
+"""
+
+import collections
+from concurrent import futures
+import functools
+import threading
+import time
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
+from eventlet import tpool
+from oslo_log import log as logging
+
+import magnum.conf
+
+LOG = logging.getLogger(__name__)
+
+CONF = magnum.conf.CONF
+
+# The pool of the current process. Created on first use, see get_pool.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def generate_private_key(key_size):
+    return rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+
+
+def _generate_der_key(key_size):
+    # Runs in a worker process, keys are sent back serialized.
+    return generate_private_key(key_size).private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption())
+
+
+def _load_der_key(key):
+    # The keys come from our own workers, there is no need to check them
+    # again, which takes as long as generating a key with recent versions
+    # of cryptography. Older versions always run a cheaper check.
+    try:
+        return serialization.load_der_private_key(
+            key, password=None, unsafe_skip_rsa_key_validation=True)
+    except TypeError:
+        return serialization.load_der_private_key(key, password=None)
+
+
+class KeyPool(object):
+    """Keep up to ``size`` RSA keys of ``key_size`` bits ready for use.
+
+    Every key taken from the pool is replaced by a key generated in one of
+    ``workers`` processes.
+    """
+
+    def __init__(self, size, key_size, workers=1):
+        self.size = size
+        self.key_size = key_size
+        self.workers = workers
+        self._keys = collections.deque()
+        self._pending = set()
+        self._executor = None
+        # Reentrant, the callback of a future which is already done runs
+        # right away, from refill.
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.refill_latency = None
+
+    def get(self):
+        """Take a key from the pool, or return None if it is empty."""
+        with self._lock:
+            try:
+                key = self._keys.popleft()
+            except IndexError:
+                key = None
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.refill()
+        if key is None:
+            return None
+        return _load_der_key(key)
+
+    def refill(self):
+        """Start generating the keys missing from the pool."""
+        with self._lock:
+            missing = self.size - len(self._keys) - len(self._pending)
+            if missing <= 0:
+                return
+            if self._executor is None:
+                self._executor = futures.ProcessPoolExecutor(
+                    max_workers=self.workers)
+            executor = self._executor
+            for _ in range(missing):
+                try:
+                    future = executor.submit(_generate_der_key,
+                                             self.key_size)
+                except Exception:
+                    LOG.warning("Unable to refill the RSA key pool",
+                                exc_info=True)
+                    self._executor = None
+                    self._pending.clear()
+                    return
+                self._pending.add(future)
+                future.add_done_callback(functools.partial(
+                    self._add_key, executor, time.monotonic()))
+
+    def _add_key(self, executor, submitted, future):
+        if future.cancelled():
+            return
+        try:
+            key = future.result()
+        except Exception:
+            LOG.warning("Failed to generate a RSA key for the pool",
+                        exc_info=True)
+            self._reset(executor)
+            return
+
+        with self._lock:
+            if executor is not self._executor:
+                return
+            self._pending.discard(future)
+            self._keys.append(key)
+            self.refill_latency = time.monotonic() - submitted
+
+    def _reset(self, executor):
+        # Forget about a broken executor, which has already shut itself
+        # down, so that the next refill starts over with a new one.
+        with self._lock:
+            if executor is self._executor:
+                self._executor = None
+                self._pending.clear()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            pending = list(self._pending)
+            self._pending.clear()
+            self._keys.clear()
+        for future in pending:
+            future.cancel()
+        # NOTE: not waiting for the workers leaves the interpreter hanging
+        # at exit when eventlet monkey patches threading.
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        """Return the depth of the pool and how well it keeps up.
+
+        ``refill_latency`` is the number of seconds the last key took to
+        be generated, including the time it waited for a worker.
+        """
+        with self._lock:
+            return {'depth': len(self._keys),
+                    'pending': len(self._pending),
+                    'hits': self.hits,
+                    'misses': self.misses,
+                    'refill_latency': self.refill_latency}
+
+
+def get_pool():
+    """Return the key pool of the process, or None if it is disabled."""
+    global _pool
+    if not CONF.x509.key_pool_size:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = KeyPool(CONF.x509.key_pool_size, CONF.x509.rsa_key_size,
+                            workers=CONF.x509.key_pool_workers)
+        return _pool
+
+
+def reset_pool():
+    """Shut the pool down, it is rebuilt from the options on next use."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def stats():
+    """Return the stats of the key pool, or None if there is no pool.
+
+    See `KeyPool.stats`. Unlike `get_pool`, this does not build the pool.
+    """
+    pool = _pool
+    if pool is None:
+        return None
+    return pool.stats()
+
+
+def get_private_key(key_size):
+    """Return a new RSA private key of ``key_size`` bits.
+
+    The key is taken from the pool when it has one of the right size, and
+    generated in a native thread otherwise.
+    """
+    pool = get_pool()
+    if pool is not None and pool.key_size == key_size:
+        key = pool.get()
+        if key is not None:
+            return key
+        LOG.debug("RSA key pool is empty, generating a key in a native "
+                  "thread")
+    # RSA key generation releases the GIL, running it in a native thread
+    # lets the other greenthreads run, and other keys be generated, while
+    # it is going on.
+    return tpool.execute(generate_private_key, key_size)
@@ -23,6 +23,7 @@ from cryptography import x509
 from oslo_log import log as logging
 
 from magnum.common import exception
+from magnum.common.x509 import key_pool
 from magnum.common.x509 import validator
 import magnum.conf
 
@@ -109,10 +110,7 @@ def _generate_certificate(issuer_name, subject_name, extensions,
     if organization_name and not isinstance(organization_name, six.text_type):
         organization_name = six.text_type(organization_name.decode('utf-8'))
 
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=CONF.x509.rsa_key_size
-    )
+    private_key = key_pool.get_private_key(CONF.x509.rsa_key_size)
 
     # subject name is set as common name
     csr = x509.CertificateSigningRequestBuilder()
@@ -159,6 +157,17 @@ def _generate_certificate(issuer_name, subject_name, extensions,
     return keypairs
 
 
+def load_private_key(private_key, password=None):
+    """Load a PEM encoded private key
+
+    :param private_key: PEM encoded private key
+    :param password: password of the private key, if it is encrypted
+    :returns: the private key, which can be passed to sign in place of the
+              PEM encoded CA key
+    """
+    return _load_pem_private_key(private_key, password)
+
+
 def _load_pem_private_key(ca_key, ca_key_password=None):
     if not isinstance(ca_key, rsa.RSAPrivateKey):
         if isinstance(ca_key, six.text_type):
@@ -233,10 +242,7 @@ def sign(csr, issuer_name, ca_key, ca_key_password=None,
 
 def generate_csr_and_key(common_name):
     """Return a dict with a new csr, public key and private key."""
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048
-    )
+    private_key = key_pool.get_private_key(2048)
 
     public_key = private_key.public_key()
 
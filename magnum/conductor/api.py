@@ -126,6 +126,10 @@ class API(rpc_service.API):
         return self._call('sign_certificate', cluster=cluster,
                           certificate=certificate)
 
+    def sign_certificates(self, cluster, certificates):
+        return self._call('sign_certificates', cluster=cluster,
+                          certificates=certificates)
+
     def get_ca_certificate(self, cluster, ca_cert_type=None):
         return self._call('get_ca_certificate', cluster=cluster,
                           ca_cert_type=ca_cert_type)
@@ -12,6 +12,8 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 
+import collections
+
 from heatclient import exc
 from oslo_log import log as logging
 from pycadf import cadftaxonomy as taxonomy
@@ -19,6 +21,7 @@ from pycadf import cadftaxonomy as taxonomy
 from magnum.common import exception
 from magnum.common import profiler
 from magnum.conductor.handlers.common import cert_manager
+from magnum.conductor import k8s_api
 from magnum.conductor import utils as conductor_utils
 from magnum.drivers.common import driver
 from magnum.i18n import _
@@ -41,24 +44,45 @@ class Handler(object):
     def __init__(self):
         super(Handler, self).__init__()
 
-    def sign_certificate(self, context, cluster, certificate):
-        LOG.debug("Creating self signed x509 certificate")
+    def _get_ca_cert_type(self, certificate):
         try:
-            ca_cert_type = certificate.ca_cert_type
+            return certificate.ca_cert_type
         except Exception:
             LOG.debug("There is no CA cert type specified for the CSR")
-            ca_cert_type = "kubernetes"
+            return "kubernetes"
 
-        signed_cert = cert_manager.sign_node_certificate(cluster,
-                                                         certificate.csr,
-                                                         ca_cert_type,
-                                                         context=context)
+    def _set_pem(self, certificate, signed_cert):
         if six.PY3 and isinstance(signed_cert, six.binary_type):
             certificate.pem = signed_cert.decode()
         else:
             certificate.pem = signed_cert
+
+    def sign_certificate(self, context, cluster, certificate):
+        LOG.debug("Creating self signed x509 certificate")
+        ca_cert_type = self._get_ca_cert_type(certificate)
+
+        signed_cert = cert_manager.sign_node_certificate(cluster,
+                                                         certificate.csr,
+                                                         ca_cert_type,
+                                                         context=context)
+        self._set_pem(certificate, signed_cert)
         return certificate
 
+    def sign_certificates(self, context, cluster, certificates):
+        LOG.debug("Creating %d self signed x509 certificates",
+                  len(certificates))
+        batches = collections.defaultdict(list)
+        for certificate in certificates:
+            batches[self._get_ca_cert_type(certificate)].append(certificate)
+
+        for ca_cert_type, batch in batches.items():
+            signed_certs = cert_manager.sign_node_certificates(
+                cluster, [certificate.csr for certificate in batch],
+                ca_cert_type, context=context)
+            for certificate, signed_cert in zip(batch, signed_certs):
+                self._set_pem(certificate, signed_cert)
+        return certificates
+
     def get_ca_certificate(self, context, cluster, ca_cert_type=None):
         ca_cert = cert_manager.get_cluster_ca_certificate(
             cluster, context=context, ca_cert_type=ca_cert_type)
@@ -92,8 +116,11 @@ class Handler(object):
 
         try:
             # re-generate the ca certs
+            cert_manager.invalidate_ca_keys(cluster)
             cert_manager.generate_certificates_to_cluster(cluster,
                                                           context=context)
+            cert_manager.delete_client_files(cluster, context=context)
+            k8s_api.close_session(cluster.uuid)
             cluster_driver = driver.Driver.get_driver_for_cluster(context,
                                                                   cluster)
             cluster_driver.rotate_ca_certificate(context, cluster)
@@ -12,10 +12,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from eventlet import greenpool
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 import six
 
+from magnum.common import cache
 from magnum.common import cert_manager
 from magnum.common import exception
 from magnum.common import short_id
@@ -31,6 +33,14 @@ CONDUCTOR_CLIENT_NAME = six.u('Magnum-Conductor')
 LOG = logging.getLogger(__name__)
 CONF = magnum.conf.CONF
 
+# Decoded client certificates of the clusters, keyed by cluster UUID and
+# certificate references. Created on first use, see _get_client_certs_cache.
+_client_certs_cache = None
+
+# Loaded CA private keys, keyed by cluster UUID, CA type and certificate
+# reference. Created on first use, see _get_ca_keys_cache.
+_ca_keys_cache = None
+
 
 def _generate_ca_cert(issuer_name, context=None):
     """Generate and store ca_cert
@@ -108,16 +118,22 @@ def generate_certificates_to_cluster(cluster, context=None):
 
         LOG.debug('Start to generate certificates: %s', issuer_name)
 
-        ca_cert_ref, ca_cert, ca_password = _generate_ca_cert(issuer_name,
-                                                              context=context)
-        etcd_ca_cert_ref, _, _ = _generate_ca_cert(issuer_name,
-                                                   context=context)
-        fp_ca_cert_ref, _, _ = _generate_ca_cert(issuer_name,
-                                                 context=context)
-        magnum_cert_ref = _generate_client_cert(issuer_name,
-                                                ca_cert,
-                                                ca_password,
-                                                context=context)
+        # The CAs are independent, generate and store them concurrently.
+        # The client certificate only waits for the cluster CA.
+        pool = greenpool.GreenPool()
+        ca = pool.spawn(_generate_ca_cert, issuer_name, context=context)
+        etcd_ca = pool.spawn(_generate_ca_cert, issuer_name, context=context)
+        fp_ca = pool.spawn(_generate_ca_cert, issuer_name, context=context)
+        try:
+            ca_cert_ref, ca_cert, ca_password = ca.wait()
+            magnum_cert_ref = _generate_client_cert(issuer_name,
+                                                    ca_cert,
+                                                    ca_password,
+                                                    context=context)
+            etcd_ca_cert_ref, _, _ = etcd_ca.wait()
+            fp_ca_cert_ref, _, _ = fp_ca.wait()
+        finally:
+            pool.waitall()
 
         cluster.ca_cert_ref = ca_cert_ref
         cluster.magnum_cert_ref = magnum_cert_ref
@@ -130,15 +146,26 @@ def generate_certificates_to_cluster(cluster, context=None):
         raise exception.CertificatesToClusterFailed(cluster_uuid=cluster.uuid)
 
 
-def get_cluster_ca_certificate(cluster, context=None, ca_cert_type=None):
-    ref = cluster.ca_cert_ref
+def _get_ca_cert_type(ca_cert_type):
     if ca_cert_type == "etcd":
-        ref = cluster.etcd_ca_cert_ref
+        return "etcd"
     elif ca_cert_type in ["front_proxy", "front-proxy"]:
-        ref = cluster.front_proxy_ca_cert_ref
+        return "front_proxy"
+    return "kubernetes"
+
+
+def _get_ca_cert_ref(cluster, ca_cert_type):
+    ca_cert_type = _get_ca_cert_type(ca_cert_type)
+    if ca_cert_type == "etcd":
+        return cluster.etcd_ca_cert_ref
+    elif ca_cert_type == "front_proxy":
+        return cluster.front_proxy_ca_cert_ref
+    return cluster.ca_cert_ref
 
+
+def get_cluster_ca_certificate(cluster, context=None, ca_cert_type=None):
     ca_cert = cert_manager.get_backend().CertManager.get_cert(
-        ref,
+        _get_ca_cert_ref(cluster, ca_cert_type),
         resource_ref=cluster.uuid,
         context=context
     )
@@ -156,24 +183,74 @@ def get_cluster_magnum_cert(cluster, context=None):
     return magnum_cert
 
 
+def _get_client_certs_cache():
+    global _client_certs_cache
+    if _client_certs_cache is None:
+        _client_certs_cache = cache.TTLCache(
+            maxsize=CONF.cluster.client_cert_cache_size,
+            ttl=CONF.cluster.client_cert_cache_ttl)
+    return _client_certs_cache
+
+
+def reset_client_certs_cache():
+    """Drop the cache, so that it is rebuilt from the current options."""
+    global _client_certs_cache
+    _client_certs_cache = None
+
+
+def client_certs_cache_stats():
+    """Return the hit and miss counts of the client certificates cache."""
+    return _get_client_certs_cache().stats()
+
+
+def _load_cluster_client_certs(cluster, context=None):
+    ca_cert = get_cluster_ca_certificate(cluster, context)
+    magnum_cert = get_cluster_magnum_cert(cluster, context)
+    return (encodeutils.safe_decode(ca_cert.get_certificate()),
+            encodeutils.safe_decode(magnum_cert.get_decrypted_private_key()),
+            encodeutils.safe_decode(magnum_cert.get_certificate()))
+
+
+def get_cluster_client_certs(cluster, context=None):
+    """Get the certificates used to connect to a cluster.
+
+    The certificates are kept in memory for ``client_cert_cache_ttl``
+    seconds, to spare a round trip to the certificate backend and the
+    decryption of the private key for each client.
+
+    :param cluster: The cluster to get the certificates of
+    :returns: CA certificate, client private key and client certificate
+              of the cluster, as text
+    """
+    key = (cluster.uuid, cluster.ca_cert_ref, cluster.magnum_cert_ref)
+    return _get_client_certs_cache().get_or_load(
+        key, lambda: _load_cluster_client_certs(cluster, context))
+
+
+def invalidate_client_certs(cluster):
+    """Drop the certificates of a cluster kept in memory."""
+    if _client_certs_cache is None:
+        return
+    _client_certs_cache.invalidate_matching(
+        lambda key: key[0] == cluster.uuid)
+
+
 def create_client_files(cluster, context=None):
     if not os.path.isdir(CONF.cluster.temp_cache_dir):
         LOG.debug("Certificates will not be cached in the filesystem: they "
                   "will be created as tempfiles.")
-        ca_cert = get_cluster_ca_certificate(cluster, context)
-        magnum_cert = get_cluster_magnum_cert(cluster, context)
+        ca_cert, key, cert = get_cluster_client_certs(cluster, context)
 
         ca_file = tempfile.NamedTemporaryFile(mode="w+")
-        ca_file.write(encodeutils.safe_decode(ca_cert.get_certificate()))
+        ca_file.write(ca_cert)
         ca_file.flush()
 
         key_file = tempfile.NamedTemporaryFile(mode="w+")
-        key_file.write(encodeutils.safe_decode(
-            magnum_cert.get_decrypted_private_key()))
+        key_file.write(key)
         key_file.flush()
 
         cert_file = tempfile.NamedTemporaryFile(mode="w+")
-        cert_file.write(encodeutils.safe_decode(magnum_cert.get_certificate()))
+        cert_file.write(cert)
         cert_file.flush()
 
     else:
@@ -186,21 +263,18 @@ def create_client_files(cluster, context=None):
         if not os.path.isdir(cached_cert_dir):
             os.mkdir(cached_cert_dir)
 
-            ca_cert = get_cluster_ca_certificate(cluster, context)
-            magnum_cert = get_cluster_magnum_cert(cluster, context)
+            ca_cert, key, cert = get_cluster_client_certs(cluster, context)
 
             ca_file = open(cached_ca_file, "w+")
-            ca_file.write(encodeutils.safe_decode(ca_cert.get_certificate()))
+            ca_file.write(ca_cert)
             ca_file.flush()
 
             key_file = open(cached_key_file, "w+")
-            key_file.write(encodeutils.safe_decode(
-                magnum_cert.get_decrypted_private_key()))
+            key_file.write(key)
             key_file.flush()
 
             cert_file = open(cached_cert_file, "w+")
-            cert_file.write(
-                encodeutils.safe_decode(magnum_cert.get_certificate()))
+            cert_file.write(cert)
             cert_file.flush()
 
             os.chmod(cached_ca_file, 0o600)
@@ -215,31 +289,82 @@ def create_client_files(cluster, context=None):
     return ca_file, key_file, cert_file
 
 
-def sign_node_certificate(cluster, csr, ca_cert_type=None, context=None):
-    ref = cluster.ca_cert_ref
-    if ca_cert_type == "etcd":
-        ref = cluster.etcd_ca_cert_ref
-    elif ca_cert_type in ["front_proxy", "front-proxy"]:
-        ref = cluster.front_proxy_ca_cert_ref
+def _get_ca_keys_cache():
+    global _ca_keys_cache
+    if _ca_keys_cache is None:
+        _ca_keys_cache = cache.TTLCache(
+            maxsize=CONF.cluster.ca_key_cache_size,
+            ttl=CONF.cluster.ca_key_cache_ttl)
+    return _ca_keys_cache
+
+
+def reset_ca_keys_cache():
+    """Drop the cache, so that it is rebuilt from the current options."""
+    global _ca_keys_cache
+    _ca_keys_cache = None
+
+
+def ca_keys_cache_stats():
+    """Return the hit and miss counts of the CA private keys cache."""
+    return _get_ca_keys_cache().stats()
+
+
+def _load_cluster_ca_key(cluster, ca_cert_type, context=None):
+    ca_cert = get_cluster_ca_certificate(cluster, context=context,
+                                         ca_cert_type=ca_cert_type)
+    return x509.load_private_key(ca_cert.get_private_key(),
+                                 ca_cert.get_private_key_passphrase())
 
-    ca_cert = cert_manager.get_backend().CertManager.get_cert(
-        ref,
-        resource_ref=cluster.uuid,
-        context=context
-    )
 
-    node_cert = x509.sign(csr,
-                          _get_issuer_name(cluster),
-                          ca_cert.get_private_key(),
-                          ca_cert.get_private_key_passphrase())
+def get_cluster_ca_key(cluster, ca_cert_type=None, context=None):
+    """Get the private key of a CA of a cluster, ready to sign with.
+
+    The keys are kept in memory for ``ca_key_cache_ttl`` seconds, so that
+    the nodes of a cluster bootstrapping together do not each fetch the CA
+    from the certificate backend and decrypt its private key.
+
+    :param cluster: The cluster to get the CA private key of
+    :param ca_cert_type: The type of the CA, kubernetes (default), etcd
+                         or front_proxy
+    :returns: The CA private key, as a RSAPrivateKey
+    """
+    ca_cert_type = _get_ca_cert_type(ca_cert_type)
+    key = (cluster.uuid, ca_cert_type,
+           _get_ca_cert_ref(cluster, ca_cert_type))
+    return _get_ca_keys_cache().get_or_load(
+        key, lambda: _load_cluster_ca_key(cluster, ca_cert_type, context))
+
+
+def invalidate_ca_keys(cluster):
+    """Drop the CA private keys of a cluster kept in memory."""
+    if _ca_keys_cache is None:
+        return
+    _ca_keys_cache.invalidate_matching(lambda key: key[0] == cluster.uuid)
+
+
+def sign_node_certificate(cluster, csr, ca_cert_type=None, context=None):
+    ca_key = get_cluster_ca_key(cluster, ca_cert_type, context=context)
+    node_cert = x509.sign(csr, _get_issuer_name(cluster), ca_key)
     return node_cert
 
 
+def sign_node_certificates(cluster, csrs, ca_cert_type=None, context=None):
+    """Sign several CSRs with the same CA of a cluster.
+
+    :returns: The signed certificates, in the order of ``csrs``
+    """
+    ca_key = get_cluster_ca_key(cluster, ca_cert_type, context=context)
+    issuer_name = _get_issuer_name(cluster)
+    return [x509.sign(csr, issuer_name, ca_key) for csr in csrs]
+
+
 def delete_certificates_from_cluster(cluster, context=None):
     """Delete ca cert and magnum client cert from cluster
 
     :param cluster: The cluster which has certs
     """
+    invalidate_client_certs(cluster)
+    invalidate_ca_keys(cluster)
     for cert_ref in ['ca_cert_ref', 'magnum_cert_ref']:
         try:
             cert_ref = getattr(cluster, cert_ref, None)
@@ -252,6 +377,7 @@ def delete_certificates_from_cluster(cluster, context=None):
 
 
 def delete_client_files(cluster, context=None):
+    invalidate_client_certs(cluster)
     cached_cert_dir = os.path.join(CONF.cluster.temp_cache_dir,
                                    cluster.uuid)
     try:
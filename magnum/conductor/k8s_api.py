@@ -12,9 +12,164 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import threading
+import time
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import requests
 
+from magnum.common import tracing
 from magnum.conductor.handlers.common.cert_manager import create_client_files
+import magnum.conf
+
+CONF = magnum.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Seconds to wait for the connection to the API server of a watch.
+_CONNECT_TIMEOUT = 30
+
+# Pooled sessions, keyed by cluster UUID.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _fingerprint(cluster):
+    """Identify the certificates a session of the cluster is built with.
+
+    The certificate references change whenever the cluster certificates
+    are regenerated, e.g. on CA rotation, which retires the old session.
+    """
+    refs = '%s:%s' % (cluster.ca_cert_ref, cluster.magnum_cert_ref)
+    return hashlib.sha256(refs.encode('utf-8')).hexdigest()
+
+
+class _ClusterSession(object):
+    """A requests session authenticated with the client certs of a cluster.
+
+    The session owns the certificate files returned by
+    `create_client_files` and closes them with itself. A pooled session
+    counts the clients it is checked out by, a session removed from the
+    pool while some still hold it is closed when the last one releases it.
+    """
+
+    def __init__(self, fingerprint, cert_files):
+        self.fingerprint = fingerprint
+        self.cert_files = cert_files
+        self.session = requests.Session()
+        self.last_used = time.monotonic()
+        self.users = 0
+        self.retired = False
+
+    def request(self, method, url, params=None, stream=False, timeout=None):
+        # NOTE: verify and cert are passed on each request rather than set
+        # on the session, where a CA bundle coming from the environment
+        # would take precedence over them.
+        ca_file, key_file, cert_file = self.cert_files
+        self.last_used = time.monotonic()
+        return self.session.request(method, url, params=params,
+                                    stream=stream, timeout=timeout,
+                                    verify=ca_file.name,
+                                    cert=(cert_file.name, key_file.name))
+
+    def close(self):
+        self.session.close()
+        for cert_file in self.cert_files:
+            cert_file.close()
+
+
+def _retire(pooled):
+    """Mark a session out of the pool, return it if it can be closed.
+
+    Must be called with `_sessions_lock` held.
+    """
+    pooled.retired = True
+    return pooled if not pooled.users else None
+
+
+def _get_session(context, cluster):
+    """Check the pooled session of a cluster out, creating it if needed.
+
+    The session must be handed back with `_release_session`.
+    """
+    evict_idle_sessions()
+    fingerprint = _fingerprint(cluster)
+    with _sessions_lock:
+        pooled = _sessions.get(cluster.uuid)
+        if pooled is not None and pooled.fingerprint == fingerprint:
+            pooled.users += 1
+            pooled.last_used = time.monotonic()
+            return pooled
+
+    # Fetching the certificates may yield to other greenthreads, so do it
+    # outside of the lock and keep whichever session got pooled first.
+    created = _ClusterSession(fingerprint,
+                              create_client_files(cluster, context))
+    with _sessions_lock:
+        pooled = _sessions.get(cluster.uuid)
+        if pooled is not None and pooled.fingerprint == fingerprint:
+            stale, created = created, pooled
+        else:
+            _sessions[cluster.uuid] = created
+            stale = pooled
+        created.users += 1
+        if stale is not None:
+            stale = _retire(stale)
+    if stale is not None:
+        stale.close()
+    return created
+
+
+def _release_session(pooled):
+    """Hand a session checked out with `_get_session` back."""
+    with _sessions_lock:
+        pooled.users -= 1
+        pooled.last_used = time.monotonic()
+        closable = pooled.retired and not pooled.users
+    if closable:
+        pooled.close()
+
+
+def close_session(cluster_uuid):
+    """Close the pooled session of a cluster, if any.
+
+    A session still in use is closed once its last client is done with it.
+    """
+    with _sessions_lock:
+        pooled = _sessions.pop(cluster_uuid, None)
+        closable = pooled is not None and _retire(pooled)
+    if pooled is not None:
+        LOG.debug("Closing Kubernetes API session of cluster %s",
+                  cluster_uuid)
+    if closable:
+        pooled.close()
+
+
+def close_all_sessions():
+    """Close every pooled session, once its clients are done with it."""
+    with _sessions_lock:
+        closable = [_retire(pooled) for pooled in _sessions.values()]
+        _sessions.clear()
+    for session in closable:
+        if session is not None:
+            session.close()
+
+
+def evict_idle_sessions():
+    """Close the sessions unused for `api_session_idle_timeout` seconds.
+
+    Sessions checked out by a client are in use, thus never idle.
+    """
+    deadline = time.monotonic() - CONF.kubernetes.api_session_idle_timeout
+    with _sessions_lock:
+        idle = [uuid for uuid, pooled in _sessions.items()
+                if not pooled.users and pooled.last_used < deadline]
+        evicted = [_sessions.pop(uuid) for uuid in idle]
+    for pooled in evicted:
+        pooled.close()
+    if evicted:
+        LOG.debug("Evicted %d idle Kubernetes API sessions", len(evicted))
 
 
 class KubernetesAPI:
@@ -25,28 +180,33 @@ class KubernetesAPI:
     reason behind it is that the native `kubernetes` library does not
     seem to be quite thread-safe at the moment.
 
-    Also, our interactions with the Kubernetes API are happening inside
-    Greenthreads so we don't need to use connection pooling on top of it,
-    in addition to pools not being something that you can disable with
-    the native Kubernetes API.
+    Clients of the same cluster share a pooled session, so that the
+    connections to the API server, and their TLS handshake, outlive a
+    single health poll. Pooled sessions are closed once they have been
+    idle for `[kubernetes]api_session_idle_timeout` seconds, when the
+    cluster certificates change, or explicitly with `close_session`, but
+    never while a client still holds them. A client holds its session
+    until it is closed or garbage collected. Long-lived clients, such as
+    watches, should not be `pooled`, so that they do not keep the pooled
+    session of their cluster from being retired.
     """
 
-    def __init__(self, context, cluster):
+    def __init__(self, context, cluster, pooled=True):
         self.context = context
         self.cluster = cluster
 
-        # Load certificates for cluster
-        (self.ca_file, self.key_file, self.cert_file) = create_client_files(
-            self.cluster, self.context
-        )
+        if pooled and CONF.kubernetes.api_session_idle_timeout:
+            self._session = _get_session(self.context, self.cluster)
+            self._owns_session = False
+        else:
+            self._session = _ClusterSession(
+                None, create_client_files(self.cluster, self.context))
+            self._owns_session = True
+        (self.ca_file, self.key_file, self.cert_file) = (
+            self._session.cert_files)
 
-    def _request(self, method, url, json=True):
-        response = requests.request(
-            method,
-            url,
-            verify=self.ca_file.name,
-            cert=(self.cert_file.name, self.key_file.name)
-        )
+    def _request(self, method, url, json=True, params=None):
+        response = self._session.request(method, url, params=params)
         response.raise_for_status()
         if json:
             return response.json()
@@ -82,16 +242,124 @@ class KubernetesAPI:
             f"{self.cluster.api_address}/api/v1/namespaces/{namespace}/pods"
         )
 
-    def __del__(self):
-        """Close all of the file descriptions for the certificates
+    def _list(self, path, field_selector=None, label_selector=None,
+              resource_version=None, limit=None, metadata=None):
+        """Yield the items of a collection, one page at a time.
+
+        Pages of up to `limit` items, `[kubernetes]api_list_page_size` by
+        default, are requested with the continue token of the previous
+        one, so that only a page of the collection is held in memory.
+
+        :param field_selector: Only list the objects matching the given
+            field selector, e.g. ``spec.nodeName=node-0``.
+        :param label_selector: Only list the objects matching the given
+            label selector.
+        :param resource_version: Set to ``'0'`` to let the API server
+            answer from its watch cache rather than from etcd. The result
+            may then be slightly stale, and the API server may ignore the
+            limit and return the whole collection at once.
+        :param limit: Number of items per page, 0 to list the whole
+            collection with a single request.
+        :param metadata: If given, a dict updated with the list metadata
+            of each page, e.g. the resource version to start a watch from.
+        """
+        if limit is None:
+            limit = CONF.kubernetes.api_list_page_size
+        params = {}
+        if field_selector:
+            params['fieldSelector'] = field_selector
+        if label_selector:
+            params['labelSelector'] = label_selector
+        if resource_version is not None:
+            params['resourceVersion'] = resource_version
+        if limit:
+            params['limit'] = limit
 
-        They are left open by `create_client_files`.
+        url = f"{self.cluster.api_address}{path}"
+        while True:
+            with tracing.span('KubernetesAPI.list', path=path,
+                              cluster=self.cluster.uuid):
+                page = self._request('GET', url, params=params)
+            if metadata is not None:
+                metadata.update(page.get('metadata') or {})
+            yield from page.get('items') or []
+            token = (page.get('metadata') or {}).get('continue')
+            if not limit or not token:
+                return
+            # The continue token pins the resource version of the first
+            # page, which must not be sent along with it.
+            params.pop('resourceVersion', None)
+            params['continue'] = token
 
-        TODO(mnaser): Use a context manager and avoid having these here.
+    def iter_nodes(self, **kwargs):
+        """Iterate over the nodes of the cluster.
+
+        Takes the keyword arguments of `_list`.
+
+        :return: Generator of nodes.
         """
-        if hasattr(self, 'ca_file'):
-            self.ca_file.close()
-        if hasattr(self, 'cert_file'):
-            self.cert_file.close()
-        if hasattr(self, 'key_file'):
-            self.key_file.close()
+        return self._list('/api/v1/nodes', **kwargs)
+
+    def iter_pods(self, **kwargs):
+        """Iterate over the pods of all the namespaces.
+
+        Takes the keyword arguments of `_list`.
+
+        :return: Generator of pods.
+        """
+        return self._list('/api/v1/pods', **kwargs)
+
+    def iter_namespaced_pods(self, namespace, **kwargs):
+        """Iterate over the pods of the given namespace.
+
+        Takes the keyword arguments of `_list`.
+
+        :param namespace: Namespace to list pods from.
+        :return: Generator of pods.
+        """
+        return self._list(f"/api/v1/namespaces/{namespace}/pods", **kwargs)
+
+    def watch_nodes(self, resource_version, timeout_seconds):
+        """Stream the changes made to the nodes after a resource version.
+
+        The API server ends the watch after `timeout_seconds`. Bookmark
+        events are requested, so that the resource version to resume from
+        keeps up with the cluster even when no node changes.
+
+        :param resource_version: Resource version to watch from, usually
+            the one of a list of the nodes.
+        :param timeout_seconds: Duration of the watch.
+        :return: Generator of watch events, dicts with a ``type`` and the
+            ``object`` it applies to.
+        """
+        params = {'watch': 1,
+                  'allowWatchBookmarks': 'true',
+                  'resourceVersion': resource_version,
+                  'timeoutSeconds': timeout_seconds}
+        # Give the API server some slack to end the watch on its own
+        # before giving up on reading from it.
+        response = self._session.request(
+            'GET', f"{self.cluster.api_address}/api/v1/nodes",
+            params=params, stream=True,
+            timeout=(_CONNECT_TIMEOUT, timeout_seconds + _CONNECT_TIMEOUT))
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield jsonutils.loads(line)
+        finally:
+            response.close()
+
+    def close(self):
+        """Close the session, or hand it back if it is pooled."""
+        session = getattr(self, '_session', None)
+        if session is None:
+            return
+        self._session = None
+        if self._owns_session:
+            session.close()
+        else:
+            _release_session(session)
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,204 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Track the readiness of the nodes of Kubernetes clusters with watches.
+
+Rather than listing the nodes of a cluster on every health poll, a watcher
+lists them once and then follows the changes the API server streams, so
+that the health poll reads the readiness of the nodes from memory. Every
+change of the readiness of a node is reported to the callback set with
+`set_change_callback`, so that the health of the cluster can be updated
+right away instead of on the next poll.
+"""
+
+from eventlet import greenthread
+from oslo_log import log as logging
+from oslo_utils import strutils
+
+from magnum.conductor import k8s_api as k8s
+import magnum.conf
+
+CONF = magnum.conf.CONF
+LOG = logging.getLogger(__name__)
+
+# Running watchers, keyed by cluster UUID.
+_watchers = {}
+
+# Called with the UUID of a cluster when the readiness of its nodes changed.
+_change_callback = None
+
+
+def is_node_ready(node):
+    """Return whether the Ready condition of a node is true."""
+    for condition in node['status']['conditions']:
+        if condition['type'] == 'Ready':
+            return strutils.bool_from_string(condition['status'])
+    return False
+
+
+class NodeReadinessWatcher(object):
+    """Keep track of the readiness of the nodes of a cluster.
+
+    The nodes are listed, then watched from the resource version of the
+    list. The watch ends every `[kubernetes]health_watch_resync_interval`
+    seconds, the nodes are then listed again, so that a missed event is
+    not missed for long. They are also listed again whenever the watch
+    fails, or when the API server reports that the resource version it
+    resumes from is too old.
+    """
+
+    def __init__(self, context, cluster):
+        self.cluster_uuid = cluster.uuid
+        self.fingerprint = _fingerprint(cluster)
+        self.resource_version = None
+        self.synced = False
+        self._api = k8s.KubernetesAPI(context, cluster, pooled=False)
+        self._ready = {}
+        self._thread = None
+
+    def start(self):
+        self._thread = greenthread.spawn(self._run)
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.kill()
+            self._thread = None
+        self.synced = False
+        self._api.close()
+
+    def readiness(self):
+        """Return the readiness of the nodes, keyed by node name.
+
+        Returns None until the nodes got listed, and while the watch is
+        failing, as the readiness may be outdated then.
+        """
+        if not self.synced:
+            return None
+        return dict(self._ready)
+
+    def _run(self):
+        failures = 0
+        while True:
+            try:
+                self.sync()
+                failures = 0
+            except Exception:
+                self.synced = False
+                failures += 1
+                LOG.warning("Watch of the nodes of cluster %s failed",
+                            self.cluster_uuid, exc_info=True)
+                greenthread.sleep(min(2 ** failures, 60))
+
+    def sync(self):
+        """List the nodes, then apply their changes until the watch ends."""
+        metadata = {}
+        ready = {node['metadata']['name']: is_node_ready(node)
+                 for node in self._api.iter_nodes(metadata=metadata)}
+        # Nothing was reported before the first list.
+        changed = self.resource_version is not None and ready != self._ready
+        self._ready = ready
+        self.resource_version = metadata.get('resourceVersion')
+        self.synced = True
+        if changed:
+            self._notify()
+
+        events = self._api.watch_nodes(
+            self.resource_version,
+            CONF.kubernetes.health_watch_resync_interval)
+        for event in events:
+            if not self._apply(event):
+                events.close()
+                return
+
+    def _apply(self, event):
+        """Apply a watch event, return False if the watch must restart."""
+        if event['type'] == 'ERROR':
+            # Most likely 410 Gone, the resource version got compacted.
+            LOG.debug("Restarting the watch of the nodes of cluster %s: "
+                      "%s", self.cluster_uuid, event['object'])
+            return False
+
+        node = event['object']
+        self.resource_version = node['metadata']['resourceVersion']
+        if event['type'] == 'BOOKMARK':
+            return True
+
+        name = node['metadata']['name']
+        if event['type'] == 'DELETED':
+            changed = self._ready.pop(name, None) is not None
+        else:
+            ready = is_node_ready(node)
+            changed = self._ready.get(name) != ready
+            self._ready[name] = ready
+        if changed:
+            self._notify()
+        return True
+
+    def _notify(self):
+        callback = _change_callback
+        if callback is None:
+            return
+        try:
+            callback(self.cluster_uuid)
+        except Exception:
+            LOG.warning("Failed to report the change of the nodes of "
+                        "cluster %s", self.cluster_uuid, exc_info=True)
+
+
+def _fingerprint(cluster):
+    return cluster.api_address, k8s._fingerprint(cluster)
+
+
+def get_watcher(context, cluster):
+    """Return the watcher of a cluster, starting it if needed.
+
+    The watcher is replaced when the API address or the certificates of
+    the cluster change.
+    """
+    # NOTE: The health of a cluster is never polled twice in parallel, so
+    # there is no concurrent creation of the watcher of a cluster.
+    watcher = _watchers.get(cluster.uuid)
+    if watcher is not None and watcher.fingerprint == _fingerprint(cluster):
+        return watcher
+    if watcher is not None:
+        watcher.stop()
+
+    watcher = NodeReadinessWatcher(context, cluster)
+    _watchers[cluster.uuid] = watcher
+    watcher.start()
+    return watcher
+
+
+def stop_watcher(cluster_uuid):
+    """Stop the watcher of a cluster, if any."""
+    watcher = _watchers.pop(cluster_uuid, None)
+    if watcher is not None:
+        watcher.stop()
+
+
+def prune_watchers(cluster_uuids):
+    """Stop the watchers of the clusters not in `cluster_uuids`."""
+    for cluster_uuid in set(_watchers) - set(cluster_uuids):
+        LOG.debug("Stopping the watch of the nodes of cluster %s",
+                  cluster_uuid)
+        stop_watcher(cluster_uuid)
+
+
+def stop_all_watchers():
+    for cluster_uuid in list(_watchers):
+        stop_watcher(cluster_uuid)
+
+
+def set_change_callback(callback):
+    """Set the callable called with the UUID of a cluster on changes."""
+    global _change_callback
+    _change_callback = callback
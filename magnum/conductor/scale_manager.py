@@ -13,6 +13,8 @@
 # under the License.
 
 import abc
+import collections
+
 from oslo_log import log as logging
 
 from magnum.common import exception
@@ -23,6 +25,12 @@ from magnum import objects
 
 LOG = logging.getLogger(__name__)
 
+# The load of a host: the number of pods running on it, and the CPU cores
+# and bytes of memory they request.
+HostLoad = collections.namedtuple('HostLoad', 'pods cpu memory')
+
+_IDLE = HostLoad(0, 0, 0)
+
 
 def get_scale_manager(context, osclient, cluster):
     cluster_driver = Driver.get_driver_for_cluster(context, cluster)
@@ -54,23 +62,27 @@ class ScaleManager(object):
                 "%(stack_id)s") % {'output_key': hosts_output.heat_output,
                                    'stack_id': stack.id})
 
-        hosts_with_container = self._get_hosts_with_container(self.context,
-                                                              cluster)
-        hosts_no_container = list(set(hosts) - hosts_with_container)
-        LOG.debug('List of hosts that has no container: %s',
-                  str(hosts_no_container))
+        loads = self._get_host_loads(self.context, cluster)
+        # Remove the hosts which are the cheapest to drain first: those
+        # running the fewest pods, then requesting the least CPU, then the
+        # least memory. The sort is stable, ties keep the order of Heat.
+        ranked = sorted(hosts, key=lambda host: loads.get(host, _IDLE))
+        LOG.debug('Hosts ranked by load: %s',
+                  [(host, loads.get(host, _IDLE)) for host in ranked])
 
         num_of_removal = self._get_num_of_removal()
-        if len(hosts_no_container) < num_of_removal:
+        hosts_to_remove = ranked[0:num_of_removal]
+        non_empty = [host for host in hosts_to_remove
+                     if loads.get(host, _IDLE).pods]
+        if non_empty:
             LOG.warning(
                 "About to remove %(num_removal)d nodes, which is larger than "
-                "the number of empty nodes (%(num_empty)d). %(num_non_empty)d "
-                "non-empty nodes will be removed.", {
+                "the number of empty nodes (%(num_empty)d). The least loaded "
+                "non-empty nodes will be removed: %(non_empty)s", {
                     'num_removal': num_of_removal,
-                    'num_empty': len(hosts_no_container),
-                    'num_non_empty': num_of_removal - len(hosts_no_container)})
+                    'num_empty': num_of_removal - len(non_empty),
+                    'non_empty': non_empty})
 
-        hosts_to_remove = hosts_no_container[0:num_of_removal]
         LOG.info('Require removal of hosts: %s', hosts_to_remove)
 
         return hosts_to_remove
@@ -81,6 +93,16 @@ class ScaleManager(object):
     def _get_num_of_removal(self):
         return self.old_cluster.node_count - self.new_cluster.node_count
 
+    def _get_host_loads(self, context, cluster):
+        """Return the load of the hosts running containers, by host.
+
+        Scale managers able to tell the resources used on each host
+        should override it, by default each host with containers counts
+        as running a single one.
+        """
+        return {host: HostLoad(1, 0, 0)
+                for host in self._get_hosts_with_container(context, cluster)}
+
     @abc.abstractmethod
     def _get_hosts_with_container(self, context, cluster):
         """Return the hosts with container running on them."""
@@ -42,7 +42,22 @@ api_service_opts = [
                 help='Enable SSL Magnum API service'),
     cfg.IntOpt('workers',
                help='The maximum number of magnum-api processes to '
-                    'fork and run. Default to number of CPUs on the host.')
+                    'fork and run. Default to number of CPUs on the host.'),
+    cfg.StrOpt('server_mode',
+               default='werkzeug',
+               choices=[('werkzeug', 'Fork a new process for each request, '
+                                     'running up to "workers" processes '
+                                     'at once.'),
+                        ('prefork', 'Fork "workers" long-lived processes '
+                                    'at startup, each serving up to '
+                                    '"threads" requests at once.')],
+               help='How magnum-api serves requests.'),
+    cfg.IntOpt('threads',
+               default=100,
+               min=1,
+               help='The number of requests each magnum-api process serves '
+                    'concurrently, in green threads, when "server_mode" is '
+                    '"prefork".'),
 ]
 
 
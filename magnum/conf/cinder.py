@@ -47,7 +47,19 @@ cinder_opts = [
     cfg.IntOpt('default_boot_volume_size',
                default=0,
                help=_('The default volume size to use for volumes '
-                      'used for VM of COE.'))
+                      'used for VM of COE.')),
+    cfg.IntOpt('volume_type_cache_ttl',
+               default=300,
+               min=0,
+               help=_('Number of seconds the volume type picked from the '
+                      'Cinder volume type list of a project, for the '
+                      'volumes with no default volume type, is kept in '
+                      'memory. Set to 0 to disable the cache.')),
+    cfg.IntOpt('volume_type_cache_size',
+               default=256,
+               min=1,
+               help=_('Maximum number of projects whose volume type is '
+                      'kept in memory.')),
 ]
 
 cinder_client_opts = [
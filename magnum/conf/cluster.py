@@ -32,6 +32,31 @@ cluster_def_opts = [
                default="/var/lib/magnum/certificate-cache",
                help='Explicitly specify the temporary directory to hold '
                     'cached TLS certs.'),
+    cfg.IntOpt('client_cert_cache_ttl',
+               default=600,
+               min=0,
+               help=_('Number of seconds the CA certificate and the magnum '
+                      'client certificate and key of a cluster are kept in '
+                      'memory after being fetched from the certificate '
+                      'backend. Set to 0 to disable the cache.')),
+    cfg.IntOpt('client_cert_cache_size',
+               default=1024,
+               min=1,
+               help=_('Maximum number of clusters whose client certificates '
+                      'are kept in memory. The least recently used entries '
+                      'are dropped first.')),
+    cfg.IntOpt('ca_key_cache_ttl',
+               default=60,
+               min=0,
+               help=_('Number of seconds the CA private keys of a cluster '
+                      'are kept in memory, decrypted, after being fetched '
+                      'to sign a certificate. Set to 0 to disable the '
+                      'cache.')),
+    cfg.IntOpt('ca_key_cache_size',
+               default=256,
+               min=1,
+               help=_('Maximum number of CA private keys kept in memory. '
+                      'The least recently used keys are dropped first.')),
     cfg.IntOpt('pre_delete_lb_timeout',
                default=60,
                help=_('The timeout in seconds to wait for the load balancers '
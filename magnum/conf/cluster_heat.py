@@ -37,7 +37,15 @@ cluster_heat_opts = [
                      'This interval is in minutes. The default is 60 minutes.'
                      ),
                deprecated_group='bay_heat',
-               deprecated_name='bay_create_timeout')
+               deprecated_name='bay_create_timeout'),
+    cfg.BoolOpt('batch_stack_polling',
+                default=False,
+                help=('When syncing the status of a cluster, retrieve the '
+                      'status of all its nodegroup stacks with a single '
+                      'Heat stack list call, and only fetch the details '
+                      'and outputs of the stacks whose status changed since '
+                      'the previous poll. Requires the Heat API to support '
+                      'filtering stacks by id.')),
 ]
 
 
@@ -26,7 +26,28 @@ conductor_service_opts = [
                      'used for cluster locking.')),
     cfg.IntOpt('workers',
                help='Number of magnum-conductor processes to fork and run. '
-                    'Default to number of CPUs on the host.')
+                    'Default to number of CPUs on the host.'),
+    cfg.IntOpt('periodic_sync_workers',
+               default=64,
+               min=1,
+               help=('Maximum number of clusters whose status or health is '
+                     'synchronized concurrently by each periodic task. '
+                     'Clusters beyond this limit are queued, and a cluster '
+                     'whose previous sync is still running is skipped.')),
+    cfg.BoolOpt('periodic_sync_sharding',
+                default=False,
+                help=('Split the periodic cluster status and health sync '
+                      'between all the live magnum-conductor hosts. Each '
+                      'host polls only the clusters that a consistent hash '
+                      'ring built from the service heartbeats assigns to '
+                      'it. When disabled, every conductor host polls every '
+                      'cluster.')),
+    cfg.IntOpt('stats_log_interval',
+               default=300,
+               help=('Interval, in seconds, at which the conductor logs '
+                     'the counters of its caches and pools, such as the '
+                     'RSA key pool, at debug level. If this number is '
+                     'negative the periodic task will be disabled.')),
 ]
 
 
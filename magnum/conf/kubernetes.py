@@ -33,6 +33,37 @@ kubernetes_opts = [
                help=('The default polling interval for Kubernetes cluster '
                      'health. If this number is negative the periodic task '
                      'will be disabled.')),
+    cfg.IntOpt('api_session_idle_timeout',
+               default=300,
+               min=0,
+               help=('Number of seconds a pooled HTTPS session to the '
+                     'Kubernetes API of a cluster is kept open without '
+                     'being used. Pooled sessions reuse their connections '
+                     'across health polls instead of doing a TLS handshake '
+                     'for every request. Set to 0 to open a new session '
+                     'for every client.')),
+    cfg.IntOpt('api_list_page_size',
+               default=500,
+               min=0,
+               help=('Maximum number of objects requested at once when '
+                     'listing the nodes or pods of a Kubernetes cluster. '
+                     'Larger collections are fetched in several pages, '
+                     'which bounds the memory used to walk them. Set to 0 '
+                     'to fetch whole collections with a single request.')),
+    cfg.BoolOpt('health_watch_enabled',
+                default=False,
+                help=('Track the readiness of the nodes of each Kubernetes '
+                      'cluster with a watch of its nodes, instead of listing '
+                      'them on every health poll. The health of a cluster '
+                      'is then updated as soon as the readiness of one of '
+                      'its nodes changes. This keeps a connection open to '
+                      'the API server of each cluster.')),
+    cfg.IntOpt('health_watch_resync_interval',
+               default=300,
+               min=30,
+               help=('Number of seconds a watch of the nodes of a '
+                     'Kubernetes cluster lasts, before the nodes are '
+                     'listed again and a new watch started.')),
 ]
 
 
@@ -56,7 +56,19 @@ trust_opts = [
                help=_('Auth interface used by instances/trustee')),
     cfg.StrOpt('trustee_keystone_region_name',
                help=_('Region in Identity service catalog to use for '
-                      'communication with the OpenStack service.'))
+                      'communication with the OpenStack service.')),
+    cfg.IntOpt('trustee_cache_ttl',
+               default=300,
+               min=0,
+               help=_('Number of seconds the id of the trustee domain and '
+                      'the project of trustee users are kept in memory '
+                      'after being looked up in Keystone. Set to 0 to '
+                      'disable the cache.')),
+    cfg.IntOpt('trustee_cache_size',
+               default=1024,
+               min=1,
+               help=_('Maximum number of trustee users whose project is '
+                      'kept in memory.')),
 ]
 
 
@@ -31,7 +31,13 @@ utils_opts = [
                help='Explicitly specify the temporary working directory.'),
     cfg.ListOpt('password_symbols',
                 default=DEFAULT_PASSWORD_SYMBOLS,
-                help='Symbols to use for passwords')
+                help='Symbols to use for passwords'),
+    cfg.IntOpt('trace_buffer_size',
+               default=0,
+               min=0,
+               help='Number of the latest trace events of the API and '
+                    'conductor to keep in memory, and include in the Guru '
+                    'Meditation Report. 0 disables tracing.'),
 ]
 
 periodic_opts = [
@@ -48,7 +48,20 @@ x509_opts = [
                default=365 * 5,
                help=_('Number of days for which a certificate is valid.')),
     cfg.IntOpt('rsa_key_size',
-               default=2048, help=_('Size of generated private key. '))]
+               default=2048, help=_('Size of generated private key. ')),
+    cfg.IntOpt('key_pool_size',
+               default=0,
+               min=0,
+               help=_('Number of RSA private keys of rsa_key_size bits '
+                      'generated ahead of time by each conductor worker, so '
+                      'that cluster certificates can be issued without '
+                      'waiting for a new key. Keys are generated inline when '
+                      'the pool is empty. Set to 0 to disable the pool.')),
+    cfg.IntOpt('key_pool_workers',
+               default=1,
+               min=1,
+               help=_('Number of processes generating the keys of the RSA '
+                      'key pool.'))]
 
 
 def register_opts(conf):
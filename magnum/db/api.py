@@ -202,6 +202,19 @@ class Connection(object):
         :returns: A ClusterTemplate.
         """
 
+    @abc.abstractmethod
+    def get_cluster_templates_by_uuids(self, context, cluster_template_uuids):
+        """Return the ClusterTemplates matching a set of uuids.
+
+        Used to resolve the templates of a whole page of clusters in a
+        single query. Templates that are not visible in the given context
+        are silently left out of the result.
+
+        :param context: The security context
+        :param cluster_template_uuids: An iterable of ClusterTemplate uuids.
+        :returns: A list of ClusterTemplates.
+        """
+
     @abc.abstractmethod
     def get_cluster_template_by_name(self, context, cluster_template_name):
         """Return a ClusterTemplate.
@@ -647,6 +660,22 @@ class Connection(object):
         :returns: A list of nodegroup records.
         """
 
+    @abc.abstractmethod
+    def get_cluster_rollups(self, context, cluster_ids):
+        """Get the node counts and addresses of several clusters at once.
+
+        The counts are summed over the nodegroups of each cluster in the
+        DB, with a single grouped query, and the addresses are read with a
+        second query.
+
+        :param context: The security context
+        :param cluster_ids: An iterable of uuids of the clusters.
+
+        :returns: A dict mapping the uuid of each cluster to a dict with
+                  its 'node_count', 'master_count', 'node_addresses' and
+                  'master_addresses'.
+        """
+
     @abc.abstractmethod
     def get_cluster_nodegroup_count(self, context, cluster_id):
         """Get count of nodegroups in a given cluster.
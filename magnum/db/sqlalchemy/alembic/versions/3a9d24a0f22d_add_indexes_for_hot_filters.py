@@ -0,0 +1,34 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""add indexes for cluster, nodegroup and x509keypair filters
+
+Revision ID: 3a9d24a0f22d
+Revises: 7da8489d6a68
+Create Date: 2026-10-18 10:12:41.318564
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3a9d24a0f22d'
+down_revision = '7da8489d6a68'
+
+from alembic import op  # noqa: E402
+
+
+def upgrade():
+    op.create_index('ix_cluster_status', 'cluster', ['status'])
+    op.create_index('ix_cluster_project_id', 'cluster', ['project_id'])
+    op.create_index('ix_nodegroup_cluster_id_role_is_default', 'nodegroup',
+                    ['cluster_id', 'role', 'is_default'])
+    op.create_index('ix_x509keypair_project_id', 'x509keypair',
+                    ['project_id'])
@@ -28,9 +28,8 @@ from sqlalchemy.orm.exc import MultipleResultsFound
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.sql import func
 
-from magnum.common import clients
-from magnum.common import context as request_context
 from magnum.common import exception
+from magnum.common import keystone
 import magnum.conf
 from magnum.db import api
 from magnum.db.sqlalchemy import models
@@ -129,20 +128,17 @@ class Connection(api.Connection):
         if context.is_admin and context.all_tenants:
             return query
 
-        admin_context = request_context.make_admin_context(all_tenants=True)
-        osc = clients.OpenStackClients(admin_context)
-        kst = osc.keystone()
+        trustee_domain_id = keystone.get_trustee_domain_id()
 
         # User in a regular project (not in the trustee domain)
-        if context.project_id and context.domain_id != kst.trustee_domain_id:
+        if context.project_id and context.domain_id != trustee_domain_id:
             query = query.filter_by(project_id=context.project_id)
         # Match project ID component in trustee user's user name against
         # cluster's project_id to associate per-cluster trustee users who have
         # no project information with the project their clusters/cluster models
         # reside in. This is equivalent to the project filtering above.
-        elif context.domain_id == kst.trustee_domain_id:
-            user_name = kst.client.users.get(context.user_id).name
-            user_project = user_name.split('_', 2)[1]
+        elif context.domain_id == trustee_domain_id:
+            user_project = keystone.get_trustee_user_project(context.user_id)
             query = query.filter_by(project_id=user_project)
         else:
             query = query.filter_by(user_id=context.user_id)
@@ -240,20 +236,19 @@ class Connection(api.Connection):
             raise exception.ClusterNotFound(cluster=cluster_uuid)
 
     def get_cluster_stats(self, context, project_id=None):
-        query = model_query(models.Cluster)
-        node_count_col = models.NodeGroup.node_count
-        ncfunc = func.sum(node_count_col)
-
+        # Count the clusters and sum their nodes in a single query. The
+        # outer join keeps the clusters which have no nodegroup yet.
+        query = model_query(
+            func.count(sa.distinct(models.Cluster.id)),
+            func.coalesce(func.sum(models.NodeGroup.node_count), 0))
+        query = query.select_from(models.Cluster).outerjoin(
+            models.NodeGroup,
+            models.NodeGroup.cluster_id == models.Cluster.uuid)
         if project_id:
-            query = query.filter_by(project_id=project_id)
-            nquery = query.session.query(ncfunc.label("nodes")).filter_by(
-                project_id=project_id)
-        else:
-            nquery = query.session.query(ncfunc.label("nodes"))
+            query = query.filter(models.Cluster.project_id == project_id)
 
-        clusters = query.count()
-        nodes = int(nquery.one()[0]) if nquery.one()[0] else 0
-        return clusters, nodes
+        clusters, nodes = query.one()
+        return clusters, int(nodes)
 
     def get_cluster_count_all(self, context, filters=None):
         query = model_query(models.Cluster)
@@ -366,6 +361,18 @@ class Connection(api.Connection):
             raise exception.ClusterTemplateNotFound(
                 clustertemplate=cluster_template_uuid)
 
+    def get_cluster_templates_by_uuids(self, context, cluster_template_uuids):
+        cluster_template_uuids = set(cluster_template_uuids)
+        if not cluster_template_uuids:
+            return []
+        query = model_query(models.ClusterTemplate)
+        query = self._add_tenant_filters(context, query)
+        public_q = model_query(models.ClusterTemplate).filter_by(public=True)
+        query = query.union(public_q)
+        query = query.filter(
+                models.ClusterTemplate.uuid.in_(cluster_template_uuids))
+        return query.all()
+
     def get_cluster_template_by_name(self, context, cluster_template_name):
         query = model_query(models.ClusterTemplate)
         query = self._add_tenant_filters(context, query)
@@ -897,6 +904,41 @@ class Connection(api.Connection):
         return _paginate_query(models.NodeGroup, limit, marker,
                                sort_key, sort_dir, query)
 
+    def get_cluster_rollups(self, context, cluster_ids):
+        rollups = {cluster_id: {'node_count': 0,
+                                'master_count': 0,
+                                'node_addresses': [],
+                                'master_addresses': []}
+                   for cluster_id in cluster_ids}
+        if not rollups:
+            return rollups
+
+        def nodegroup_query(*columns):
+            query = model_query(models.NodeGroup.cluster_id, *columns)
+            if not context.is_admin:
+                query = query.filter(
+                    models.NodeGroup.project_id == context.project_id)
+            return query.filter(models.NodeGroup.cluster_id.in_(rollups))
+
+        is_master = models.NodeGroup.role == 'master'
+        query = nodegroup_query(is_master,
+                                func.sum(models.NodeGroup.node_count))
+        query = query.group_by(models.NodeGroup.cluster_id, is_master)
+        for cluster_id, master, node_count in query:
+            key = 'master_count' if master else 'node_count'
+            rollups[cluster_id][key] = int(node_count or 0)
+
+        # The addresses are JSON encoded lists, which cannot be concatenated
+        # in SQL portably. Only fetch the columns needed to do it here.
+        query = nodegroup_query(models.NodeGroup.role,
+                                models.NodeGroup.node_addresses)
+        query = query.order_by(models.NodeGroup.id)
+        for cluster_id, role, node_addresses in query:
+            key = 'master_addresses' if role == 'master' else 'node_addresses'
+            rollups[cluster_id][key] += node_addresses or []
+
+        return rollups
+
     def get_cluster_nodegroup_count(self, context, cluster_id):
         query = model_query(models.NodeGroup)
         if not context.is_admin:
@@ -108,6 +108,8 @@ class Cluster(Base):
     __tablename__ = 'cluster'
     __table_args__ = (
         schema.UniqueConstraint('uuid', name='uniq_bay0uuid'),
+        schema.Index('ix_cluster_status', 'status'),
+        schema.Index('ix_cluster_project_id', 'project_id'),
         table_args()
     )
     id = Column(Integer, primary_key=True)
@@ -202,6 +204,7 @@ class X509KeyPair(Base):
     __table_args__ = (
         schema.UniqueConstraint('uuid',
                                 name='uniq_x509keypair0uuid'),
+        schema.Index('ix_x509keypair_project_id', 'project_id'),
         table_args()
     )
     id = Column(Integer, primary_key=True)
@@ -275,6 +278,8 @@ class NodeGroup(Base):
         schema.UniqueConstraint(
             'cluster_id', 'name',
             name='uniq_nodegroup0cluster_id0name'),
+        schema.Index('ix_nodegroup_cluster_id_role_is_default',
+                     'cluster_id', 'role', 'is_default'),
         table_args()
     )
     id = Column(Integer, primary_key=True)
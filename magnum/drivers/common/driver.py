@@ -17,7 +17,6 @@ import six
 
 from oslo_config import cfg
 from pkg_resources import iter_entry_points
-from stevedore import driver
 
 from magnum.common import exception
 from magnum.objects import cluster_template
@@ -30,6 +29,7 @@ CONF = cfg.CONF
 class Driver(object):
 
     definitions = None
+    instances = {}
 
     @classmethod
     def load_entry_points(cls):
@@ -85,6 +85,17 @@ class Driver(object):
 
         return cls.definitions
 
+    @classmethod
+    def reload_drivers(cls):
+        """Forget the loaded drivers.
+
+        The drivers are loaded from the entry points again on the next call
+        to `get_drivers` or `get_driver`, e.g. after a driver has been
+        installed, removed or disabled.
+        """
+        cls.definitions = None
+        cls.instances.clear()
+
     @classmethod
     def get_driver(cls, server_type, os, coe):
         """Get Driver.
@@ -132,8 +143,14 @@ class Driver(object):
         # TODO(muralia): once --drivername is supported as an input during
         # cluster create, change the following line to use driver name for
         # loading.
-        return driver.DriverManager("magnum.drivers",
-                                    driver_info['entry_point_name']).driver()
+        entry_point_name = driver_info['entry_point_name']
+        # Drivers keep no per-cluster state, so a single instance of each
+        # one is shared by all the callers.
+        instance = cls.instances.get(entry_point_name)
+        if instance is None:
+            instance = driver_info['class']()
+            cls.instances[entry_point_name] = instance
+        return instance
 
     @classmethod
     def get_driver_for_cluster(cls, context, cluster):
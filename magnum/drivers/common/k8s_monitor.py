@@ -14,9 +14,13 @@ from oslo_utils import strutils
 
 from magnum.common import utils
 from magnum.conductor import k8s_api as k8s
+from magnum.conductor import k8s_watch
 from magnum.conductor import monitors
+import magnum.conf
 from magnum.objects import fields as m_fields
 
+CONF = magnum.conf.CONF
+
 
 class K8sMonitor(monitors.MonitorBase):
 
@@ -130,26 +134,15 @@ class K8sMonitor(monitors.MonitorBase):
             [{'Memory': 1280000.0, cpu: 0.5},
              {'Memory': 1280000.0, cpu: 0.5}]
         """
-        pods = pods['items']
-        parsed_containers = []
-        for pod in pods:
-            containers = pod['spec']['containers']
-            for container in containers:
-                memory = 0
-                cpu = 0
-                resources = container['resources']
-                limits = resources['limits']
-                if limits is not None:
-                    if limits.get('memory', ''):
-                        memory = utils.get_k8s_quantity(limits['memory'])
-                    if limits.get('cpu', ''):
-                        cpu = utils.get_k8s_quantity(limits['cpu'])
-                container_dict = {
-                    'Memory': memory,
-                    'Cpu': cpu,
-                }
-                parsed_containers.append(container_dict)
-        return parsed_containers
+        limits = [container['resources']['limits'] or {}
+                  for pod in pods['items']
+                  for container in pod['spec']['containers']]
+        # Containers without a limit count for 0.
+        memory = utils.get_k8s_quantities(
+            [limit.get('memory') or '0' for limit in limits])
+        cpu = utils.get_k8s_quantities(
+            [limit.get('cpu') or '0' for limit in limits])
+        return [{'Memory': m, 'Cpu': c} for m, c in zip(memory, cpu)]
 
     def _parse_node_info(self, nodes):
         """Parse nodes to retrieve memory and cpu of each node
@@ -178,18 +171,14 @@ class K8sMonitor(monitors.MonitorBase):
              {'cpu': 1, 'Memory': 1024.0}]
 
         """
-        nodes = nodes['items']
-        parsed_nodes = []
-        for node in nodes:
-            # Output of node.status.capacity is strong
-            # for example:
-            # capacity = "{'cpu': '1', 'memory': '1000Ki'}"
-            capacity = node['status']['capacity']
-            memory = utils.get_k8s_quantity(capacity['memory'])
-            cpu = int(capacity['cpu'])
-            parsed_nodes.append({'Memory': memory, 'Cpu': cpu})
-
-        return parsed_nodes
+        # Output of node.status.capacity is strong
+        # for example:
+        # capacity = "{'cpu': '1', 'memory': '1000Ki'}"
+        capacities = [node['status']['capacity'] for node in nodes['items']]
+        memory = utils.get_k8s_quantities(
+            [capacity['memory'] for capacity in capacities])
+        return [{'Memory': m, 'Cpu': int(capacity['cpu'])}
+                for m, capacity in zip(memory, capacities)]
 
     def _poll_health_status(self, k8s_api):
         """Poll health status of API and nodes for given cluster
@@ -206,8 +195,9 @@ class K8sMonitor(monitors.MonitorBase):
 
         3.  How to get the health_status and health_status_reason?
             3.1 Call /healthz to get the API health status
-            3.2 Call list_node (using API /api/v1/nodes) to get the nodes
-                health status
+            3.2 Call iter_nodes (using API /api/v1/nodes) to get the nodes
+                health status, page by page, unless it is tracked by the
+                node watcher of the cluster
 
         :param k8s_api: The api client to the cluster
         :return: Tumple including status and reason. Example:
@@ -230,15 +220,17 @@ class K8sMonitor(monitors.MonitorBase):
         try:
             api_status = k8s_api.get_healthz()
 
-            for node in k8s_api.list_node()['items']:
-                node_key = node['metadata']['name'] + ".Ready"
-                ready = False
-                for condition in node['status']['conditions']:
-                    if condition['type'] == 'Ready':
-                        ready = strutils.bool_from_string(condition['status'])
-                        break
-
-                health_status_reason[node_key] = ready
+            readiness = None
+            if CONF.kubernetes.health_watch_enabled:
+                readiness = k8s_watch.get_watcher(
+                    self.context, self.cluster).readiness()
+            if readiness is None:
+                readiness = {node['metadata']['name']:
+                             k8s_watch.is_node_ready(node)
+                             for node in k8s_api.iter_nodes()}
+
+            for name, ready in readiness.items():
+                health_status_reason[name + ".Ready"] = ready
 
             if (api_status == 'ok' and
                     all(n for n in health_status_reason.values())):
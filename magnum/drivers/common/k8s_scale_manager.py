@@ -10,9 +10,28 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from magnum.common import utils
 from magnum.conductor import k8s_api as k8s
+from magnum.conductor.scale_manager import HostLoad
 from magnum.conductor.scale_manager import ScaleManager
 
+# Pods keeping a host busy: scheduled, and neither succeeded nor failed.
+_ACTIVE_PODS = ('spec.nodeName!=,status.phase!=Succeeded,'
+                'status.phase!=Failed')
+
+# Annotation set by the kubelet on the mirror pods of its static pods.
+_MIRROR_POD_ANNOTATION = 'kubernetes.io/config.mirror'
+
+
+def _is_per_node_pod(pod):
+    # DaemonSet pods and mirror pods run on every node, or are bound to
+    # theirs, so they neither load a host nor keep it from being empty.
+    metadata = pod.get('metadata') or {}
+    if _MIRROR_POD_ANNOTATION in (metadata.get('annotations') or {}):
+        return True
+    return any(owner.get('kind') == 'DaemonSet'
+               for owner in metadata.get('ownerReferences') or [])
+
 
 class K8sScaleManager(ScaleManager):
 
@@ -22,7 +41,35 @@ class K8sScaleManager(ScaleManager):
     def _get_hosts_with_container(self, context, cluster):
         k8s_api = k8s.KubernetesAPI(context, cluster)
         hosts = set()
-        for pod in k8s_api.list_namespaced_pod(namespace='default')['items']:
-            hosts.add(pod['spec']['node_name'])
+        # Pods not scheduled yet do not keep any host busy.
+        for pod in k8s_api.iter_namespaced_pods(
+                'default', field_selector='spec.nodeName!='):
+            hosts.add(pod['spec']['nodeName'])
 
         return hosts
+
+    def _get_host_loads(self, context, cluster):
+        """Sum the pods of all namespaces, and their requests, by host.
+
+        Hosts are identified by the IP address of their node, as in the
+        outputs of the Heat stack. DaemonSet and mirror pods are left
+        out, a host running only those counts as empty.
+        """
+        k8s_api = k8s.KubernetesAPI(context, cluster)
+        loads = {}
+        for pod in k8s_api.iter_pods(field_selector=_ACTIVE_PODS):
+            host = pod['status'].get('hostIP')
+            if not host or _is_per_node_pod(pod):
+                continue
+            cpu = memory = 0
+            for container in pod['spec']['containers']:
+                requests = (container.get('resources') or {}).get(
+                    'requests') or {}
+                if requests.get('cpu'):
+                    cpu += utils.get_k8s_quantity(requests['cpu'])
+                if requests.get('memory'):
+                    memory += utils.get_k8s_quantity(requests['memory'])
+            load = loads.get(host, HostLoad(0, 0, 0))
+            loads[host] = HostLoad(load.pods + 1, load.cpu + cpu,
+                                   load.memory + memory)
+        return loads
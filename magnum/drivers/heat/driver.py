@@ -12,13 +12,16 @@
 
 import abc
 import collections
+import copy
 import os
 from pbr.version import SemanticVersion as SV
 import six
+from urllib import parse
 
 from string import ascii_letters
 from string import digits
 
+import cachetools
 from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_utils import importutils
@@ -32,9 +35,11 @@ from magnum.common import exception
 from magnum.common import keystone
 from magnum.common import octavia
 from magnum.common import short_id
+from magnum.common import tracing
 from magnum.common.x509 import operations as x509
 from magnum.conductor.handlers.common import cert_manager
 from magnum.conductor.handlers.common import trust_manager
+from magnum.conductor import k8s_api
 from magnum.conductor import utils as conductor_utils
 from magnum.drivers.common import driver
 from magnum.drivers.common import k8s_monitor
@@ -47,6 +52,42 @@ LOG = logging.getLogger(__name__)
 NodeGroupStatus = collections.namedtuple('NodeGroupStatus',
                                          'name status reason is_default')
 
+STACK_COMPLETE_STATES = (fields.ClusterStatus.CREATE_COMPLETE,
+                         fields.ClusterStatus.UPDATE_COMPLETE)
+STACK_FAILED_STATES = (fields.ClusterStatus.CREATE_FAILED,
+                       fields.ClusterStatus.DELETE_FAILED,
+                       fields.ClusterStatus.UPDATE_FAILED,
+                       fields.ClusterStatus.ROLLBACK_COMPLETE,
+                       fields.ClusterStatus.ROLLBACK_FAILED)
+
+TemplateBundle = collections.namedtuple(
+    'TemplateBundle', 'template files environment_files mtimes')
+
+# Parsed stack templates, keyed by template path and environment files.
+_template_bundles = cachetools.LRUCache(maxsize=64)
+
+# Version of the COMPLETE stacks whose outputs were last synced by a batched
+# poll, keyed by stack and nodegroup, see HeatPoller._poll_stack.
+_synced_stacks = cachetools.LRUCache(maxsize=4096)
+
+
+def _stack_version(stack):
+    # Heat bumps updated_time on every update of the stack, it is unset
+    # until the first one.
+    return (stack.stack_status,
+            getattr(stack, 'updated_time', None) or
+            getattr(stack, 'creation_time', None))
+
+
+def _get_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
 
 @six.add_metaclass(abc.ABCMeta)
 class HeatDriver(driver.Driver):
@@ -87,6 +128,38 @@ class HeatDriver(driver.Driver):
                 env_paths=env_abs_paths, env_list_tracker=environment_files))
         return environment_files, env_map
 
+    def _get_template_bundle(self, template_path, env_rel_paths):
+        """Get the template, files and environment files of a stack.
+
+        Parsing the templates and environments is cached, as long as none
+        of the local files they are made of has been modified or removed
+        since.
+
+        :returns: a :class:`TemplateBundle`, that the caller may modify.
+        """
+        key = (template_path, tuple(env_rel_paths))
+        bundle = _template_bundles.pop(key, None)
+        if bundle is None or bundle.mtimes != _get_mtimes(bundle.mtimes):
+            tpl_files, template = template_utils.get_template_contents(
+                template_path)
+            environment_files, env_map = self._get_env_files(template_path,
+                                                             env_rel_paths)
+            tpl_files.update(env_map)
+            paths = {template_path}
+            paths.update(parse.urlparse(url).path for url in tpl_files
+                         if url.startswith('file://'))
+            paths.update(os.path.join(os.path.dirname(template_path), f)
+                         for f in env_rel_paths)
+            bundle = TemplateBundle(template, tpl_files, environment_files,
+                                    _get_mtimes(paths))
+        if None not in bundle.mtimes.values():
+            _template_bundles[key] = bundle
+
+        return TemplateBundle(copy.deepcopy(bundle.template),
+                              dict(bundle.files),
+                              list(bundle.environment_files),
+                              dict(bundle.mtimes))
+
     @abc.abstractmethod
     def get_template_definition(self):
         """return an implementation of
@@ -190,12 +263,8 @@ class HeatDriver(driver.Driver):
             self._extract_template_definition(context, cluster,
                                               nodegroups=nodegroups))
 
-        tpl_files, template = template_utils.get_template_contents(
-            template_path)
-
-        environment_files, env_map = self._get_env_files(template_path,
-                                                         env_files)
-        tpl_files.update(env_map)
+        template, tpl_files, environment_files, _ = (
+            self._get_template_bundle(template_path, env_files))
 
         # Make sure we end up with a valid hostname
         valid_chars = set(ascii_letters + digits + '-')
@@ -491,11 +560,20 @@ class HeatPoller(object):
         self.template_def = cluster_driver.get_template_definition()
 
     def poll_and_check(self):
+        with tracing.span('HeatPoller.poll_and_check',
+                          cluster=self.cluster.uuid):
+            self._poll_and_check()
+
+    def _poll_and_check(self):
         # TODO(yuanying): temporary implementation to update api_address,
         # node_addresses and cluster status
         ng_statuses = list()
         self.default_ngs = list()
-        for nodegroup in self.cluster.nodegroups:
+        nodegroups = self.cluster.nodegroups
+        self.stacks = None
+        if cfg.CONF.cluster_heat.batch_stack_polling:
+            self.stacks = self._list_stacks(nodegroups)
+        for nodegroup in nodegroups:
             self.nodegroup = nodegroup
             if self.nodegroup.is_default:
                 self.default_ngs.append(self.nodegroup)
@@ -522,18 +600,19 @@ class HeatPoller(object):
                                    reason=self.nodegroup.status_reason)
 
         try:
-            # Do not resolve outputs by default. Resolving all
-            # node IPs is expensive on heat.
-            stack = self.openstack_client.heat().stacks.get(
-                self.nodegroup.stack_id, resolve_outputs=False)
-
-            if stack.stack_status in (fields.ClusterStatus.CREATE_COMPLETE,
-                                      fields.ClusterStatus.UPDATE_COMPLETE):
-                # Resolve all outputs if the stack is COMPLETE
-                stack = self.openstack_client.heat().stacks.get(
-                    self.nodegroup.stack_id, resolve_outputs=True)
-
+            stack = self._poll_stack()
+            if stack is None:
+                # The stack status did not change since the last poll.
+                return NodeGroupStatus(name=self.nodegroup.name,
+                                       status=self.nodegroup.status,
+                                       is_default=self.nodegroup.is_default,
+                                       reason=self.nodegroup.status_reason)
+
+            if stack.stack_status in STACK_COMPLETE_STATES:
                 self._sync_cluster_and_template_status(stack)
+                if self.stacks is not None:
+                    _synced_stacks[self._synced_stack_key()] = (
+                        _stack_version(self.stacks[self.nodegroup.stack_id]))
             elif stack.stack_status != self.nodegroup.status:
                 self.template_def.nodegroup_output_mappings = list()
                 self.template_def.update_outputs(
@@ -550,11 +629,7 @@ class HeatPoller(object):
                     self.nodegroup.destroy()
                     return
 
-            if stack.stack_status in (fields.ClusterStatus.CREATE_FAILED,
-                                      fields.ClusterStatus.DELETE_FAILED,
-                                      fields.ClusterStatus.UPDATE_FAILED,
-                                      fields.ClusterStatus.ROLLBACK_COMPLETE,
-                                      fields.ClusterStatus.ROLLBACK_FAILED):
+            if stack.stack_status in STACK_FAILED_STATES:
                 self._sync_cluster_and_template_status(stack)
                 self._nodegroup_failed(stack)
         except heatexc.NotFound:
@@ -564,6 +639,54 @@ class HeatPoller(object):
                                is_default=self.nodegroup.is_default,
                                reason=self.nodegroup.status_reason)
 
+    def _list_stacks(self, nodegroups):
+        stack_ids = set(ng.stack_id for ng in nodegroups if ng.stack_id)
+        if not stack_ids:
+            return {}
+        # Deleted stacks are needed too, to notice DELETE_COMPLETE.
+        stacks = self.openstack_client.heat().stacks.list(
+            filters={'id': list(stack_ids)}, show_deleted=True)
+        return {stack.id: stack for stack in stacks}
+
+    def _poll_stack(self):
+        """Return the stack of the current nodegroup.
+
+        Outputs are only resolved for COMPLETE stacks since resolving all
+        node IPs is expensive on heat. When the stacks were listed in
+        batch, None is returned for the stacks with nothing to sync: those
+        still IN_PROGRESS with an unchanged status, and the COMPLETE ones
+        not updated since their outputs were last synced by this
+        conductor. The other stacks are returned whether their status
+        changed or not, so that their outputs are synced.
+
+        :raises: heatclient.exc.NotFound if the stack does not exist.
+        """
+        stack_id = self.nodegroup.stack_id
+        heat = self.openstack_client.heat()
+        if self.stacks is None:
+            stack = heat.stacks.get(stack_id, resolve_outputs=False)
+            if stack.stack_status not in STACK_COMPLETE_STATES:
+                return stack
+            return heat.stacks.get(stack_id, resolve_outputs=True)
+
+        try:
+            summary = self.stacks[stack_id]
+        except KeyError:
+            raise heatexc.NotFound(_("Stack %s not found") % stack_id)
+        if summary.stack_status == self.nodegroup.status:
+            if summary.stack_status.endswith('_IN_PROGRESS'):
+                return None
+            if (summary.stack_status in STACK_COMPLETE_STATES and
+                    _synced_stacks.get(self._synced_stack_key()) ==
+                    _stack_version(summary)):
+                return None
+        return heat.stacks.get(
+            stack_id,
+            resolve_outputs=summary.stack_status in STACK_COMPLETE_STATES)
+
+    def _synced_stack_key(self):
+        return (self.nodegroup.stack_id, self.nodegroup.uuid)
+
     def aggregate_nodegroup_statuses(self, ng_statuses):
         # NOTE(ttsiouts): Aggregate the nodegroup statuses and set the
         # cluster overall status.
@@ -627,12 +750,18 @@ class HeatPoller(object):
                                                           context=self.context)
             cert_manager.delete_client_files(self.cluster,
                                              context=self.context)
+            k8s_api.close_session(self.cluster.uuid)
 
         except exception.ClusterNotFound:
             LOG.info('The cluster %s has been deleted by others.',
                      self.cluster.uuid)
 
     def _sync_cluster_status(self, stack):
+        if (self.stacks is not None and
+                self.nodegroup.status == stack.stack_status and
+                self.nodegroup.status_reason == stack.stack_status_reason):
+            # Batched polls do not write back an unchanged status.
+            return
         self.nodegroup.status = stack.stack_status
         self.nodegroup.status_reason = stack.stack_status_reason
         self.nodegroup.save()
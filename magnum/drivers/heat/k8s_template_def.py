@@ -31,11 +31,11 @@ KUBE_INSECURE_PORT = '8080'
 
 class K8sApiAddressOutputMapping(template_def.OutputMapping):
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None):
         if self.cluster_attr is None:
             return
 
-        output_value = self.get_output_value(stack, cluster)
+        output_value = self.get_output_value(stack, cluster, outputs=outputs)
         if output_value is not None:
             # TODO(yuanying): port number is hardcoded, this will be fix
             protocol = 'https'
@@ -64,13 +64,15 @@ class ServerAddressOutputMapping(template_def.NodeGroupOutputMapping):
         self.heat_output = self.public_ip_output_key
         self.is_stack_param = False
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None,
+                   nodegroups=None):
         if not cluster.floating_ip_enabled:
             self.heat_output = self.private_ip_output_key
 
         LOG.debug("Using heat_output: %s", self.heat_output)
-        super(ServerAddressOutputMapping,
-              self).set_output(stack, cluster_template, cluster)
+        return super(ServerAddressOutputMapping,
+                     self).set_output(stack, cluster_template, cluster,
+                                      outputs=outputs, nodegroups=nodegroups)
 
 
 class MasterAddressOutputMapping(ServerAddressOutputMapping):
@@ -20,11 +20,11 @@ DOCKER_PORT = '2376'
 
 class SwarmApiAddressOutputMapping(template_def.OutputMapping):
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None):
         if self.cluster_attr is None:
             return
 
-        output_value = self.get_output_value(stack, cluster)
+        output_value = self.get_output_value(stack, cluster, outputs=outputs)
         if output_value is not None:
             # Note(rocha): protocol should always be tcp as the docker
             # command client does not handle https (see bug #1604812).
@@ -22,11 +22,11 @@ LOG = logging.getLogger(__name__)
 
 class SwarmModeApiAddressOutputMapping(template_def.OutputMapping):
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None):
         if self.cluster_attr is None:
             return
 
-        output_value = self.get_output_value(stack, cluster)
+        output_value = self.get_output_value(stack, cluster, outputs=outputs)
         if output_value is not None:
             # Note(rocha): protocol should always be tcp as the docker
             # command client does not handle https (see bug #1604812).
@@ -56,32 +56,46 @@ class MasterAddressOutputMapping(ServerAddressOutputMapping):
     private_ip_output_key = ['swarm_primary_master_private',
                              'swarm_secondary_masters_private']
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None,
+                   nodegroups=None):
         if not cluster.floating_ip_enabled:
             self.heat_output = self.private_ip_output_key
 
         LOG.debug("Using heat_output: %s", self.heat_output)
+        if outputs is None:
+            outputs = template_def.get_stack_outputs(stack)
         _master_addresses = []
-        for output in stack.to_dict().get('outputs', []):
-            if output['output_key'] in self.heat_output:
-                _master_addresses += output['output_value']
-
-        for ng in cluster.nodegroups:
-            if ng.uuid == self.nodegroup_uuid:
-                setattr(ng, self.nodegroup_attr, _master_addresses)
+        for output_key in self.heat_output:
+            if output_key in outputs:
+                _master_addresses += outputs[output_key]
+
+        save = nodegroups is None
+        if nodegroups is None:
+            nodegroups = {ng.uuid: ng for ng in cluster.nodegroups}
+        ng = nodegroups.get(self.nodegroup_uuid)
+        if ng is None:
+            return False
+        if getattr(ng, self.nodegroup_attr, None) == _master_addresses:
+            return False
+        setattr(ng, self.nodegroup_attr, _master_addresses)
+        if save:
+            ng.save()
+        return True
 
 
 class NodeAddressOutputMapping(ServerAddressOutputMapping):
     public_ip_output_key = 'swarm_nodes'
     private_ip_output_key = 'swarm_nodes_private'
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None,
+                   nodegroups=None):
         if not cluster.floating_ip_enabled:
             self.heat_output = self.private_ip_output_key
 
         LOG.debug("Using heat_output: %s", self.heat_output)
-        super(NodeAddressOutputMapping,
-              self).set_output(stack, cluster_template, cluster)
+        return super(NodeAddressOutputMapping,
+                     self).set_output(stack, cluster_template, cluster,
+                                      outputs=outputs, nodegroups=nodegroups)
 
 
 class SwarmModeTemplateDefinition(template_def.BaseTemplateDefinition):
@@ -37,6 +37,12 @@ COMMON_ENV_PATH = COMMON_TEMPLATES_PATH + "environments/"
 CONF = magnum.conf.CONF
 
 
+def get_stack_outputs(stack):
+    """Index the outputs of a stack by output key."""
+    return {output['output_key']: output['output_value']
+            for output in stack.to_dict().get('outputs', [])}
+
+
 class ParameterMapping(object):
     """A mapping associating heat param and cluster_template attr.
 
@@ -110,11 +116,11 @@ class OutputMapping(object):
         self.cluster_attr = cluster_attr
         self.heat_output = heat_output
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None):
         if self.cluster_attr is None:
             return
 
-        output_value = self.get_output_value(stack, cluster)
+        output_value = self.get_output_value(stack, cluster, outputs=outputs)
         if output_value is None:
             return
         setattr(cluster, self.cluster_attr, output_value)
@@ -122,10 +128,16 @@ class OutputMapping(object):
     def matched(self, output_key):
         return self.heat_output == output_key
 
-    def get_output_value(self, stack, cluster):
-        for output in stack.to_dict().get('outputs', []):
-            if output['output_key'] == self.heat_output:
-                return output['output_value']
+    def get_output_value(self, stack, cluster, outputs=None):
+        """Get the value of the heat output of the mapping.
+
+        :param outputs: the stack outputs, as indexed by get_stack_outputs.
+                        They are read from the stack if not provided.
+        """
+        if outputs is None:
+            outputs = get_stack_outputs(stack)
+        if self.heat_output in outputs:
+            return outputs[self.heat_output]
 
         LOG.debug('cluster %(cluster_uuid)s, status %(cluster_status)s, '
                   'stack %(stack_id)s does not have output_key '
@@ -153,30 +165,43 @@ class NodeGroupOutputMapping(OutputMapping):
         self.heat_output = heat_output
         self.is_stack_param = is_stack_param
 
-    def set_output(self, stack, cluster_template, cluster):
+    def set_output(self, stack, cluster_template, cluster, outputs=None,
+                   nodegroups=None):
+        """Set the output value on the nodegroup of the mapping.
+
+        :param outputs: the stack outputs, as indexed by get_stack_outputs.
+        :param nodegroups: dict of the cluster nodegroups by uuid. When
+                           provided, the caller is in charge of saving the
+                           nodegroups, otherwise the nodegroup is fetched
+                           and saved right away.
+        :returns: True if the nodegroup was modified.
+        """
         if self.nodegroup_attr is None:
-            return
+            return False
 
-        output_value = self.get_output_value(stack, cluster)
+        output_value = self.get_output_value(stack, cluster, outputs=outputs)
         if output_value is None:
-            return
-
-        for ng in cluster.nodegroups:
-            if ng.uuid == self.nodegroup_uuid:
-                # nodegroups are fetched from the database every
-                # time, so the bad thing here is that we need to
-                # save each change.
-                previous_value = getattr(ng, self.nodegroup_attr, None)
-                if previous_value == output_value:
-                    # Avoid saving if it's not needed.
-                    return
-                setattr(ng, self.nodegroup_attr, output_value)
-                ng.save()
-
-    def get_output_value(self, stack, cluster):
+            return False
+
+        save = nodegroups is None
+        if nodegroups is None:
+            nodegroups = {ng.uuid: ng for ng in cluster.nodegroups}
+        ng = nodegroups.get(self.nodegroup_uuid)
+        if ng is None:
+            return False
+        previous_value = getattr(ng, self.nodegroup_attr, None)
+        if previous_value == output_value:
+            # Avoid saving if it's not needed.
+            return False
+        setattr(ng, self.nodegroup_attr, output_value)
+        if save:
+            ng.save()
+        return True
+
+    def get_output_value(self, stack, cluster, outputs=None):
         if not self.is_stack_param:
             return super(NodeGroupOutputMapping, self).get_output_value(
-                stack, cluster)
+                stack, cluster, outputs=outputs)
         return self.get_param_value(stack)
 
     def get_param_value(self, stack):
@@ -317,10 +342,31 @@ class TemplateDefinition(object):
 
     def update_outputs(self, stack, cluster_template, cluster,
                        nodegroups=None):
+        outputs = get_stack_outputs(stack)
         for output in self.output_mappings:
-            output.set_output(stack, cluster_template, cluster)
+            output.set_output(stack, cluster_template, cluster,
+                              outputs=outputs)
+        ng_mappings = []
         for output in self.nodegroup_output_mappings:
-            output.set_output(stack, cluster_template, cluster)
+            if isinstance(output, NodeGroupOutputMapping):
+                ng_mappings.append(output)
+            else:
+                output.set_output(stack, cluster_template, cluster,
+                                  outputs=outputs)
+        if not ng_mappings:
+            return
+
+        # Fetch the nodegroups once and save each of them at most once,
+        # whatever the number of mappings pointing to it.
+        nodegroups_by_uuid = {ng.uuid: ng for ng in cluster.nodegroups}
+        changed = set()
+        for output in ng_mappings:
+            if output.set_output(stack, cluster_template, cluster,
+                                 outputs=outputs,
+                                 nodegroups=nodegroups_by_uuid):
+                changed.add(output.nodegroup_uuid)
+        for ng_uuid in changed:
+            nodegroups_by_uuid[ng_uuid].save()
 
     @abc.abstractproperty
     def driver_module_path(self):
@@ -25,6 +25,17 @@ from magnum.objects.nodegroup import NodeGroup
 LAZY_LOADED_ATTRS = ['cluster_template']
 
 
+def _sum_nodegroups(nodegroups):
+    # Sums the node counts and addresses of nodegroups per role.
+    rollup = {'node_count': 0, 'master_count': 0,
+              'node_addresses': [], 'master_addresses': []}
+    for ng in nodegroups:
+        role = 'master' if ng.role == 'master' else 'node'
+        rollup['%s_count' % role] += ng.node_count
+        rollup['%s_addresses' % role] += ng.node_addresses or []
+    return rollup
+
+
 @base.MagnumObjectRegistry.register
 class Cluster(base.MagnumPersistentObject, base.MagnumObject,
               base.MagnumObjectDictCompat):
@@ -57,11 +68,15 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
     # Version 1.21  Added fixed_network, fixed_subnet, floating_ip_enabled
     # Version 1.22  Added master_lb_enabled
     # Version 1.23  Added etcd_ca_cert_ref and front_proxy_ca_cert_ref
+    # Version 1.24  Added get_rollups
 
-    VERSION = '1.23'
+    VERSION = '1.24'
 
     dbapi = dbapi.get_instance()
 
+    # Node counts and addresses attached by preload_rollups.
+    _preloaded_rollup = None
+
     fields = {
         'id': fields.IntegerField(),
         'uuid': fields.UUIDField(nullable=True),
@@ -133,29 +148,29 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
         filters = {'role': 'master', 'is_default': True}
         return NodeGroup.list(self._context, self.uuid, filters=filters)[0]
 
+    def _get_rollup(self):
+        # Returns the node counts and addresses summed over the nodegroups
+        # of the cluster. Lists of clusters get them in bulk, see
+        # preload_rollups.
+        if self._preloaded_rollup is not None:
+            return self._preloaded_rollup
+        return _sum_nodegroups(self.nodegroups)
+
     @property
     def node_count(self):
-        return sum(n.node_count for n in self.nodegroups if n.role != 'master')
+        return self._get_rollup()['node_count']
 
     @property
     def master_count(self):
-        return sum(n.node_count for n in self.nodegroups if n.role == 'master')
+        return self._get_rollup()['master_count']
 
     @property
     def node_addresses(self):
-        node_addresses = []
-        for ng in self.nodegroups:
-            if ng.role != 'master':
-                node_addresses += ng.node_addresses
-        return node_addresses
+        return list(self._get_rollup()['node_addresses'])
 
     @property
     def master_addresses(self):
-        master_addresses = []
-        for ng in self.nodegroups:
-            if ng.role == 'master':
-                master_addresses += ng.node_addresses
-        return master_addresses
+        return list(self._get_rollup()['master_addresses'])
 
     @staticmethod
     def _from_db_object_list(db_objects, cls, context):
@@ -163,6 +178,42 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
         return [Cluster._from_db_object(cls(context), obj)
                 for obj in db_objects]
 
+    @classmethod
+    def _preload_cluster_templates(cls, context, clusters):
+        db_cluster_templates = cls.dbapi.get_cluster_templates_by_uuids(
+            context, {cluster.cluster_template_id for cluster in clusters})
+        cluster_templates = {
+            ct.uuid: ct for ct in ClusterTemplate._from_db_object_list(
+                db_cluster_templates, ClusterTemplate, context)}
+
+        for cluster in clusters:
+            # Templates that could not be resolved are left unset so that
+            # they are lazy-loaded, and fail, exactly as before.
+            cluster_template = cluster_templates.get(
+                cluster.cluster_template_id)
+            if cluster_template is not None:
+                cluster.cluster_template = cluster_template
+                cluster.obj_reset_changes(['cluster_template'])
+
+    @classmethod
+    def preload_rollups(cls, context, clusters):
+        """Attach node counts and addresses to a list of clusters.
+
+        The rollups of all the clusters are fetched with a single call to
+        get_rollups, so that rendering the clusters does not list the
+        nodegroups of each of them.
+
+        :param context: Security context.
+        :param clusters: a list of :class:`Cluster` objects.
+        """
+        if not clusters:
+            return
+
+        rollups = cls.get_rollups(
+            context, [cluster.uuid for cluster in clusters])
+        for cluster in clusters:
+            cluster._preloaded_rollup = rollups[cluster.uuid]
+
     @base.remotable_classmethod
     def get(cls, context, cluster_id):
         """Find a cluster based on its id or uuid and return a Cluster object.
@@ -249,7 +300,21 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
                                                  sort_key=sort_key,
                                                  sort_dir=sort_dir,
                                                  filters=filters)
-        return Cluster._from_db_object_list(db_clusters, cls, context)
+        clusters = Cluster._from_db_object_list(db_clusters, cls, context)
+        cls._preload_cluster_templates(context, clusters)
+        return clusters
+
+    @base.remotable_classmethod
+    def get_rollups(cls, context, cluster_uuids):
+        """Return the node counts and addresses of a list of clusters.
+
+        :param context: Security context.
+        :param cluster_uuids: the uuids of the clusters.
+        :returns: a dict mapping the uuid of each cluster to a dict with its
+                  'node_count', 'master_count', 'node_addresses' and
+                  'master_addresses'.
+        """
+        return cls.dbapi.get_cluster_rollups(context, cluster_uuids)
 
     @base.remotable_classmethod
     def get_stats(cls, context, project_id=None):
@@ -325,6 +390,7 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
                         object, e.g.: Cluster(context)
         """
         current = self.__class__.get_by_uuid(self._context, uuid=self.uuid)
+        self._preloaded_rollup = None
         for field in self.fields:
             if self.obj_attr_is_set(field) and self[field] != current[field]:
                 self[field] = current[field]
@@ -344,10 +410,11 @@ class Cluster(base.MagnumPersistentObject, base.MagnumObject,
         dict_ = super(Cluster, self).as_dict()
         # Update the dict with the attributes coming form
         # the cluster's nodegroups.
+        rollup = self._get_rollup()
         dict_.update({
-            'node_count': self.node_count,
-            'master_count': self.master_count,
-            'node_addresses': self.node_addresses,
-            'master_addresses': self.master_addresses
+            'node_count': rollup['node_count'],
+            'master_count': rollup['master_count'],
+            'node_addresses': list(rollup['node_addresses']),
+            'master_addresses': list(rollup['master_addresses'])
         })
         return dict_
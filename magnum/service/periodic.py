@@ -15,16 +15,25 @@
 
 import functools
 
+from eventlet import greenpool
 from oslo_log import log
 from oslo_service import loopingcall
 from oslo_service import periodic_task
+from oslo_utils import timeutils
 
 from pycadf import cadftaxonomy as taxonomy
 
+from magnum.api import servicegroup
+from magnum.common import cinder
 from magnum.common import context
 from magnum.common import exception
+from magnum.common import hash_ring
+from magnum.common import keystone
 from magnum.common import profiler
 from magnum.common import rpc
+from magnum.common.x509 import key_pool
+from magnum.conductor.handlers.common import cert_manager
+from magnum.conductor import k8s_watch
 from magnum.conductor import monitors
 from magnum.conductor import utils as conductor_utils
 import magnum.conf
@@ -35,6 +44,13 @@ from magnum import objects
 CONF = magnum.conf.CONF
 LOG = log.getLogger(__name__)
 
+# Seconds between two syncs of the status of the clusters in progress.
+_STATUS_SYNC_INTERVAL = 10
+
+# Number of health polls which changed the health of a cluster, and of
+# those which left it unchanged and did not write to the DB.
+_health_stats = {'updates': 0, 'unchanged': 0}
+
 
 def set_context(func):
     @functools.wraps(func)
@@ -46,6 +62,114 @@ def set_context(func):
     return handler
 
 
+class _SyncTick(object):
+    """Bookkeeping for the jobs dispatched by one periodic task run."""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+        self.submitted = 0
+        self.skipped = 0
+        self.failed = 0
+        self.pending = 0
+        self.duration = None
+        self._watch = timeutils.StopWatch()
+        self._watch.start()
+
+    def job_done(self):
+        self.pending -= 1
+        if self.pending:
+            return
+        self.duration = self._watch.elapsed()
+        LOG.debug("%(name)s sync of %(submitted)d clusters finished in "
+                  "%(duration).2fs (%(skipped)d skipped, %(failed)d failed)",
+                  {'name': self.name, 'submitted': self.submitted,
+                   'duration': self.duration, 'skipped': self.skipped,
+                   'failed': self.failed})
+        if self.interval and self.duration > self.interval:
+            LOG.warning("%(name)s sync of %(submitted)d clusters took "
+                        "%(duration).2fs, longer than its %(interval)ss "
+                        "interval. Consider raising "
+                        "[conductor]periodic_sync_workers.",
+                        {'name': self.name, 'submitted': self.submitted,
+                         'duration': self.duration,
+                         'interval': self.interval})
+
+
+class ClusterSyncScheduler(object):
+    """Run per-cluster sync jobs with bounded concurrency.
+
+    At most ``max_workers`` jobs run at the same time, the others wait in
+    line. A cluster whose previous job has not finished yet is skipped, so
+    a slow backend never gets the same cluster polled twice in parallel.
+    """
+
+    def __init__(self, name, max_workers, interval=None):
+        self.name = name
+        self.interval = interval
+        self.last_tick = None
+        self._pool = greenpool.GreenPool(max_workers)
+        self._dispatchers = greenpool.GreenPool()
+        self._in_flight = set()
+
+    @property
+    def in_flight(self):
+        return frozenset(self._in_flight)
+
+    def run(self, clusters, job_factory):
+        """Dispatch a job for every cluster that is not being synced.
+
+        Returns without waiting for the jobs to complete.
+
+        :param clusters: the :class:`Cluster` objects to sync.
+        :param job_factory: callable taking a cluster and returning the
+                            callable doing the sync for it.
+        :returns: the :class:`_SyncTick` tracking this run.
+        """
+        tick = _SyncTick(self.name, self.interval)
+        jobs = []
+        for cluster in clusters:
+            if cluster.uuid in self._in_flight:
+                LOG.debug("Previous %(name)s sync of cluster %(cluster)s "
+                          "still running, skipping it",
+                          {'name': self.name, 'cluster': cluster.uuid})
+                tick.skipped += 1
+                continue
+            self._in_flight.add(cluster.uuid)
+            jobs.append((cluster.uuid, job_factory(cluster)))
+
+        tick.submitted = tick.pending = len(jobs)
+        self.last_tick = tick
+        if jobs:
+            # The pool blocks once it is full, so feed it from a separate
+            # greenthread to keep the periodic task itself non-blocking.
+            self._dispatchers.spawn_n(self._dispatch, tick, jobs)
+        return tick
+
+    def wait(self):
+        """Block until every dispatched job has finished."""
+        self._dispatchers.waitall()
+        self._pool.waitall()
+
+    def _dispatch(self, tick, jobs):
+        for cluster_uuid, job in jobs:
+            self._pool.spawn_n(self._run_job, tick, cluster_uuid, job)
+
+    def _run_job(self, tick, cluster_uuid, job):
+        try:
+            job()
+        except loopingcall.LoopingCallDone:
+            pass
+        except Exception:
+            tick.failed += 1
+            LOG.warning("%(name)s sync of cluster %(cluster)s failed",
+                        {'name': self.name, 'cluster': cluster_uuid},
+                        exc_info=True)
+        finally:
+            self._in_flight.discard(cluster_uuid)
+            tick.job_done()
+
+
 class ClusterUpdateJob(object):
 
     status_to_event = {
@@ -126,11 +250,25 @@ class ClusterHealthUpdateJob(object):
             # that basically means the k8s API doesn't work at that moment.
             return
 
-        if monitor.data.get('health_status'):
-            self.cluster.health_status = monitor.data.get('health_status')
-            self.cluster.health_status_reason = monitor.data.get(
-                'health_status_reason')
-            self.cluster.save()
+        health_status = monitor.data.get('health_status')
+        if not health_status:
+            return
+
+        # Coerce the reason as setting the field would, for instance its
+        # values to strings, so that it compares equal to the stored one.
+        health_status_reason = self.cluster.fields[
+            'health_status_reason'].coerce(
+                self.cluster, 'health_status_reason',
+                monitor.data.get('health_status_reason'))
+        if (health_status == self.cluster.health_status and
+                health_status_reason == self.cluster.health_status_reason):
+            _health_stats['unchanged'] += 1
+            return
+
+        self.cluster.health_status = health_status
+        self.cluster.health_status_reason = health_status_reason
+        self.cluster.save()
+        _health_stats['updates'] += 1
 
     def update_health_status(self):
         LOG.debug("Updating health status for cluster %s", self.cluster.id)
@@ -143,6 +281,18 @@ class ClusterHealthUpdateJob(object):
         raise loopingcall.LoopingCallDone()
 
 
+def health_stats():
+    """Return the number of cluster health updates and of skipped ones.
+
+    Polls which find the health of a cluster unchanged do not write it to
+    the DB. ``skip_ratio`` is the fraction of the polls which did not.
+    """
+    stats = dict(_health_stats)
+    polls = stats['updates'] + stats['unchanged']
+    stats['skip_ratio'] = float(stats['unchanged']) / polls if polls else 0.0
+    return stats
+
+
 @profiler.trace_cls("rpc")
 class MagnumPeriodicTasks(periodic_task.PeriodicTasks):
     """Magnum periodic Task class
@@ -163,8 +313,45 @@ class MagnumPeriodicTasks(periodic_task.PeriodicTasks):
     def __init__(self, conf):
         super(MagnumPeriodicTasks, self).__init__(conf)
         self.notifier = rpc.get_notifier()
-
-    @periodic_task.periodic_task(spacing=10, run_immediately=True)
+        self.status_sync = ClusterSyncScheduler(
+            'Status', conf.conductor.periodic_sync_workers,
+            interval=_STATUS_SYNC_INTERVAL)
+        self.health_sync = ClusterSyncScheduler(
+            'Health', conf.conductor.periodic_sync_workers,
+            interval=conf.kubernetes.health_polling_interval)
+        self.hash_ring = None
+        if conf.conductor.periodic_sync_sharding:
+            self.hash_ring = hash_ring.ServiceHashRing(
+                'magnum-conductor', conf.host)
+            self.servicegroup = servicegroup.ServiceGroup()
+        self.health_watch = conf.kubernetes.health_watch_enabled
+        if self.health_watch:
+            k8s_watch.set_change_callback(self._nodes_changed)
+
+    def _live_conductors(self, ctx):
+        """Return the hosts of the magnum-conductor services up."""
+        return [service.host
+                for service in objects.MagnumService.list(ctx)
+                if service.binary == 'magnum-conductor' and
+                not service.disabled and
+                self.servicegroup.service_is_up(service)]
+
+    def _owned_clusters(self, ctx, clusters):
+        """Keep the clusters this host is in charge of syncing."""
+        if self.hash_ring is None:
+            return clusters
+        try:
+            hosts = self._live_conductors(ctx)
+        except Exception:
+            LOG.warning("Unable to list the magnum-conductor services, "
+                        "keeping the current hash ring", exc_info=True)
+        else:
+            self.hash_ring.refresh(hosts)
+        return [cluster for cluster in clusters
+                if self.hash_ring.owns(cluster.uuid)]
+
+    @periodic_task.periodic_task(spacing=_STATUS_SYNC_INTERVAL,
+                                 run_immediately=True)
     @set_context
     def sync_cluster_status(self, ctx):
         try:
@@ -176,18 +363,15 @@ class MagnumPeriodicTasks(periodic_task.PeriodicTasks):
                       objects.fields.ClusterStatus.DELETE_IN_PROGRESS,
                       objects.fields.ClusterStatus.ROLLBACK_IN_PROGRESS]
             filters = {'status': status}
-            clusters = objects.Cluster.list(ctx, filters=filters)
+            clusters = self._owned_clusters(
+                ctx, objects.Cluster.list(ctx, filters=filters))
             if not clusters:
                 return
 
             # synchronize with underlying orchestration
-            for cluster in clusters:
-                job = ClusterUpdateJob(ctx, cluster)
-                # though this call isn't really looping, we use this
-                # abstraction anyway to avoid dealing directly with eventlet
-                # hooey
-                lc = loopingcall.FixedIntervalLoopingCall(f=job.update_status)
-                lc.start(1, stop_on_exception=True)
+            self.status_sync.run(
+                clusters,
+                lambda cluster: ClusterUpdateJob(ctx, cluster).update_status)
 
         except Exception as e:
             LOG.warning(
@@ -200,32 +384,65 @@ class MagnumPeriodicTasks(periodic_task.PeriodicTasks):
     @set_context
     def sync_cluster_health_status(self, ctx):
         try:
-            LOG.debug('Starting to sync up cluster health status')
+            LOG.debug('Starting to sync up cluster health status, '
+                      '%(updates)d updates and %(unchanged)d unchanged '
+                      'polls so far (skip ratio %(skip_ratio).2f)',
+                      health_stats())
 
             status = [objects.fields.ClusterStatus.CREATE_COMPLETE,
                       objects.fields.ClusterStatus.UPDATE_COMPLETE,
                       objects.fields.ClusterStatus.UPDATE_IN_PROGRESS,
                       objects.fields.ClusterStatus.ROLLBACK_IN_PROGRESS]
             filters = {'status': status}
-            clusters = objects.Cluster.list(ctx, filters=filters)
+            clusters = self._owned_clusters(
+                ctx, objects.Cluster.list(ctx, filters=filters))
+            if self.health_watch:
+                k8s_watch.prune_watchers(
+                    [cluster.uuid for cluster in clusters])
             if not clusters:
                 return
 
             # synchronize using native COE API
-            for cluster in clusters:
-                job = ClusterHealthUpdateJob(ctx, cluster)
-                # though this call isn't really looping, we use this
-                # abstraction anyway to avoid dealing directly with eventlet
-                # hooey
-                lc = loopingcall.FixedIntervalLoopingCall(
-                    f=job.update_health_status)
-                lc.start(1, stop_on_exception=True)
+            self.health_sync.run(
+                clusters,
+                lambda cluster: ClusterHealthUpdateJob(
+                    ctx, cluster).update_health_status)
 
         except Exception as e:
             LOG.warning(
                 "Ignore error [%s] when syncing up cluster status.",
                 e, exc_info=True)
 
+    def _nodes_changed(self, cluster_uuid):
+        """Update the health of a cluster whose nodes readiness changed."""
+        ctx = context.make_admin_context(all_tenants=True)
+        try:
+            cluster = objects.Cluster.get_by_uuid(ctx, cluster_uuid)
+        except exception.ClusterNotFound:
+            # The next health sync stops the watcher.
+            return
+        self.health_sync.run(
+            [cluster],
+            lambda cluster: ClusterHealthUpdateJob(
+                ctx, cluster).update_health_status)
+
+    @periodic_task.periodic_task(spacing=CONF.conductor.stats_log_interval)
+    def log_stats(self, ctx):
+        """Log the counters of the caches and pools of the conductor."""
+        pool_stats = key_pool.stats()
+        if pool_stats is not None:
+            LOG.debug('RSA key pool: %(depth)d keys ready, %(pending)d '
+                      'pending, %(hits)d hits, %(misses)d misses, last '
+                      'refill took %(refill_latency)s seconds', pool_stats)
+        LOG.debug('Trustee cache: %(size)d keys, %(hits)d hits, '
+                  '%(misses)d misses', keystone.trustee_cache_stats())
+        LOG.debug('Volume type cache: %(size)d keys, %(hits)d hits, '
+                  '%(misses)d misses', cinder.volume_type_cache_stats())
+        LOG.debug('Client certificates cache: %(size)d keys, %(hits)d hits, '
+                  '%(misses)d misses', cert_manager.client_certs_cache_stats())
+        LOG.debug('CA keys cache: %(size)d keys, %(hits)d hits, '
+                  '%(misses)d misses', cert_manager.ca_keys_cache_stats())
+
 
 def setup(conf, tg):
     pt = MagnumPeriodicTasks(conf)
@@ -25,8 +25,10 @@ from oslotest import base
 import pecan
 import testscenarios
 
+from magnum.common import cinder
 from magnum.common import context as magnum_context
 from magnum.common import keystone as magnum_keystone
+from magnum.conductor.handlers.common import cert_manager
 from magnum.objects import base as objects_base
 from magnum.tests import conf_fixture
 from magnum.tests import fake_notifier
@@ -48,6 +50,8 @@ class BaseTestCase(testscenarios.WithScenarios, base.BaseTestCase):
     def setUp(self):
         super(BaseTestCase, self).setUp()
         self.addCleanup(cfg.CONF.reset)
+        self.addCleanup(cert_manager.reset_client_certs_cache)
+        self.addCleanup(cert_manager.reset_ca_keys_cache)
 
 
 class TestCase(base.BaseTestCase):
@@ -118,6 +122,10 @@ class TestCase(base.BaseTestCase):
 
         self.mock_make_trustee_domain_id = q.start()
         self.addCleanup(q.stop)
+        self.addCleanup(magnum_keystone.reset_trustee_cache)
+        self.addCleanup(cinder.reset_volume_type_cache)
+        self.addCleanup(cert_manager.reset_client_certs_cache)
+        self.addCleanup(cert_manager.reset_ca_keys_cache)
 
         self.useFixture(conf_fixture.ConfFixture())
         self.useFixture(fixtures.NestedTempfile())
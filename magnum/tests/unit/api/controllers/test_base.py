@@ -408,3 +408,34 @@ class TestController(test_base.TestCase):
 
         self.assertRaises(exc.HTTPNotAcceptable,
                           controller.__getattribute__, 'testapi1')
+
+    @mock.patch('pecan.request')
+    def test_controller_versioned_method_lookup_cached(self,
+                                                       mock_pecan_request):
+
+        class MyController(base.Controller):
+            plain = 'plain'
+
+            @base.Controller.api_version('1.0', '1.1')
+            def testapi1(self):
+                return 'API1_1.0_1.1'
+
+            @base.Controller.api_version('1.2', '1.3')  # noqa
+            def testapi1(self):  # noqa
+                return 'API1_1.2_1.3'
+
+        controller = MyController()
+        mock_pecan_request.version = versions.Version("", "", "", "1.2")
+        self.assertEqual('API1_1.2_1.3', controller.testapi1())
+
+        with mock.patch.object(versions.Version, 'matches') as mock_matches:
+            mock_pecan_request.version = versions.Version("", "", "", "1.2")
+            self.assertEqual('API1_1.2_1.3', controller.testapi1())
+            self.assertFalse(mock_matches.called)
+
+        mock_pecan_request.version = versions.Version("", "", "", "1.1")
+        self.assertEqual('API1_1.0_1.1', controller.testapi1())
+
+        # Other attributes do not depend on the version
+        del mock_pecan_request.version
+        self.assertEqual('plain', controller.plain)
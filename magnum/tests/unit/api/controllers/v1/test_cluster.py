@@ -21,7 +21,9 @@ from wsme import types as wtypes
 
 from magnum.api import attr_validator
 from magnum.api.controllers.v1 import cluster as api_cluster
+from magnum.common import context
 from magnum.common import exception
+from magnum.common import tracing
 from magnum.conductor import api as rpcapi
 import magnum.conf
 from magnum import objects
@@ -85,6 +87,17 @@ class TestListCluster(api_base.FunctionalTest):
         self._verify_attrs(none_attrs, response['clusters'][0],
                            positive=False)
 
+    def test_get_all_traced(self):
+        self.addCleanup(tracing.disable)
+        tracing.enable(100)
+        obj_utils.create_test_cluster(self.context)
+        self.get_json('/clusters?limit=1')
+        spans = [event for event in tracing.events()
+                 if event.name == 'ClustersController.get_all']
+        self.assertEqual(1, len(spans))
+        self.assertEqual({'limit': 1}, spans[0].attrs)
+        self.assertIsNotNone(spans[0].duration)
+
     def test_get_one(self):
         cluster = obj_utils.create_test_cluster(self.context)
         response = self.get_json('/clusters/%s' % cluster['uuid'])
@@ -642,6 +655,29 @@ class TestPost(api_base.FunctionalTest):
         self.assertEqual(403, response.status_int)
         self.assertTrue(response.json['errors'])
 
+    @mock.patch('magnum.common.keystone.get_trustee_domain_id')
+    def test_check_cluster_quota_limit_without_project(
+            self, mock_get_trustee_domain_id):
+        # The clusters of other projects do not count against the quota of
+        # a context without a project.
+        mock_get_trustee_domain_id.return_value = 'trustee-domain'
+        CONF.set_override('max_clusters_per_project', 1, group='quotas')
+        obj_utils.create_test_cluster(self.context,
+                                      uuid=uuidutils.generate_uuid(),
+                                      project_id='other-project',
+                                      user_id='other-user')
+        ctx = context.RequestContext(user_id='fake-user', project_id=None,
+                                     domain_id='user-domain')
+        controller = api_cluster.ClustersController()
+        controller._check_cluster_quota_limit(ctx)
+
+        obj_utils.create_test_cluster(self.context,
+                                      uuid=uuidutils.generate_uuid(),
+                                      name='mine', project_id=None,
+                                      user_id='fake-user')
+        self.assertRaises(exception.ResourceLimitExceeded,
+                          controller._check_cluster_quota_limit, ctx)
+
     def test_create_cluster_set_project_id_and_user_id(self):
         bdict = apiutils.cluster_post_data()
 
@@ -67,6 +67,18 @@ class TestContextHook(base.BaseTestCase):
                          ctx.auth_token)
         self.assertEqual('assert_this', ctx.auth_token_info)
 
+    @mock.patch.object(hooks.LOG, 'debug')
+    def test_context_hook_after_method_logs_policy_stats(self, mock_debug):
+        state = mock.Mock(request=fakes.FakePecanRequest())
+        hook = hooks.ContextHook()
+        hook.before(state)
+        state.request.context.policy_stats.update(checks=2,
+                                                  keystone_calls=1)
+        hook.after(state)
+        args = mock_debug.call_args[0]
+        self.assertEqual(2, args[1]['checks'])
+        self.assertEqual(1, args[1]['keystone_calls'])
+
 
 class TestNoExceptionTracebackHook(api_base.FunctionalTest):
 
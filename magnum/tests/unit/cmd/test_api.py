@@ -117,3 +117,23 @@ class TestMagnumAPI(base.TestCase):
                                          base.CONF.api.port, app,
                                          processes=workers,
                                          ssl_context=('tmp_crt', 'tmp_key'))
+
+    @mock.patch('oslo_service.service.ProcessLauncher')
+    @mock.patch('magnum.common.wsgi_service.WSGIService')
+    @mock.patch('werkzeug.serving.run_simple')
+    @mock.patch.object(api, 'api_app')
+    @mock.patch('magnum.common.service.prepare_service')
+    def test_api_prefork(self, mock_prep, mock_app, mock_run,
+                         mock_wsgi_service, mock_launcher, mock_base):
+        self.config(server_mode='prefork', group='api')
+        api.main()
+
+        app = mock_app.load_app.return_value
+        mock_wsgi_service.assert_called_once_with('magnum_api', app,
+                                                  use_ssl=False)
+        server = mock_wsgi_service.return_value
+        launcher = mock_launcher.return_value
+        launcher.launch_service.assert_called_once_with(
+            server, workers=server.workers)
+        launcher.wait.assert_called_once_with()
+        mock_run.assert_not_called()
@@ -0,0 +1,81 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from magnum.common import cinder
+from magnum.common import exception
+from magnum.tests import base
+
+
+@mock.patch('magnum.common.clients.OpenStackClients')
+class TestCinder(base.TestCase):
+
+    def setUp(self):
+        super(TestCinder, self).setUp()
+        self.context = mock.MagicMock(project_id='fake_project')
+
+    def _volume_types(self, mock_clients, *names):
+        volume_types = []
+        for name in names:
+            volume_type = mock.MagicMock()
+            volume_type.name = name
+            volume_types.append(volume_type)
+        mock_list = mock_clients.return_value.cinder.return_value \
+            .volume_types.list
+        mock_list.return_value = volume_types
+        return mock_list
+
+    def test_default_volume_types_configured(self, mock_clients):
+        self.config(default_docker_volume_type='docker',
+                    default_boot_volume_type='boot',
+                    default_etcd_volume_type='etcd', group='cinder')
+        self.assertEqual(
+            'docker', cinder.get_default_docker_volume_type(self.context))
+        self.assertEqual(
+            'boot', cinder.get_default_boot_volume_type(self.context))
+        self.assertEqual(
+            'etcd', cinder.get_default_etcd_volume_type(self.context))
+        mock_clients.assert_not_called()
+
+    def test_default_volume_types_cached(self, mock_clients):
+        mock_list = self._volume_types(mock_clients, 'type1', 'type2')
+        self.assertEqual(
+            'type1', cinder.get_default_docker_volume_type(self.context))
+        self.assertEqual(
+            'type1', cinder.get_default_boot_volume_type(self.context))
+        self.assertEqual(
+            'type1', cinder.get_default_etcd_volume_type(self.context))
+        mock_list.assert_called_once_with()
+        self.assertEqual({'hits': 2, 'misses': 1, 'size': 1},
+                         cinder.volume_type_cache_stats())
+
+        other = mock.MagicMock(project_id='other_project')
+        cinder.get_default_docker_volume_type(other)
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_default_volume_types_cache_disabled(self, mock_clients):
+        self.config(volume_type_cache_ttl=0, group='cinder')
+        mock_list = self._volume_types(mock_clients, 'type1')
+        cinder.get_default_docker_volume_type(self.context)
+        cinder.get_default_docker_volume_type(self.context)
+        self.assertEqual(2, mock_list.call_count)
+
+    def test_no_volume_type(self, mock_clients):
+        mock_list = self._volume_types(mock_clients)
+        self.assertRaises(exception.VolumeTypeNotFound,
+                          cinder.get_default_docker_volume_type,
+                          self.context)
+        self.assertRaises(exception.VolumeTypeNotFound,
+                          cinder.get_default_docker_volume_type,
+                          self.context)
+        self.assertEqual(2, mock_list.call_count)
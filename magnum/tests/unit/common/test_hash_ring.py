@@ -0,0 +1,71 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_utils import uuidutils
+
+from magnum.common import hash_ring
+from magnum.tests import base
+
+
+class HashRingTestCase(base.TestCase):
+
+    def setUp(self):
+        super(HashRingTestCase, self).setUp()
+        self.keys = [uuidutils.generate_uuid() for _ in range(1000)]
+
+    def test_get_host_empty_ring(self):
+        self.assertIsNone(hash_ring.HashRing([]).get_host('key'))
+
+    def test_get_host_is_stable(self):
+        ring = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        other = hash_ring.HashRing(['host3', 'host2', 'host1'])
+        for key in self.keys:
+            self.assertEqual(ring.get_host(key), other.get_host(key))
+
+    def test_get_host_distribution(self):
+        ring = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        owned = {}
+        for key in self.keys:
+            host = ring.get_host(key)
+            owned[host] = owned.get(host, 0) + 1
+        self.assertEqual({'host1', 'host2', 'host3'}, set(owned))
+        for count in owned.values():
+            self.assertGreater(count, 200)
+
+    def test_remove_host_only_moves_its_keys(self):
+        ring = hash_ring.HashRing(['host1', 'host2', 'host3'])
+        smaller = hash_ring.HashRing(['host1', 'host2'])
+        for key in self.keys:
+            if ring.get_host(key) != 'host3':
+                self.assertEqual(ring.get_host(key), smaller.get_host(key))
+
+
+class ServiceHashRingTestCase(base.TestCase):
+
+    def test_refresh_always_includes_local_host(self):
+        ring = hash_ring.ServiceHashRing('magnum-conductor', 'host1')
+        ring.refresh(['host2'])
+        self.assertEqual({'host1', 'host2'}, ring.ring.hosts)
+
+    def test_refresh_keeps_unchanged_ring(self):
+        ring = hash_ring.ServiceHashRing('magnum-conductor', 'host1')
+        current = ring.refresh(['host1', 'host2'])
+        self.assertIs(current, ring.refresh(['host2']))
+
+    def test_owns_rebalances(self):
+        ring = hash_ring.ServiceHashRing('magnum-conductor', 'host1')
+        ring.refresh(['host1', 'host2'])
+        keys = [uuidutils.generate_uuid() for _ in range(100)]
+        self.assertFalse(all(ring.owns(key) for key in keys))
+
+        ring.refresh(['host1'])
+        self.assertTrue(all(ring.owns(key) for key in keys))
@@ -241,3 +241,45 @@ class KeystoneClientTest(base.TestCase):
         ks_client = keystone.KeystoneClientV3(self.ctx)
         self.assertRaises(exception.InvalidParameterValue,
                           ks_client.get_validate_region_name, val)
+
+
+class TrusteeCacheTest(base.TestCase):
+
+    def setUp(self):
+        super(TrusteeCacheTest, self).setUp()
+        self.stop_global(
+            'magnum.common.keystone.KeystoneClientV3.trustee_domain_id')
+        self.addCleanup(
+            self.start_global,
+            'magnum.common.keystone.KeystoneClientV3.trustee_domain_id')
+
+    @mock.patch.object(keystone.KeystoneClientV3, 'trustee_domain_id',
+                       new_callable=mock.PropertyMock)
+    def test_get_trustee_domain_id(self, mock_tdi):
+        mock_tdi.return_value = 'trustee_domain'
+        self.assertEqual('trustee_domain', keystone.get_trustee_domain_id())
+        self.assertEqual('trustee_domain', keystone.get_trustee_domain_id())
+        mock_tdi.assert_called_once_with()
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1},
+                         keystone.trustee_cache_stats())
+
+    @mock.patch.object(keystone.KeystoneClientV3, 'client',
+                       new_callable=mock.PropertyMock)
+    def test_get_trustee_user_project(self, mock_client):
+        mock_users = mock_client.return_value.users
+        mock_users.get.return_value.name = 'cluster-uuid_project-id'
+        for _ in range(2):
+            self.assertEqual('project-id',
+                             keystone.get_trustee_user_project('user-id'))
+        mock_users.get.assert_called_once_with('user-id')
+
+    @mock.patch.object(keystone.KeystoneClientV3, 'trustee_domain_id',
+                       new_callable=mock.PropertyMock)
+    def test_trustee_cache_disabled(self, mock_tdi):
+        self.config(trustee_cache_ttl=0, group='trust')
+        mock_tdi.return_value = 'trustee_domain'
+        keystone.get_trustee_domain_id()
+        keystone.get_trustee_domain_id()
+        self.assertEqual(2, mock_tdi.call_count)
+        self.assertEqual({'hits': 0, 'misses': 2, 'size': 0},
+                         keystone.trustee_cache_stats())
@@ -13,9 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from unittest import mock
+
 from oslo_policy import policy as oslo_policy
 
 from magnum.common import context as magnum_context
+from magnum.common import keystone
 from magnum.common import policy
 
 from magnum.tests import base
@@ -43,3 +46,24 @@ class TestPolicy(base.TestCase):
         # there is no admin role set in the context, so check_is_admin
         # should return False
         self.assertFalse(policy.check_is_admin(ctx))
+
+    @mock.patch.object(keystone.KeystoneClientV3, 'trustee_domain_id',
+                       new_callable=mock.PropertyMock,
+                       return_value='trustee-domain')
+    def test_enforce_caches_trustee_domain_id(self, mock_tdi):
+        ctx = magnum_context.RequestContext(user='test-user',
+                                            project_id='test-project-id')
+        for _ in range(3):
+            target = {'project_id': 'test-project-id'}
+            policy.enforce(ctx, 'cluster:get', target, do_raise=False)
+            self.assertEqual('trustee-domain', target['trustee_domain_id'])
+
+        mock_tdi.assert_called_once_with()
+        self.assertEqual({'checks': 3, 'keystone_calls': 1},
+                         policy.stats(ctx))
+
+        # The counters belong to the request context.
+        other_ctx = magnum_context.RequestContext(
+            user='test-user', project_id='test-project-id')
+        self.assertEqual({'checks': 0, 'keystone_calls': 0},
+                         policy.stats(other_ctx))
@@ -0,0 +1,37 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from magnum.common import rpc_service
+from magnum.tests import base
+
+
+class TestService(base.TestCase):
+
+    @mock.patch.object(rpc_service.profiler, 'setup')
+    @mock.patch.object(rpc_service.rpc, 'get_server')
+    def setUp(self, mock_get_server, mock_profiler_setup):
+        super(TestService, self).setUp()
+        self.service = rpc_service.Service('fake-topic', 'fake-host', [],
+                                           'magnum-conductor')
+
+    @mock.patch('magnum.conductor.k8s_api.close_all_sessions')
+    @mock.patch('magnum.conductor.k8s_watch.stop_all_watchers')
+    @mock.patch('magnum.common.x509.key_pool.reset_pool')
+    def test_stop(self, mock_reset_pool, mock_stop_all_watchers,
+                  mock_close_all_sessions):
+        self.service.stop()
+        self.service._server.stop.assert_called_once_with()
+        mock_reset_pool.assert_called_once_with()
+        mock_stop_all_watchers.assert_called_once_with()
+        mock_close_all_sessions.assert_called_once_with()
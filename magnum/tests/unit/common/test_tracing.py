@@ -0,0 +1,75 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from magnum.common import tracing
+import magnum.conf
+from magnum.tests import base
+
+CONF = magnum.conf.CONF
+
+
+class TestTracing(base.TestCase):
+
+    def setUp(self):
+        super(TestTracing, self).setUp()
+        self.addCleanup(tracing.disable)
+
+    def test_disabled(self):
+        tracing.disable()
+        tracing.trace('event', key='value')
+        with tracing.span('span'):
+            pass
+        self.assertFalse(tracing.enabled())
+        self.assertEqual([], tracing.events())
+
+    def test_trace(self):
+        tracing.enable(2)
+        tracing.trace('first')
+        tracing.trace('second', key='value')
+        tracing.trace('third')
+
+        events = tracing.events()
+        self.assertEqual(['second', 'third'], [e.name for e in events])
+        self.assertEqual({'key': 'value'}, events[0].attrs)
+        self.assertIsNone(events[0].duration)
+
+    def test_span(self):
+        tracing.enable(10)
+        with tracing.span('span', cluster='uuid'):
+            pass
+
+        event, = tracing.events()
+        self.assertEqual('span', event.name)
+        self.assertEqual({'cluster': 'uuid'}, event.attrs)
+        self.assertGreaterEqual(event.duration, 0)
+        self.assertIn('span (', tracing.format_event(event))
+        self.assertIn('cluster=uuid', tracing.format_event(event))
+
+    def test_report(self):
+        tracing.enable(10)
+        tracing.trace('event', key='value')
+        report = tracing.report()
+        self.assertEqual(1, len(report['events']))
+        self.assertIn('event key=value', report['events'][0])
+
+    @mock.patch.object(tracing.gmr.TextGuruMeditation, 'register_section')
+    def test_setup(self, mock_register):
+        self.config(trace_buffer_size=5)
+        tracing.setup(CONF)
+        self.assertTrue(tracing.enabled())
+        mock_register.assert_called_once_with('Traces', tracing.report)
+
+        self.config(trace_buffer_size=0)
+        tracing.setup(CONF)
+        self.assertFalse(tracing.enabled())
@@ -40,8 +40,21 @@ class UtilsTestCase(base.TestCase):
         self.assertEqual(0.5, utils.get_k8s_quantity('500m'))
         self.assertEqual(1300000.0, utils.get_k8s_quantity('1.3E+6'))
         self.assertEqual(1300000.0, utils.get_k8s_quantity('1.3E6'))
+        self.assertEqual(2 * 10 ** 15, utils.get_k8s_quantity('2P'))
+        self.assertEqual(3 * 2 ** 30, utils.get_k8s_quantity('3Gi'))
         self.assertRaises(exception.UnsupportedK8sQuantityFormat,
                           utils.get_k8s_quantity, '1E1E')
+        self.assertRaises(exception.UnsupportedK8sQuantityFormat,
+                          utils.get_k8s_quantity, '1.2.3')
+        self.assertRaises(exception.UnsupportedK8sQuantityFormat,
+                          utils.get_k8s_quantity, '1KiB')
+
+    def test_get_k8s_quantities(self):
+        self.assertEqual([0.5, 1024.0, 0.5],
+                         utils.get_k8s_quantities(['500m', '1Ki', '500m']))
+        self.assertEqual([], utils.get_k8s_quantities([]))
+        self.assertRaises(exception.UnsupportedK8sQuantityFormat,
+                          utils.get_k8s_quantities, ['1Ki', 'x'])
 
     def test_get_docker_quantity(self):
         self.assertEqual(512, utils.get_docker_quantity('512'))
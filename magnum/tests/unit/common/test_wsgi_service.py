@@ -0,0 +1,60 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from oslo_concurrency import processutils
+
+from magnum.common import wsgi_service
+from magnum.tests import base
+
+
+@mock.patch('oslo_service.wsgi.Server')
+class TestWSGIService(base.TestCase):
+
+    def test_workers_default(self, mock_server):
+        app = mock.Mock()
+        service = wsgi_service.WSGIService('magnum_api', app)
+
+        self.assertEqual(processutils.get_worker_count(), service.workers)
+        mock_server.assert_called_once_with(
+            base.CONF, 'magnum_api', app, host=base.CONF.api.host,
+            port=base.CONF.api.port, pool_size=100, use_ssl=False)
+
+    def test_workers_and_threads(self, mock_server):
+        self.config(workers=4, threads=8, group='api')
+        service = wsgi_service.WSGIService('magnum_api', mock.Mock())
+
+        self.assertEqual(4, service.workers)
+        self.assertEqual(8, mock_server.call_args[1]['pool_size'])
+
+    def test_ssl(self, mock_server):
+        self.config(ssl_cert_file='tmp_crt', ssl_key_file='tmp_key',
+                    group='api')
+        wsgi_service.WSGIService('magnum_api', mock.Mock(), use_ssl=True)
+
+        self.assertEqual('tmp_crt', base.CONF.ssl.cert_file)
+        self.assertEqual('tmp_key', base.CONF.ssl.key_file)
+        self.assertTrue(mock_server.call_args[1]['use_ssl'])
+
+    def test_start_stop(self, mock_server):
+        service = wsgi_service.WSGIService('magnum_api', mock.Mock())
+        server = mock_server.return_value
+
+        service.start()
+        server.start.assert_called_once_with()
+        service.reset()
+        server.reset.assert_called_once_with()
+        service.stop()
+        server.stop.assert_called_once_with()
+        service.wait()
+        server.wait.assert_called_once_with()
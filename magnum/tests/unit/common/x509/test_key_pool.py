@@ -0,0 +1,113 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+from unittest import mock
+
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from magnum.common.x509 import key_pool
+from magnum.tests import base
+
+
+@mock.patch.object(key_pool.futures, 'ProcessPoolExecutor',
+                   futures.ThreadPoolExecutor)
+class TestKeyPool(base.TestCase):
+
+    def setUp(self):
+        super(TestKeyPool, self).setUp()
+        self.addCleanup(key_pool.reset_pool)
+
+    def _wait_for_refill(self, pool):
+        futures.wait(list(pool._pending))
+
+    def test_get_refills_pool(self):
+        pool = key_pool.KeyPool(2, 1024)
+        self.addCleanup(pool.shutdown)
+
+        self.assertIsNone(pool.get())
+        self._wait_for_refill(pool)
+        stats = pool.stats()
+        self.assertEqual(2, stats['depth'])
+        self.assertEqual(1, stats['misses'])
+        self.assertIsNotNone(stats['refill_latency'])
+
+        key = pool.get()
+        self.assertIsInstance(key, rsa.RSAPrivateKey)
+        self.assertEqual(1024, key.key_size)
+        self._wait_for_refill(pool)
+        self.assertEqual(2, pool.stats()['depth'])
+        self.assertEqual(1, pool.stats()['hits'])
+
+    def test_refill_failure_resets_executor(self):
+        pool = key_pool.KeyPool(2, 1024)
+        with mock.patch.object(key_pool.futures.ThreadPoolExecutor,
+                               'submit', side_effect=RuntimeError):
+            pool.refill()
+        self.assertIsNone(pool._executor)
+        self.assertEqual(0, pool.stats()['pending'])
+
+    def test_get_private_key_pool_disabled(self):
+        self.config(key_pool_size=0, group='x509')
+        self.assertIsNone(key_pool.get_pool())
+        key = key_pool.get_private_key(1024)
+        self.assertEqual(1024, key.key_size)
+
+    def test_get_private_key_from_pool(self):
+        self.config(key_pool_size=1, rsa_key_size=1024, group='x509')
+        pool = key_pool.get_pool()
+        pool.refill()
+        self._wait_for_refill(pool)
+
+        key = key_pool.get_private_key(1024)
+        self.assertEqual(1024, key.key_size)
+        self.assertEqual(1, pool.stats()['hits'])
+
+    @mock.patch.object(key_pool.KeyPool, 'get')
+    def test_get_private_key_other_size(self, mock_get):
+        self.config(key_pool_size=1, rsa_key_size=2048, group='x509')
+        key = key_pool.get_private_key(1024)
+        self.assertEqual(1024, key.key_size)
+        self.assertFalse(mock_get.called)
+
+    @mock.patch.object(key_pool.KeyPool, 'get', return_value=None)
+    def test_get_private_key_empty_pool(self, mock_get):
+        self.config(key_pool_size=1, rsa_key_size=1024, group='x509')
+        key = key_pool.get_private_key(1024)
+        self.assertEqual(1024, key.key_size)
+        mock_get.assert_called_once_with()
+
+    def test_load_der_key_without_skip_validation(self):
+        # cryptography < 39 has no unsafe_skip_rsa_key_validation keyword.
+        der_key = key_pool._generate_der_key(1024)
+        load = key_pool.serialization.load_der_private_key
+
+        def fake_load(data, password, **kwargs):
+            if kwargs:
+                raise TypeError("unexpected keyword argument")
+            return load(data, password)
+
+        with mock.patch.object(key_pool.serialization, 'load_der_private_key',
+                               side_effect=fake_load) as mock_load:
+            key = key_pool._load_der_key(der_key)
+
+        self.assertEqual(1024, key.key_size)
+        self.assertEqual(2, mock_load.call_count)
+        mock_load.assert_called_with(der_key, password=None)
+
+    def test_stats(self):
+        self.config(key_pool_size=1, rsa_key_size=1024, group='x509')
+        self.assertIsNone(key_pool.stats())
+        self.assertIsNone(key_pool._pool)
+
+        pool = key_pool.get_pool()
+        self.assertEqual(pool.stats(), key_pool.stats())
@@ -43,6 +43,15 @@ class TestX509Operations(base.BaseTestCase):
         )
         self.assertEqual(mock.sentinel.decrypted, actual_decrypted)
 
+    @mock.patch.object(serialization, 'load_pem_private_key')
+    def test_load_pem_private_key_validates_key(self, mock_load):
+        # CA keys come from the certificate store and must keep being
+        # checked when they are loaded.
+        private_key = operations._load_pem_private_key(b'key', u'password')
+
+        mock_load.assert_called_once_with(b'key', password=b'password')
+        self.assertEqual(mock_load.return_value, private_key)
+
     def test_generate_csr_and_key(self):
         csr_keys = operations.generate_csr_and_key(u"Test")
         self.assertIsNotNone(csr_keys)
@@ -168,6 +168,24 @@ class CertManagerTestCase(base.BaseTestCase):
                                          mock_generate_ca_cert,
                                          mock_generate_client_cert)
 
+    @mock.patch('magnum.conductor.handlers.common.cert_manager.'
+                '_generate_client_cert')
+    @mock.patch('magnum.conductor.handlers.common.cert_manager.'
+                '_generate_ca_cert')
+    def test_generate_certificates_with_ca_error(self, mock_generate_ca_cert,
+                                                 mock_generate_client_cert):
+        mock_cluster = mock.MagicMock()
+        mock_generate_ca_cert.side_effect = [
+            ('ca-cert-ref', {'private_key': 'ca_private_key'}, 'password'),
+            exception.MagnumException(),
+            ('fp-ca-cert-ref', {'private_key': 'fp_private_key'}, 'password'),
+        ]
+
+        self.assertRaises(exception.CertificatesToClusterFailed,
+                          cert_manager.generate_certificates_to_cluster,
+                          mock_cluster)
+        self.assertEqual(3, mock_generate_ca_cert.call_count)
+
     @mock.patch('magnum.conductor.handlers.common.cert_manager.'
                 '_get_issuer_name')
     def test_generate_certificates_with_error(self, mock_get_issuer_name):
@@ -178,8 +196,10 @@ class CertManagerTestCase(base.BaseTestCase):
                           cert_manager.generate_certificates_to_cluster,
                           mock_cluster)
 
+    @mock.patch('magnum.common.x509.operations.load_private_key',
+                return_value=mock.sentinel.ca_key)
     @mock.patch('magnum.common.x509.operations.sign')
-    def test_sign_node_certificate(self, mock_x509_sign):
+    def test_sign_node_certificate(self, mock_x509_sign, mock_load_key):
         mock_cluster = mock.MagicMock()
         mock_cluster.uuid = "mock_cluster_uuid"
         mock_ca_cert = mock.MagicMock()
@@ -195,13 +215,17 @@ class CertManagerTestCase(base.BaseTestCase):
         self.CertManager.get_cert.assert_called_once_with(
             mock_cluster.ca_cert_ref, resource_ref=mock_cluster.uuid,
             context=None)
+        mock_load_key.assert_called_once_with(mock.sentinel.priv_key,
+                                              passphrase)
         mock_x509_sign.assert_called_once_with(mock_csr, mock_cluster.name,
-                                               mock.sentinel.priv_key,
-                                               passphrase)
+                                               mock.sentinel.ca_key)
         self.assertEqual(mock.sentinel.signed_cert, cluster_ca_cert)
 
+    @mock.patch('magnum.common.x509.operations.load_private_key',
+                return_value=mock.sentinel.ca_key)
     @mock.patch('magnum.common.x509.operations.sign')
-    def test_sign_node_certificate_without_cluster_name(self, mock_x509_sign):
+    def test_sign_node_certificate_without_cluster_name(self, mock_x509_sign,
+                                                        mock_load_key):
         mock_cluster = mock.MagicMock()
         mock_cluster.name = None
         mock_cluster.uuid = "mock_cluster_uuid"
@@ -219,11 +243,63 @@ class CertManagerTestCase(base.BaseTestCase):
         self.CertManager.get_cert.assert_called_once_with(
             mock_cluster.ca_cert_ref, resource_ref=mock_cluster.uuid,
             context=None)
+        mock_load_key.assert_called_once_with(mock.sentinel.priv_key,
+                                              passphrase)
         mock_x509_sign.assert_called_once_with(mock_csr, mock_cluster.uuid,
-                                               mock.sentinel.priv_key,
-                                               passphrase)
+                                               mock.sentinel.ca_key)
         self.assertEqual(mock.sentinel.signed_cert, cluster_ca_cert)
 
+    @mock.patch('magnum.common.x509.operations.load_private_key')
+    @mock.patch('magnum.common.x509.operations.sign')
+    def test_sign_node_certificates(self, mock_x509_sign, mock_load_key):
+        mock_cluster = mock.MagicMock()
+        mock_cluster.uuid = "mock_cluster_uuid"
+        mock_x509_sign.side_effect = lambda csr, issuer, key: 'signed-' + csr
+
+        certs = cert_manager.sign_node_certificates(
+            mock_cluster, ['csr-1', 'csr-2'], ca_cert_type='etcd')
+
+        self.assertEqual(['signed-csr-1', 'signed-csr-2'], certs)
+        self.CertManager.get_cert.assert_called_once_with(
+            mock_cluster.etcd_ca_cert_ref, resource_ref=mock_cluster.uuid,
+            context=None)
+        mock_load_key.assert_called_once_with(
+            self.CertManager.get_cert.return_value.get_private_key(),
+            self.CertManager.get_cert.return_value
+            .get_private_key_passphrase())
+
+    @mock.patch('magnum.common.x509.operations.load_private_key')
+    def test_get_cluster_ca_key_cached(self, mock_load_key):
+        mock_cluster = mock.MagicMock()
+        mock_cluster.uuid = "mock_cluster_uuid"
+        mock_load_key.side_effect = lambda key, password: mock.Mock()
+
+        ca_key = cert_manager.get_cluster_ca_key(mock_cluster)
+        self.assertIs(ca_key, cert_manager.get_cluster_ca_key(mock_cluster))
+        self.assertIsNot(ca_key, cert_manager.get_cluster_ca_key(
+            mock_cluster, ca_cert_type='front-proxy'))
+        self.assertEqual(2, self.CertManager.get_cert.call_count)
+
+        # A rotated CA has new references
+        mock_cluster.ca_cert_ref = 'new-ca-cert-ref'
+        self.assertIsNot(ca_key, cert_manager.get_cluster_ca_key(mock_cluster))
+
+        ca_key = cert_manager.get_cluster_ca_key(mock_cluster)
+        cert_manager.invalidate_ca_keys(mock_cluster)
+        self.assertIsNot(ca_key, cert_manager.get_cluster_ca_key(mock_cluster))
+        self.assertEqual(4, self.CertManager.get_cert.call_count)
+        self.assertEqual({'hits': 2, 'misses': 4, 'size': 1},
+                         cert_manager.ca_keys_cache_stats())
+
+    @mock.patch('magnum.common.x509.operations.load_private_key')
+    def test_get_cluster_ca_key_cache_disabled(self, mock_load_key):
+        cfg.CONF.set_override('ca_key_cache_ttl', 0, group='cluster')
+        mock_cluster = mock.MagicMock()
+
+        cert_manager.get_cluster_ca_key(mock_cluster)
+        cert_manager.get_cluster_ca_key(mock_cluster)
+        self.assertEqual(2, mock_load_key.call_count)
+
     def test_get_cluster_ca_certificate(self):
         mock_cluster = mock.MagicMock()
         mock_cluster.uuid = "mock_cluster_uuid"
@@ -355,6 +431,7 @@ class CertManagerTestCase(base.BaseTestCase):
             mock_cert.get_certificate.return_value.decode('UTF-8')
         magnum_key_text = \
             mock_cert.get_decrypted_private_key.return_value.decode('UTF-8')
+        cert_manager.invalidate_client_certs(mock_cluster)
         (cluster_ca_cert, cluster_key, cluster_magnum_cert) = \
             cert_manager.create_client_files(mock_cluster)
         cluster_ca_cert.seek(0)
@@ -430,6 +507,56 @@ class CertManagerTestCase(base.BaseTestCase):
         magnum_permission = stat.S_IMODE(os.lstat(mock_magnum_return).st_mode)
         self.assertEqual(magnum_permission, 0o600)
 
+    def _mock_client_certs(self):
+        mock_cert = mock.MagicMock()
+        mock_cert.get_certificate.return_value = "some_content"
+        mock_cert.get_decrypted_private_key.return_value = "some_key"
+        self.CertManager.get_cert.return_value = mock_cert
+        return mock_cert
+
+    def test_get_cluster_client_certs_cached(self):
+        mock_cluster = mock.MagicMock()
+        mock_cluster.uuid = "mock_cluster_uuid"
+        mock_cert = self._mock_client_certs()
+
+        certs = cert_manager.get_cluster_client_certs(mock_cluster)
+        self.assertEqual(("some_content", "some_key", "some_content"), certs)
+        self.assertEqual(certs,
+                         cert_manager.get_cluster_client_certs(mock_cluster))
+        self.assertEqual(2, self.CertManager.get_cert.call_count)
+        self.assertEqual(1, mock_cert.get_decrypted_private_key.call_count)
+
+        # New certificate references are fetched from the backend
+        mock_cluster.ca_cert_ref = "new_ca_cert_ref"
+        cert_manager.get_cluster_client_certs(mock_cluster)
+        self.assertEqual(4, self.CertManager.get_cert.call_count)
+        self.assertEqual({'hits': 1, 'misses': 2, 'size': 2},
+                         cert_manager.client_certs_cache_stats())
+
+    def test_get_cluster_client_certs_cache_disabled(self):
+        cfg.CONF.set_override("client_cert_cache_ttl", 0, group='cluster')
+        mock_cluster = mock.MagicMock()
+        mock_cluster.uuid = "mock_cluster_uuid"
+        self._mock_client_certs()
+
+        cert_manager.get_cluster_client_certs(mock_cluster)
+        cert_manager.get_cluster_client_certs(mock_cluster)
+        self.assertEqual(4, self.CertManager.get_cert.call_count)
+
+    def test_delete_client_files_invalidates_certs(self):
+        mock_cluster = mock.MagicMock()
+        mock_cluster.uuid = "mock_cluster_uuid"
+        other_cluster = mock.MagicMock()
+        other_cluster.uuid = "other_cluster_uuid"
+        self._mock_client_certs()
+
+        cert_manager.get_cluster_client_certs(mock_cluster)
+        cert_manager.get_cluster_client_certs(other_cluster)
+        cert_manager.delete_client_files(mock_cluster)
+        cert_manager.get_cluster_client_certs(mock_cluster)
+        cert_manager.get_cluster_client_certs(other_cluster)
+        self.assertEqual(6, self.CertManager.get_cert.call_count)
+
     def test_delete_certificates(self):
         mock_delete_cert = self.CertManager.delete_cert
         expected_cert_ref = 'cert_ref'
@@ -40,6 +40,30 @@ class TestSignConductor(base.TestCase):
         )
         self.assertEqual('fake-pem', actual_cert.pem)
 
+    @mock.patch.object(ca_conductor, 'cert_manager')
+    def test_sign_certificates(self, mock_cert_manager):
+        mock_cluster = mock.MagicMock()
+        certificates = [mock.MagicMock(csr='csr-1', ca_cert_type='kubernetes'),
+                        mock.MagicMock(csr='csr-2', ca_cert_type='etcd'),
+                        mock.MagicMock(csr='csr-3', ca_cert_type='kubernetes')]
+        mock_cert_manager.sign_node_certificates.side_effect = (
+            lambda cluster, csrs, ca_cert_type, context: [
+                ('%s-%s' % (ca_cert_type, csr)).encode() for csr in csrs])
+
+        actual_certs = self.ca_handler.sign_certificates(self.context,
+                                                         mock_cluster,
+                                                         certificates)
+
+        mock_cert_manager.sign_node_certificates.assert_has_calls([
+            mock.call(mock_cluster, ['csr-1', 'csr-3'], 'kubernetes',
+                      context=self.context),
+            mock.call(mock_cluster, ['csr-2'], 'etcd',
+                      context=self.context),
+        ])
+        self.assertEqual(['kubernetes-csr-1', 'etcd-csr-2',
+                          'kubernetes-csr-3'],
+                         [cert.pem for cert in actual_certs])
+
     @mock.patch.object(ca_conductor, 'cert_manager')
     def test_get_ca_certificate(self, mock_cert_manager):
         mock_cluster = mock.MagicMock()
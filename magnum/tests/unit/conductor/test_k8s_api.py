@@ -12,12 +12,36 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import tempfile
 from unittest import mock
+from urllib import parse
 
+from requests_mock.contrib import fixture
+
+from magnum.common import tracing
+from magnum.conductor import k8s_api
 from magnum.tests import base
 
 
+def _query(request):
+    # The query of requests_mock is lower-cased, parse the URL instead.
+    return parse.parse_qs(parse.urlsplit(request.url).query)
+
+
 class TestK8sAPI(base.TestCase):
+
+    def setUp(self):
+        super(TestK8sAPI, self).setUp()
+        self.requests_mock = self.useFixture(fixture.Fixture())
+        self.cluster = mock.MagicMock(uuid='fake-uuid',
+                                      api_address='https://10.0.0.1:6443',
+                                      ca_cert_ref='fake-ca-cert-ref',
+                                      magnum_cert_ref='fake-magnum-cert-ref')
+        self.addCleanup(k8s_api.close_all_sessions)
+        patcher = mock.patch.object(k8s_api, 'create_client_files',
+                                    side_effect=self._create_client_files)
+        self.mock_create_client_files = patcher.start()
+        self.addCleanup(patcher.stop)
     content_dict = {
         'fake-magnum-cert-ref': {
             'certificate': 'certificate-content',
@@ -51,3 +75,162 @@ class TestK8sAPI(base.TestCase):
             TestK8sAPI.content_dict[cert_ref]['decrypted_private_key'])
 
         return cert_obj
+
+    def _create_client_files(self, cluster, context=None):
+        return (tempfile.NamedTemporaryFile(),
+                tempfile.NamedTemporaryFile(),
+                tempfile.NamedTemporaryFile())
+
+    def test_request(self):
+        self.requests_mock.register_uri(
+            'GET', 'https://10.0.0.1:6443/api/v1/nodes',
+            json={'items': []})
+        api = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertEqual({'items': []}, api.list_node())
+        request = self.requests_mock.last_request
+        self.assertEqual(api.ca_file.name, request.verify)
+        self.assertEqual((api.cert_file.name, api.key_file.name),
+                         request.cert)
+
+    def test_session_shared_by_cluster(self):
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertIs(api1._session, api2._session)
+        self.assertEqual(1, self.mock_create_client_files.call_count)
+
+        api1.close()
+        self.assertFalse(api2.ca_file.closed)
+
+    def test_session_replaced_on_new_certificates(self):
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.cluster.ca_cert_ref = 'new-ca-cert-ref'
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertIsNot(api1._session, api2._session)
+        # The stale session is closed once its last client is done with it.
+        self.assertFalse(api1.ca_file.closed)
+        api1.close()
+        self.assertTrue(api1.ca_file.closed)
+        self.assertFalse(api2.ca_file.closed)
+
+    @mock.patch('time.monotonic')
+    def test_evict_idle_sessions(self, mock_monotonic):
+        self.config(api_session_idle_timeout=60, group='kubernetes')
+        mock_monotonic.return_value = 1000
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        session1 = api1._session
+        api1.close()
+
+        mock_monotonic.return_value = 1030
+        k8s_api.evict_idle_sessions()
+        self.assertFalse(api1.ca_file.closed)
+
+        mock_monotonic.return_value = 1100
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertTrue(api1.ca_file.closed)
+        self.assertIsNot(session1, api2._session)
+
+    @mock.patch('time.monotonic')
+    def test_evict_idle_sessions_in_use(self, mock_monotonic):
+        self.config(api_session_idle_timeout=60, group='kubernetes')
+        mock_monotonic.return_value = 1000
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+
+        mock_monotonic.return_value = 1100
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertFalse(api1.ca_file.closed)
+        self.assertIs(api1._session, api2._session)
+        self.assertEqual(1, self.mock_create_client_files.call_count)
+
+    def test_close_session(self):
+        api = k8s_api.KubernetesAPI(self.context, self.cluster)
+        api.close()
+        k8s_api.close_session(self.cluster.uuid)
+        self.assertTrue(api.ca_file.closed)
+        self.assertTrue(api.cert_file.closed)
+        self.assertTrue(api.key_file.closed)
+        k8s_api.close_session(self.cluster.uuid)
+
+    def test_close_session_in_use(self):
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        k8s_api.close_all_sessions()
+        self.assertFalse(api1.ca_file.closed)
+
+        api1.close()
+        self.assertFalse(api2.ca_file.closed)
+        api2.close()
+        self.assertTrue(api2.ca_file.closed)
+        api2.close()
+
+        api3 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertFalse(api3.ca_file.closed)
+        self.assertEqual(2, self.mock_create_client_files.call_count)
+
+    def test_session_pooling_disabled(self):
+        self.config(api_session_idle_timeout=0, group='kubernetes')
+        api1 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        api2 = k8s_api.KubernetesAPI(self.context, self.cluster)
+        self.assertIsNot(api1._session, api2._session)
+        self.assertEqual(2, self.mock_create_client_files.call_count)
+
+        api1.close()
+        self.assertTrue(api1.ca_file.closed)
+        self.assertFalse(api2.ca_file.closed)
+
+    def test_iter_nodes_paginated(self):
+        self.config(api_list_page_size=2, group='kubernetes')
+        url = 'https://10.0.0.1:6443/api/v1/nodes'
+        self.requests_mock.register_uri('GET', url, [
+            {'json': {'metadata': {'continue': 'token-1'},
+                      'items': [{'name': 'node-0'}, {'name': 'node-1'}]}},
+            {'json': {'metadata': {'continue': ''},
+                      'items': [{'name': 'node-2'}]}},
+        ])
+        api = k8s_api.KubernetesAPI(self.context, self.cluster)
+        nodes = api.iter_nodes(label_selector='role=worker',
+                               resource_version='0')
+        self.assertEqual(0, self.requests_mock.call_count)
+
+        self.assertEqual(['node-0', 'node-1', 'node-2'],
+                         [node['name'] for node in nodes])
+        first, second = self.requests_mock.request_history
+        self.assertEqual({'labelSelector': ['role=worker'],
+                          'resourceVersion': ['0'],
+                          'limit': ['2']}, _query(first))
+        self.assertEqual({'labelSelector': ['role=worker'],
+                          'limit': ['2'],
+                          'continue': ['token-1']},
+                         _query(second))
+
+    def test_iter_nodes_traced(self):
+        self.addCleanup(tracing.disable)
+        tracing.enable(10)
+        self.config(api_list_page_size=1, group='kubernetes')
+        self.requests_mock.register_uri(
+            'GET', 'https://10.0.0.1:6443/api/v1/nodes', [
+                {'json': {'metadata': {'continue': 'token-1'},
+                          'items': [{'name': 'node-0'}]}},
+                {'json': {'items': [{'name': 'node-1'}]}},
+            ])
+        api = k8s_api.KubernetesAPI(self.context, self.cluster)
+        list(api.iter_nodes())
+        # A span per page requested
+        events = tracing.events()
+        self.assertEqual(['KubernetesAPI.list'] * 2,
+                         [event.name for event in events])
+        self.assertEqual({'path': '/api/v1/nodes', 'cluster': 'fake-uuid'},
+                         events[0].attrs)
+
+    def test_iter_namespaced_pods_unpaginated(self):
+        self.config(api_list_page_size=0, group='kubernetes')
+        self.requests_mock.register_uri(
+            'GET', 'https://10.0.0.1:6443/api/v1/namespaces/default/pods',
+            json={'metadata': {'continue': 'token-1'},
+                  'items': [{'name': 'pod-0'}]})
+        api = k8s_api.KubernetesAPI(self.context, self.cluster)
+        pods = list(api.iter_namespaced_pods(
+            'default', field_selector='spec.nodeName=node-0'))
+        self.assertEqual([{'name': 'pod-0'}], pods)
+        self.assertEqual(1, self.requests_mock.call_count)
+        self.assertEqual({'fieldSelector': ['spec.nodeName=node-0']},
+                         _query(self.requests_mock.last_request))
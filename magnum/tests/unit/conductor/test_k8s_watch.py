@@ -0,0 +1,134 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import tempfile
+from unittest import mock
+
+from oslo_serialization import jsonutils
+from requests_mock.contrib import fixture
+
+from magnum.conductor import k8s_watch
+from magnum.tests import base
+
+NODES_URL = 'https://10.0.0.1:6443/api/v1/nodes'
+
+
+def _node(name, ready, resource_version='1'):
+    return {'metadata': {'name': name, 'resourceVersion': resource_version},
+            'status': {'conditions': [{'type': 'Ready',
+                                       'status': str(ready)}]}}
+
+
+def _events(*events):
+    return '\n'.join(jsonutils.dumps(event) for event in events) + '\n'
+
+
+class TestNodeReadinessWatcher(base.TestCase):
+
+    def setUp(self):
+        super(TestNodeReadinessWatcher, self).setUp()
+        self.requests_mock = self.useFixture(fixture.Fixture())
+        self.cluster = mock.MagicMock(uuid='fake-uuid',
+                                      api_address='https://10.0.0.1:6443',
+                                      ca_cert_ref='fake-ca-cert-ref',
+                                      magnum_cert_ref='fake-magnum-cert-ref')
+        patcher = mock.patch(
+            'magnum.conductor.k8s_api.create_client_files',
+            side_effect=lambda *args: (tempfile.NamedTemporaryFile(),
+                                       tempfile.NamedTemporaryFile(),
+                                       tempfile.NamedTemporaryFile()))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.callback = mock.Mock()
+        k8s_watch.set_change_callback(self.callback)
+        self.addCleanup(k8s_watch.set_change_callback, None)
+        self.addCleanup(k8s_watch.stop_all_watchers)
+
+        self.requests_mock.register_uri(
+            'GET', NODES_URL,
+            json={'metadata': {'resourceVersion': '10'},
+                  'items': [_node('node-0', True), _node('node-1', True)]})
+
+    def _watch(self, *events):
+        self.requests_mock.register_uri('GET', NODES_URL + '?watch=1',
+                                        text=_events(*events))
+
+    def test_sync(self):
+        self.config(health_watch_resync_interval=60, group='kubernetes')
+        self._watch(
+            {'type': 'MODIFIED', 'object': _node('node-0', False, '11')},
+            {'type': 'BOOKMARK',
+             'object': {'metadata': {'resourceVersion': '12'}}},
+            {'type': 'ADDED', 'object': _node('node-2', True, '13')},
+            {'type': 'DELETED', 'object': _node('node-1', True, '14')})
+        watcher = k8s_watch.NodeReadinessWatcher(self.context, self.cluster)
+        self.assertIsNone(watcher.readiness())
+
+        watcher.sync()
+        self.assertEqual({'node-0': False, 'node-2': True},
+                         watcher.readiness())
+        self.assertEqual('14', watcher.resource_version)
+        # One call for each change, none for the first list.
+        self.assertEqual([mock.call('fake-uuid')] * 3,
+                         self.callback.call_args_list)
+
+        watch = self.requests_mock.last_request
+        self.assertEqual({'watch': ['1'], 'allowwatchbookmarks': ['true'],
+                          'resourceversion': ['10'],
+                          'timeoutseconds': ['60']}, watch.qs)
+
+    def test_sync_expired(self):
+        self._watch(
+            {'type': 'ERROR', 'object': {'code': 410, 'reason': 'Expired'}},
+            {'type': 'MODIFIED', 'object': _node('node-0', False, '11')})
+        watcher = k8s_watch.NodeReadinessWatcher(self.context, self.cluster)
+        watcher.sync()
+        self.assertEqual({'node-0': True, 'node-1': True},
+                         watcher.readiness())
+        self.assertEqual('10', watcher.resource_version)
+        self.callback.assert_not_called()
+
+    def test_relist_reports_changes(self):
+        self._watch()
+        watcher = k8s_watch.NodeReadinessWatcher(self.context, self.cluster)
+        watcher.sync()
+        self.requests_mock.register_uri(
+            'GET', NODES_URL,
+            json={'metadata': {'resourceVersion': '20'},
+                  'items': [_node('node-0', True)]})
+        self._watch()
+        watcher.sync()
+        self.assertEqual({'node-0': True}, watcher.readiness())
+        self.callback.assert_called_once_with('fake-uuid')
+
+    @mock.patch.object(k8s_watch.NodeReadinessWatcher, 'start')
+    def test_get_watcher(self, mock_start):
+        watcher = k8s_watch.get_watcher(self.context, self.cluster)
+        mock_start.assert_called_once_with()
+        self.assertIs(watcher,
+                      k8s_watch.get_watcher(self.context, self.cluster))
+
+        self.cluster.ca_cert_ref = 'new-ca-cert-ref'
+        with mock.patch.object(watcher, 'stop') as mock_stop:
+            new_watcher = k8s_watch.get_watcher(self.context, self.cluster)
+        mock_stop.assert_called_once_with()
+        self.assertIsNot(watcher, new_watcher)
+
+    @mock.patch.object(k8s_watch.NodeReadinessWatcher, 'start')
+    def test_prune_watchers(self, mock_start):
+        watcher = k8s_watch.get_watcher(self.context, self.cluster)
+        k8s_watch.prune_watchers(['fake-uuid'])
+        self.assertIs(watcher, k8s_watch._watchers['fake-uuid'])
+
+        k8s_watch.prune_watchers([])
+        self.assertEqual({}, k8s_watch._watchers)
+        self.assertTrue(watcher._api.ca_file.closed)
@@ -389,6 +389,32 @@ class MonitorsTestCase(base.TestCase):
         self.assertEqual(self.k8s_monitor.data['health_status_reason'],
                          {'api': 'ok', 'k8s-cluster-node-0.Ready': True})
 
+    @mock.patch('magnum.conductor.k8s_watch.get_watcher')
+    @mock.patch('magnum.conductor.k8s_api.create_client_files')
+    def test_k8s_monitor_health_watched(self, mock_create_client_files,
+                                        mock_get_watcher):
+        self.config(health_watch_enabled=True, group='kubernetes')
+        mock_create_client_files.return_value = (
+            tempfile.NamedTemporaryFile(),
+            tempfile.NamedTemporaryFile(),
+            tempfile.NamedTemporaryFile()
+        )
+        mock_get_watcher.return_value.readiness.return_value = {
+            'k8s-cluster-node-0': False}
+
+        self.requests_mock.register_uri(
+            'GET',
+            f"{self.cluster.api_address}/healthz",
+            text="ok",
+        )
+
+        self.k8s_monitor.poll_health_status()
+        mock_get_watcher.assert_called_once_with(self.context, self.cluster)
+        self.assertEqual(self.k8s_monitor.data['health_status'],
+                         m_fields.ClusterHealthStatus.UNHEALTHY)
+        self.assertEqual(self.k8s_monitor.data['health_status_reason'],
+                         {'api': 'ok', 'k8s-cluster-node-0.Ready': False})
+
     @mock.patch('magnum.conductor.k8s_api.create_client_files')
     def test_k8s_monitor_health_unhealthy_api(self, mock_create_client_files):
         mock_create_client_files.return_value = (
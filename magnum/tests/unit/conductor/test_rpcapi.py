@@ -117,6 +117,13 @@ class RPCAPITestCase(base.DbTestCase):
                           cluster=self.fake_cluster,
                           certificate=self.fake_certificate)
 
+    def test_sign_certificates(self):
+        self._test_rpcapi('sign_certificates',
+                          'call',
+                          version='1.0',
+                          cluster=self.fake_cluster,
+                          certificates=[self.fake_certificate])
+
     def test_get_ca_certificate(self):
         self._test_rpcapi('get_ca_certificate',
                           'call',
@@ -14,6 +14,7 @@
 
 import tempfile
 from unittest import mock
+from urllib import parse
 
 from requests_mock.contrib import fixture
 
@@ -114,7 +115,7 @@ class TestScaleManager(base.TestCase):
         num_of_removal = 1
         all_hosts = ['10.0.0.3', '10.0.0.4']
         container_hosts = set(['10.0.0.3', '10.0.0.4'])
-        expected_removal_hosts = []
+        expected_removal_hosts = ['10.0.0.3']
         self._test_get_removal_nodes(
             mock_get_hosts, mock_get_num_of_removal, mock_is_scale_down,
             mock_get_by_uuid, is_scale_down, num_of_removal, all_hosts,
@@ -134,7 +135,7 @@ class TestScaleManager(base.TestCase):
         num_of_removal = 1
         all_hosts = ['10.0.0.3', '10.0.0.4']
         container_hosts = set(['10.0.0.3', '10.0.0.4', '10.0.0.5'])
-        expected_removal_hosts = []
+        expected_removal_hosts = ['10.0.0.3']
         self._test_get_removal_nodes(
             mock_get_hosts, mock_get_num_of_removal, mock_is_scale_down,
             mock_get_by_uuid, is_scale_down, num_of_removal, all_hosts,
@@ -180,6 +181,32 @@ class TestScaleManager(base.TestCase):
             mock_get_by_uuid, is_scale_down, num_of_removal, all_hosts,
             container_hosts, expected_removal_hosts)
 
+    @mock.patch('magnum.objects.Cluster.get_by_uuid')
+    @mock.patch('magnum.conductor.scale_manager.ScaleManager._is_scale_down')
+    @mock.patch('magnum.conductor.scale_manager.ScaleManager.'
+                '_get_num_of_removal')
+    @mock.patch('magnum.conductor.scale_manager.ScaleManager.'
+                '_get_host_loads')
+    def test_get_removal_nodes_least_loaded(
+            self, mock_get_host_loads, mock_get_num_of_removal,
+            mock_is_scale_down, mock_get_by_uuid):
+        mock_is_scale_down.return_value = True
+        mock_get_num_of_removal.return_value = 3
+        mock_get_host_loads.return_value = {
+            '10.0.0.3': scale_manager.HostLoad(2, 0.5, 1024),
+            '10.0.0.4': scale_manager.HostLoad(1, 2, 1024),
+            '10.0.0.5': scale_manager.HostLoad(1, 1, 4096),
+            '10.0.0.6': scale_manager.HostLoad(1, 1, 2048),
+        }
+        mock_heat_output = mock.MagicMock()
+        mock_heat_output.get_output_value.return_value = [
+            '10.0.0.3', '10.0.0.4', '10.0.0.5', '10.0.0.6', '10.0.0.7']
+
+        scale_mgr = scale_manager.ScaleManager(
+            mock.MagicMock(), mock.MagicMock(), mock.MagicMock())
+        self.assertEqual(['10.0.0.7', '10.0.0.6', '10.0.0.5'],
+                         scale_mgr.get_removal_nodes(mock_heat_output))
+
 
 class TestK8sScaleManager(base.TestCase):
 
@@ -204,16 +231,29 @@ class TestK8sScaleManager(base.TestCase):
             'GET',
             f"{mock_cluster.api_address}/api/v1/namespaces/default/pods",
             json={
+                'kind': 'PodList',
+                'apiVersion': 'v1',
+                'metadata': {'resourceVersion': '1234'},
                 'items': [
                     {
+                        'metadata': {'name': 'pod1',
+                                     'namespace': 'default'},
                         'spec': {
-                            'node_name': 'node1',
-                        }
+                            'nodeName': 'node1',
+                            'containers': [{'name': 'c1'}],
+                        },
+                        'status': {'phase': 'Running',
+                                   'hostIP': '10.0.0.3'},
                     },
                     {
+                        'metadata': {'name': 'pod2',
+                                     'namespace': 'default'},
                         'spec': {
-                            'node_name': 'node2',
-                        }
+                            'nodeName': 'node2',
+                            'containers': [{'name': 'c1'}],
+                        },
+                        'status': {'phase': 'Pending',
+                                   'hostIP': '10.0.0.4'},
                     }
                 ]
             },
@@ -224,3 +264,61 @@ class TestK8sScaleManager(base.TestCase):
         hosts = mgr._get_hosts_with_container(
             mock.MagicMock(), mock_cluster)
         self.assertEqual(hosts, {'node1', 'node2'})
+        query = parse.urlsplit(self.requests_mock.last_request.url).query
+        self.assertEqual({'fieldSelector': ['spec.nodeName!='],
+                          'limit': ['500']}, parse.parse_qs(query))
+
+    @mock.patch('magnum.objects.Cluster.get_by_uuid')
+    @mock.patch('magnum.conductor.k8s_api.create_client_files')
+    def test_get_host_loads(self, mock_create_client_files, mock_get):
+        mock_cluster = mock.MagicMock()
+        mock_cluster.api_address = "https://foobar.com:6443"
+        mock_create_client_files.return_value = (
+            tempfile.NamedTemporaryFile(),
+            tempfile.NamedTemporaryFile(),
+            tempfile.NamedTemporaryFile()
+        )
+
+        def pod(host_ip, *requests, **metadata):
+            return {'metadata': metadata,
+                    'status': {'hostIP': host_ip},
+                    'spec': {'containers': [
+                        {'resources': {'requests': request}}
+                        for request in requests]}}
+
+        daemon_set = {'ownerReferences': [
+            {'apiVersion': 'apps/v1', 'kind': 'DaemonSet',
+             'name': 'kube-proxy'}]}
+        mirror = {'annotations': {'kubernetes.io/config.mirror': 'abc'},
+                  'ownerReferences': [{'apiVersion': 'v1', 'kind': 'Node',
+                                       'name': 'node-5'}]}
+
+        self.requests_mock.register_uri(
+            'GET',
+            f"{mock_cluster.api_address}/api/v1/pods",
+            json={
+                'items': [
+                    pod('10.0.0.3', {'cpu': '500m', 'memory': '1Ki'},
+                        {'cpu': '1'}),
+                    pod('10.0.0.3', {}),
+                    pod('10.0.0.3', {'cpu': '1'}, **daemon_set),
+                    pod('10.0.0.4', {'memory': '2Ki'}),
+                    pod('10.0.0.4', {'memory': '1Ki'}, **mirror),
+                    pod('10.0.0.5', {'cpu': '1'}, **daemon_set),
+                    pod('10.0.0.5', {'cpu': '1'}, **mirror),
+                    pod(None, {'cpu': '1'}),
+                ]
+            },
+        )
+
+        mgr = K8sScaleManager(
+            mock.MagicMock(), mock.MagicMock(), mock.MagicMock())
+        loads = mgr._get_host_loads(mock.MagicMock(), mock_cluster)
+        self.assertEqual(
+            {'10.0.0.3': scale_manager.HostLoad(2, 1.5, 1024),
+             '10.0.0.4': scale_manager.HostLoad(1, 0, 2048)},
+            loads)
+        query = parse.urlsplit(self.requests_mock.last_request.url).query
+        self.assertEqual(
+            ['spec.nodeName!=,status.phase!=Succeeded,status.phase!=Failed'],
+            parse.parse_qs(query)['fieldSelector'])
@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Tests for the query plans of the queries made on every sync."""
+
+from oslo_db import exception as db_exc
+from oslo_db.sqlalchemy import provision
+from oslo_utils import uuidutils
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from magnum.common import context
+from magnum.db.sqlalchemy import api as sqla_api
+from magnum.db.sqlalchemy import models
+from magnum.objects import fields
+from magnum.tests import base
+
+
+def _explain_sqlite(conn, statement):
+    rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement)
+    return '\n'.join(row[-1] for row in rows)
+
+
+def _explain_mysql(conn, statement):
+    # The tables are empty, so MySQL may well prefer scanning them, check
+    # that the indexes can be used rather than that they are.
+    rows = conn.exec_driver_sql('EXPLAIN ' + statement).mappings()
+    return '\n'.join(row['possible_keys'] or '' for row in rows)
+
+
+# Functions returning the parts of the plan of a statement naming the
+# indexes it uses, by dialect.
+_EXPLAIN = {
+    'sqlite': _explain_sqlite,
+    'mysql': _explain_mysql,
+}
+
+
+class IndexUsageTestMixin(object):
+    """Check that the filters of the hot queries are served by indexes.
+
+    The queries are built by the DB API helpers, so that a change in the
+    way they filter shows up here.
+    """
+
+    def setUp(self):
+        super(IndexUsageTestMixin, self).setUp()
+        self.engine = self.create_engine()
+        models.Base.metadata.create_all(self.engine)
+        self.session = orm.Session(bind=self.engine)
+        self.addCleanup(self.session.close)
+        self.connection = sqla_api.Connection()
+
+    def _plan(self, query):
+        statement = query.statement.compile(
+            dialect=self.engine.dialect,
+            compile_kwargs={'literal_binds': True})
+        explain = _EXPLAIN[self.engine.dialect.name]
+        with self.engine.connect() as conn:
+            return explain(conn, str(statement))
+
+    def _query(self, model):
+        return sqla_api.model_query(model, session=self.session)
+
+    def test_cluster_status_filter(self):
+        status = [fields.ClusterStatus.CREATE_IN_PROGRESS,
+                  fields.ClusterStatus.UPDATE_IN_PROGRESS]
+        query = self.connection._add_clusters_filters(
+            self._query(models.Cluster), {'status': status})
+        self.assertIn('ix_cluster_status', self._plan(query))
+
+    def test_cluster_tenant_filter(self):
+        ctx = context.RequestContext(project_id='fake_project',
+                                     user_id='fake_user')
+        query = self.connection._add_tenant_filters(
+            ctx, self._query(models.Cluster))
+        self.assertIn('ix_cluster_project_id', self._plan(query))
+
+    def test_default_nodegroup_filter(self):
+        query = self._query(models.NodeGroup).filter_by(
+            cluster_id=uuidutils.generate_uuid())
+        query = self.connection._add_nodegoup_filters(
+            query, {'role': 'master', 'is_default': True})
+        self.assertIn('ix_nodegroup_cluster_id_role_is_default',
+                      self._plan(query))
+
+    def test_x509keypair_tenant_filter(self):
+        ctx = context.RequestContext(project_id='fake_project',
+                                     user_id='fake_user')
+        query = self.connection._add_tenant_filters(
+            ctx, self._query(models.X509KeyPair))
+        self.assertIn('ix_x509keypair_project_id', self._plan(query))
+
+
+class SQLiteIndexUsageTestCase(IndexUsageTestMixin, base.TestCase):
+
+    def create_engine(self):
+        return sa.create_engine('sqlite://')
+
+
+class MySQLIndexUsageTestCase(IndexUsageTestMixin, base.TestCase):
+    """Run against the opportunistic MySQL database, when there is one."""
+
+    def create_engine(self):
+        try:
+            backend = provision.Backend.backend_for_database_type('mysql')
+        except db_exc.BackendNotAvailable as e:
+            self.skipTest(str(e))
+        ident = 'magnum_' + uuidutils.generate_uuid(dashed=False)[:16]
+        backend.create_named_database(ident)
+        self.addCleanup(backend.drop_named_database, ident)
+        engine = sa.create_engine(backend.provisioned_database_url(ident))
+        self.addCleanup(engine.dispose)
+        return engine
@@ -108,6 +108,11 @@ class DbClusterTestCase(base.DbTestCase):
         ret = self.dbapi.get_cluster_stats(self.context, 'proj2')
         self.assertEqual(ret, (1, 6))
 
+    def test_get_cluster_stats_without_nodegroups(self):
+        utils.create_test_cluster(id=1, uuid=uuidutils.generate_uuid())
+        ret = self.dbapi.get_cluster_stats(self.context)
+        self.assertEqual(ret, (1, 0))
+
     def test_get_cluster_list(self):
         uuids = []
         for i in range(1, 6):
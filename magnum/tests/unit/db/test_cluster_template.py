@@ -117,6 +117,20 @@ class DbClusterTemplateTestCase(base.DbTestCase):
             self.context, ct['uuid'])
         self.assertEqual(ct['id'], cluster_template.id)
 
+    def test_get_cluster_templates_by_uuids(self):
+        ct1 = utils.create_test_cluster_template(
+            id=1, uuid=uuidutils.generate_uuid())
+        ct2 = utils.create_test_cluster_template(
+            id=2, uuid=uuidutils.generate_uuid(), user_id='not_me',
+            public=True)
+        utils.create_test_cluster_template(
+            id=3, uuid=uuidutils.generate_uuid())
+        res = self.dbapi.get_cluster_templates_by_uuids(
+            self.context, [ct1['uuid'], ct2['uuid'],
+                           '12345678-9999-0000-aaaa-123456789012'])
+        self.assertEqual(sorted([ct1['id'], ct2['id']]),
+                         sorted([r.id for r in res]))
+
     def test_get_cluster_template_that_does_not_exist(self):
         self.assertRaises(exception.ClusterTemplateNotFound,
                           self.dbapi.get_cluster_template_by_id,
@@ -118,6 +118,29 @@ class DbNodeGroupTestCase(base.DbTestCase):
         for uuid in uuids_not_in_cluster:
             self.assertNotIn(uuid, res_uuids)
 
+    def test_get_cluster_rollups(self):
+        cluster1 = utils.create_test_cluster(uuid=uuidutils.generate_uuid())
+        utils.create_nodegroups_for_cluster(cluster_id=cluster1.uuid)
+        utils.create_test_nodegroup(uuid=uuidutils.generate_uuid(),
+                                    name='extra', cluster_id=cluster1.uuid,
+                                    node_count=2,
+                                    node_addresses=['172.17.2.5'])
+        cluster2 = utils.create_test_cluster(uuid=uuidutils.generate_uuid())
+
+        res = self.dbapi.get_cluster_rollups(
+            self.context, [cluster1.uuid, cluster2.uuid])
+        self.assertEqual({'node_count': 5, 'master_count': 3,
+                          'node_addresses': ['172.17.2.4', '172.17.2.5'],
+                          'master_addresses': ['172.17.2.18']},
+                         res[cluster1.uuid])
+        self.assertEqual({'node_count': 0, 'master_count': 0,
+                          'node_addresses': [], 'master_addresses': []},
+                         res[cluster2.uuid])
+
+    def test_get_cluster_rollups_for_no_clusters(self):
+        utils.create_test_nodegroup()
+        self.assertEqual({}, self.dbapi.get_cluster_rollups(self.context, []))
+
     def test_get_cluster_list_sorted(self):
         uuids = []
         cluster = utils.create_test_cluster(uuid=uuidutils.generate_uuid())
@@ -10,12 +10,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import os
+import tempfile
 from unittest import mock
 from unittest.mock import patch
 
 from heatclient import exc as heatexc
 from oslo_utils import uuidutils
 
+from magnum.common import tracing
 import magnum.conf
 from magnum.drivers.heat import driver as heat_driver
 from magnum.drivers.k8s_fedora_atomic_v1 import driver as k8s_atomic_dr
@@ -33,6 +36,7 @@ class TestHeatPoller(base.TestCase):
         super(TestHeatPoller, self).setUp()
         self.mock_stacks = dict()
         self.def_ngs = list()
+        self.addCleanup(heat_driver._synced_stacks.clear)
 
     def _create_nodegroup(self, cluster, uuid, stack_id, name=None, role=None,
                           is_default=False, stack_status=None,
@@ -122,8 +126,22 @@ class TestHeatPoller(base.TestCase):
 
         cluster_template_dict = utils.get_test_cluster_template(
             coe='kubernetes')
+
+        def list_ng_stacks(filters=None, show_deleted=False):
+            stacks = []
+            for stack_id in filters['id']:
+                if stack_id in self.mock_stacks:
+                    stack = self.mock_stacks[stack_id]
+                    stacks.append(mock.MagicMock(
+                        id=stack_id, stack_status=stack.stack_status,
+                        updated_time=stack.updated_time))
+            return stacks
+
         mock_heat_client = mock.MagicMock()
-        mock_heat_client.stacks.get = get_ng_stack
+        mock_heat_client.stacks.get = mock.MagicMock(side_effect=get_ng_stack)
+        mock_heat_client.stacks.list = mock.MagicMock(
+            side_effect=list_ng_stacks)
+        self.mock_heat_client = mock_heat_client
         mock_openstack_client.heat.return_value = mock_heat_client
         cluster_template = objects.ClusterTemplate(self.context,
                                                    **cluster_template_dict)
@@ -332,6 +350,118 @@ class TestHeatPoller(base.TestCase):
         self.assertEqual(1, cluster.default_ng_worker.node_count)
         self.assertEqual(1, cluster.default_ng_master.node_count)
 
+    def test_poll_and_check_batch_create_complete(self):
+        self.config(batch_stack_polling=True, group='cluster_heat')
+        cluster, poller = self.setup_poll_test()
+
+        cluster.status = cluster_status.CREATE_IN_PROGRESS
+        poller.poll_and_check()
+
+        for ng in cluster.nodegroups:
+            self.assertEqual(cluster_status.CREATE_COMPLETE, ng.status)
+            self.assertEqual(1, ng.save.call_count)
+
+        self.assertEqual(cluster_status.CREATE_COMPLETE, cluster.status)
+        self.assertEqual(1, cluster.save.call_count)
+        self.mock_heat_client.stacks.list.assert_called_once_with(
+            filters={'id': ['stack1']}, show_deleted=True)
+        self.mock_heat_client.stacks.get.assert_has_calls(
+            [mock.call('stack1', resolve_outputs=True)] * 2)
+
+    def test_poll_and_check_batch_unchanged(self):
+        self.config(batch_stack_polling=True, group='cluster_heat')
+        cluster, poller = self.setup_poll_test()
+
+        ng = self._create_nodegroup(
+            cluster, 'ng1', 'stack2',
+            stack_status=cluster_status.CREATE_IN_PROGRESS)
+        ng.status = cluster_status.CREATE_IN_PROGRESS
+
+        cluster.status = cluster_status.UPDATE_IN_PROGRESS
+        poller.poll_and_check()
+
+        self.assertEqual(cluster_status.CREATE_IN_PROGRESS, ng.status)
+        self.assertEqual(0, ng.save.call_count)
+        self.assertEqual(cluster_status.UPDATE_IN_PROGRESS, cluster.status)
+        self.assertEqual(1, self.mock_heat_client.stacks.list.call_count)
+        self.assertNotIn(mock.call('stack2', resolve_outputs=False),
+                         self.mock_heat_client.stacks.get.call_args_list)
+        self.assertNotIn(mock.call('stack2', resolve_outputs=True),
+                         self.mock_heat_client.stacks.get.call_args_list)
+
+    def test_poll_and_check_batch_unchanged_complete(self):
+        self.config(batch_stack_polling=True, group='cluster_heat')
+        cluster, poller = self.setup_poll_test(
+            default_stack_status=cluster_status.UPDATE_IN_PROGRESS)
+
+        ng = self._create_nodegroup(cluster, 'ng1', 'stack2')
+        ng.status = cluster_status.CREATE_COMPLETE
+        ng.status_reason = 'stack created'
+
+        cluster.status = cluster_status.UPDATE_IN_PROGRESS
+        with mock.patch.object(poller.template_def,
+                               'update_outputs') as mock_update_outputs:
+            poller.poll_and_check()
+
+        # The outputs are synced, but the unchanged status is not saved.
+        mock_update_outputs.assert_any_call(
+            self.mock_stacks['stack2'], poller.cluster_template, cluster,
+            nodegroups=[ng])
+        self.assertEqual(0, ng.save.call_count)
+        self.assertIn(mock.call('stack2', resolve_outputs=True),
+                      self.mock_heat_client.stacks.get.call_args_list)
+
+    def test_poll_and_check_batch_complete_not_updated(self):
+        self.config(batch_stack_polling=True, group='cluster_heat')
+        cluster, poller = self.setup_poll_test()
+        stack = self.mock_stacks['stack1']
+        stack.updated_time = '2026-10-18T08:00:00Z'
+        resolved = mock.call('stack1', resolve_outputs=True)
+
+        cluster.status = cluster_status.CREATE_IN_PROGRESS
+        poller.poll_and_check()
+        self.assertEqual(
+            2, self.mock_heat_client.stacks.get.call_args_list.count(
+                resolved))
+
+        # The stack was not updated since its outputs were synced.
+        self.mock_heat_client.stacks.get.reset_mock()
+        poller.poll_and_check()
+        self.mock_heat_client.stacks.get.assert_not_called()
+        self.assertEqual(cluster_status.CREATE_COMPLETE, cluster.status)
+
+        stack.updated_time = '2026-10-18T08:05:00Z'
+        poller.poll_and_check()
+        self.assertEqual(
+            2, self.mock_heat_client.stacks.get.call_args_list.count(
+                resolved))
+
+    def test_poll_and_check_traced(self):
+        self.addCleanup(tracing.disable)
+        tracing.enable(10)
+        cluster, poller = self.setup_poll_test()
+
+        poller.poll_and_check()
+
+        event, = tracing.events()
+        self.assertEqual('HeatPoller.poll_and_check', event.name)
+        self.assertEqual({'cluster': cluster.uuid}, event.attrs)
+        self.assertIsNotNone(event.duration)
+
+    def test_poll_and_check_batch_stack_missing(self):
+        self.config(batch_stack_polling=True, group='cluster_heat')
+        cluster, poller = self.setup_poll_test(
+            default_stack_status=cluster_status.CREATE_IN_PROGRESS,
+            stack_missing=True)
+
+        cluster.status = cluster_status.CREATE_IN_PROGRESS
+        poller.poll_and_check()
+
+        for ng in cluster.nodegroups:
+            self.assertEqual(cluster_status.CREATE_FAILED, ng.status)
+        self.assertEqual(cluster_status.CREATE_FAILED, cluster.status)
+        self.mock_heat_client.stacks.get.assert_not_called()
+
     def test_poll_and_check_new_ng_creating(self):
         cluster, poller = self.setup_poll_test()
 
@@ -762,3 +892,73 @@ class TestHeatPoller(base.TestCase):
 
         self.assertIn('worker_ng', cluster.status_reason)
         self.assertIn('master_ng', cluster.status_reason)
+
+
+class TestTemplateBundle(base.TestCase):
+
+    def setUp(self):
+        super(TestTemplateBundle, self).setUp()
+        heat_driver._template_bundles.clear()
+        self.addCleanup(heat_driver._template_bundles.clear)
+        self.driver = k8s_atomic_dr.Driver()
+
+        self.template_dir = tempfile.mkdtemp()
+        self.template_path = self._write('template.yaml',
+                                         'heat_template_version: 2014-10-16\n'
+                                         'resources:\n'
+                                         '  fragment:\n'
+                                         '    type: fragment.yaml\n')
+        self.fragment_path = self._write('fragment.yaml',
+                                         'heat_template_version: 2014-10-16\n')
+        self.env_path = self._write('env.yaml', 'parameters: {}\n')
+
+    def _write(self, name, content):
+        path = os.path.join(self.template_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _get_bundle(self):
+        return self.driver._get_template_bundle(self.template_path,
+                                                ['env.yaml'])
+
+    @patch('heatclient.common.template_utils.get_template_contents',
+           wraps=heat_driver.template_utils.get_template_contents)
+    def test_bundle_cached(self, mock_get_template_contents):
+        bundle = self._get_bundle()
+        # Nested templates are loaded by recursive calls.
+        parse_calls = mock_get_template_contents.call_count
+        self.assertIn('resources', bundle.template)
+        self.assertIn('file://%s' % self.fragment_path, bundle.files)
+        self.assertIn('file://%s' % self.env_path, bundle.files)
+        self.assertEqual(['file://%s' % self.env_path],
+                         bundle.environment_files)
+
+        bundle.template['resources'].clear()
+        bundle.files.clear()
+        cached = self._get_bundle()
+        self.assertEqual(parse_calls, mock_get_template_contents.call_count)
+        self.assertIn('fragment', cached.template['resources'])
+        self.assertIn('file://%s' % self.fragment_path, cached.files)
+
+    @patch('heatclient.common.template_utils.get_template_contents',
+           wraps=heat_driver.template_utils.get_template_contents)
+    def test_bundle_reloaded_on_change(self, mock_get_template_contents):
+        self._get_bundle()
+        parse_calls = mock_get_template_contents.call_count
+        stat = os.stat(self.fragment_path)
+        os.utime(self.fragment_path, ns=(stat.st_atime_ns,
+                                         stat.st_mtime_ns + 1000000000))
+        self._get_bundle()
+        self.assertEqual(2 * parse_calls,
+                         mock_get_template_contents.call_count)
+
+    @patch('heatclient.common.template_utils.get_template_contents')
+    def test_bundle_missing_files_not_cached(self,
+                                             mock_get_template_contents):
+        mock_get_template_contents.side_effect = lambda path: ({}, {})
+        with patch.object(self.driver, '_get_env_files',
+                          return_value=([], {})):
+            self.driver._get_template_bundle('missing.yaml', [])
+            self.driver._get_template_bundle('missing.yaml', [])
+        self.assertEqual(2, mock_get_template_contents.call_count)
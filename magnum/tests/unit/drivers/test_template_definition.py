@@ -21,6 +21,7 @@ import six
 from magnum.common import exception
 import magnum.conf
 from magnum.drivers.common import driver
+from magnum.drivers.heat import swarm_mode_template_def as swarm_mode_tdef
 from magnum.drivers.heat import template_def as cmn_tdef
 from magnum.drivers.k8s_coreos_v1 import driver as k8s_coreos_dr
 from magnum.drivers.k8s_coreos_v1 import template_def as k8s_coreos_tdef
@@ -108,6 +109,34 @@ class TemplateDefinitionTestCase(base.TestCase):
         self.assertIsInstance(definition,
                               swarm_v2_tdef.AtomicSwarmTemplateDefinition)
 
+    def test_get_driver_cached(self):
+        self.addCleanup(driver.Driver.reload_drivers)
+        cluster_driver = driver.Driver.get_driver('vm', 'fedora-atomic',
+                                                  'kubernetes')
+        self.assertIsInstance(cluster_driver, k8sa_dr.Driver)
+        self.assertIs(cluster_driver,
+                      driver.Driver.get_driver('vm', 'fedora-atomic',
+                                               'kubernetes'))
+
+    @mock.patch.object(driver.Driver, 'load_entry_points')
+    def test_reload_drivers(self, mock_load_entry_points):
+        self.addCleanup(driver.Driver.reload_drivers)
+        entry_point = mock.MagicMock()
+        entry_point.name = 'k8s_fedora_atomic_v1'
+        mock_load_entry_points.side_effect = lambda: iter(
+            [(entry_point, k8sa_dr.Driver)])
+        driver.Driver.reload_drivers()
+        cluster_driver = driver.Driver.get_driver('vm', 'fedora-atomic',
+                                                  'kubernetes')
+        driver.Driver.get_driver('vm', 'fedora-atomic', 'kubernetes')
+        self.assertEqual(1, mock_load_entry_points.call_count)
+
+        driver.Driver.reload_drivers()
+        self.assertIsNot(cluster_driver,
+                         driver.Driver.get_driver('vm', 'fedora-atomic',
+                                                  'kubernetes'))
+        self.assertEqual(2, mock_load_entry_points.call_count)
+
     def test_get_driver_not_supported(self):
         self.assertRaises(exception.ClusterTypeNotSupported,
                           driver.Driver.get_driver,
@@ -1573,6 +1602,42 @@ class AtomicK8sTemplateDefinitionTestCase(BaseK8sTemplateDefinitionTestCase):
             is_master=False
         )
 
+    def test_update_outputs_batched(self):
+        definition = self.get_definition()
+        outputs = [
+            {"output_value": ['m1', 'm2'], "output_key": 'kube_masters'},
+            {"output_value": ['n1'], "output_key": 'kube_minions'},
+            {"output_value": '10.0.0.1', "output_key": 'api_address'},
+        ]
+        mock_stack = mock.MagicMock()
+        mock_stack.to_dict.return_value = {'outputs': outputs}
+        mock_stack.parameters = {'number_of_masters': 2,
+                                 'number_of_minions': 1}
+        mock_nodegroups = mock.PropertyMock(return_value=self.nodegroups)
+        type(self.mock_cluster).nodegroups = mock_nodegroups
+        self.mock_cluster.floating_ip_enabled = True
+        mock_cluster_template = mock.MagicMock(tls_disabled=False)
+
+        definition.update_outputs(mock_stack, mock_cluster_template,
+                                  self.mock_cluster)
+
+        mock_stack.to_dict.assert_called_once_with()
+        mock_nodegroups.assert_called_once_with()
+        self.assertEqual('https://10.0.0.1:6443',
+                         self.mock_cluster.api_address)
+        self.assertEqual(['m1', 'm2'], self.master_ng.node_addresses)
+        self.assertEqual(2, self.master_ng.node_count)
+        self.assertEqual(['n1'], self.worker_ng.node_addresses)
+        self.assertEqual(1, self.worker_ng.node_count)
+        self.master_ng.save.assert_called_once_with()
+        self.worker_ng.save.assert_called_once_with()
+
+        # Nothing is saved when the outputs did not change
+        definition.update_outputs(mock_stack, mock_cluster_template,
+                                  self.mock_cluster)
+        self.master_ng.save.assert_called_once_with()
+        self.worker_ng.save.assert_called_once_with()
+
     def test_set_master_lb_allowed_cidrs(self):
         definition = self.get_definition()
         extra_params = {"master_lb_allowed_cidrs": "192.168.0.0/16"}
@@ -1898,6 +1963,25 @@ class AtomicSwarmModeTemplateDefinitionTestCase(base.TestCase):
             is_master=False
         )
 
+    def test_master_address_set_output_saves_nodegroup(self):
+        mapping = swarm_mode_tdef.MasterAddressOutputMapping(
+            None, nodegroup_attr='node_addresses',
+            nodegroup_uuid='master_ng')
+        self.mock_cluster.floating_ip_enabled = True
+        outputs = {'swarm_primary_master': ['10.0.0.1'],
+                   'swarm_secondary_masters': ['10.0.0.2']}
+
+        self.assertTrue(mapping.set_output(None, None, self.mock_cluster,
+                                           outputs=outputs))
+        self.assertEqual(['10.0.0.1', '10.0.0.2'],
+                         self.master_ng.node_addresses)
+        self.master_ng.save.assert_called_once_with()
+
+        # Unchanged addresses are not saved again.
+        self.assertFalse(mapping.set_output(None, None, self.mock_cluster,
+                                            outputs=outputs))
+        self.master_ng.save.assert_called_once_with()
+
     def test_update_outputs_master_address_fip_disabled(self):
         self._test_update_outputs_server_address(
             floating_ip_enabled=False,
@@ -15,15 +15,53 @@
 
 from unittest import mock
 
+import fixtures
 from oslo_utils import uuidutils
+from oslo_versionedobjects import base as ovoo_base
 from testtools.matchers import HasLength
 
 from magnum.common import exception
+from magnum.conductor.handlers import indirection_api
 from magnum import objects
+from magnum.objects import base as objects_base
 from magnum.tests.unit.db import base
 from magnum.tests.unit.db import utils
 
 
+class _FakeIndirectionAPI(ovoo_base.VersionedObjectIndirectionAPI):
+    # Runs the remotable methods through the conductor handler, serializing
+    # their arguments and results as RPC would.
+
+    def __init__(self):
+        super(_FakeIndirectionAPI, self).__init__()
+        self._handler = indirection_api.Handler()
+        self._serializer = objects_base.MagnumObjectSerializer()
+
+    def _round_trip(self, context, entity):
+        return self._serializer.deserialize_entity(
+            context, self._serializer.serialize_entity(context, entity))
+
+    def _call(self, context, method, *args):
+        args = self._round_trip(context, args)
+        with mock.patch.object(objects_base.MagnumObject,
+                               'indirection_api', None):
+            result = getattr(self._handler, method)(context, *args)
+        return self._round_trip(context, result)
+
+    def object_action(self, context, objinst, objmethod, args, kwargs):
+        return self._call(context, 'object_action', objinst, objmethod,
+                          args, kwargs)
+
+    def object_class_action(self, context, objname, objmethod, objver,
+                            args, kwargs):
+        return self._call(context, 'object_class_action', objname,
+                          objmethod, objver, args, kwargs)
+
+    def object_backport(self, context, objinst, target_version):
+        return self._call(context, 'object_backport', objinst,
+                          target_version)
+
+
 class TestClusterObject(base.DbTestCase):
 
     def setUp(self):
@@ -135,6 +173,60 @@ class TestClusterObject(base.DbTestCase):
             self.assertIsInstance(clusters[0], objects.Cluster)
             self.assertEqual(self.context, clusters[0]._context)
 
+    def test_list_preloads_cluster_templates(self):
+        utils.create_test_cluster_template(
+            uuid=self.fake_cluster['cluster_template_id'])
+        with mock.patch.object(self.dbapi, 'get_cluster_list',
+                               autospec=True) as mock_get_list:
+            mock_get_list.return_value = [self.fake_cluster]
+            clusters = objects.Cluster.list(self.context)
+        self.assertThat(clusters, HasLength(1))
+        with mock.patch.object(self.dbapi, 'get_cluster_template_by_uuid',
+                               autospec=True) as mock_get_ct:
+            self.assertEqual(self.fake_cluster['cluster_template_id'],
+                             clusters[0].cluster_template.uuid)
+            mock_get_ct.assert_not_called()
+
+    def _test_preload_rollups(self):
+        utils.create_test_cluster_template(
+            uuid=self.fake_cluster['cluster_template_id'])
+        utils.create_test_cluster(uuid=self.fake_cluster['uuid'])
+        utils.create_nodegroups_for_cluster(
+            cluster_id=self.fake_cluster['uuid'])
+        clusters = objects.Cluster.list(self.context)
+        self.assertThat(clusters, HasLength(1))
+        objects.Cluster.preload_rollups(self.context, clusters)
+        with mock.patch.object(self.dbapi, 'list_cluster_nodegroups',
+                               autospec=True) as mock_list_ngs, \
+                mock.patch.object(self.dbapi, 'get_cluster_template_by_uuid',
+                                  autospec=True) as mock_get_ct:
+            cluster_dict = clusters[0].as_dict()
+            self.assertEqual(self.fake_cluster['cluster_template_id'],
+                             clusters[0].cluster_template.uuid)
+            mock_list_ngs.assert_not_called()
+            mock_get_ct.assert_not_called()
+        self.assertEqual(3, cluster_dict['node_count'])
+        self.assertEqual(3, cluster_dict['master_count'])
+        self.assertEqual(['172.17.2.4'], cluster_dict['node_addresses'])
+        self.assertEqual(['172.17.2.18'], cluster_dict['master_addresses'])
+
+    def test_preload_rollups(self):
+        self._test_preload_rollups()
+
+    def test_preload_rollups_with_indirection_api(self):
+        # The API service runs the remotable methods in the conductor, so
+        # whatever is preloaded has to survive the serialization.
+        self.useFixture(fixtures.MockPatchObject(
+            objects_base.MagnumObject, 'indirection_api',
+            _FakeIndirectionAPI()))
+        self._test_preload_rollups()
+
+    def test_preload_rollups_no_clusters(self):
+        with mock.patch.object(self.dbapi, 'get_cluster_rollups',
+                               autospec=True) as mock_get_rollups:
+            objects.Cluster.preload_rollups(self.context, [])
+            mock_get_rollups.assert_not_called()
+
     def test_create(self):
         with mock.patch.object(self.dbapi, 'create_cluster',
                                autospec=True) as mock_create_cluster:
@@ -355,7 +355,7 @@ class TestObject(test_base.TestCase, _TestObject):
 # For more information on object version testing, read
 # https://docs.openstack.org/magnum/latest/contributor/objects.html
 object_data = {
-    'Cluster': '1.23-dfaf9ecb65a5fcab4f6c36497a8bc866',
+    'Cluster': '1.24-56a5a220d215640c9dc8aff11f7e3df3',
     'ClusterTemplate': '1.20-ea3b06c5fdbf4a3fba0db9865cd2ba4c',
     'Certificate': '1.2-64f24db0e10ad4cbd72aea21d2075a80',
     'MyObj': '1.0-34c4b1aadefd177b13f9a2f894cc23cd',
@@ -12,13 +12,17 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 from unittest import mock
 
+import eventlet
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 
 from magnum.common import context
 from magnum.common import exception
 from magnum.common.rpc_service import CONF
+from magnum.conductor import k8s_watch
 from magnum.db.sqlalchemy import api as dbapi
 from magnum.drivers.common import driver
 from magnum.drivers.common import k8s_monitor
@@ -28,7 +32,6 @@ from magnum.objects.fields import ClusterStatus as cluster_status
 from magnum.service import periodic
 from magnum.tests import base
 from magnum.tests import fake_notifier
-from magnum.tests import fakes
 from magnum.tests.unit.db import utils
 
 
@@ -216,8 +219,6 @@ class PeriodicTestCase(base.TestCase):
         )
         self.assertEqual(2, self.mock_driver.update_cluster_status.call_count)
 
-    @mock.patch('oslo_service.loopingcall.FixedIntervalLoopingCall',
-                new=fakes.FakeLoopingCall)
     @mock.patch('magnum.drivers.common.driver.Driver.get_driver_for_cluster')
     @mock.patch('magnum.objects.Cluster.list')
     @mock.patch.object(dbapi.Connection, 'destroy_nodegroup')
@@ -234,7 +235,9 @@ class PeriodicTestCase(base.TestCase):
 
         with mock.patch.object(dbapi.Connection, 'list_cluster_nodegroups',
                                mock_nodegroup_list):
-            periodic.MagnumPeriodicTasks(CONF).sync_cluster_status(None)
+            pt = periodic.MagnumPeriodicTasks(CONF)
+            pt.sync_cluster_status(None)
+            pt.status_sync.wait()
 
             self.assertEqual(cluster_status.CREATE_COMPLETE,
                              self.cluster1.status)
@@ -254,8 +257,6 @@ class PeriodicTestCase(base.TestCase):
             notifications = fake_notifier.NOTIFICATIONS
             self.assertEqual(4, len(notifications))
 
-    @mock.patch('oslo_service.loopingcall.FixedIntervalLoopingCall',
-                new=fakes.FakeLoopingCall)
     @mock.patch('magnum.drivers.common.driver.Driver.get_driver_for_cluster')
     @mock.patch('magnum.objects.Cluster.list')
     def test_sync_cluster_status_not_changes(self, mock_cluster_list,
@@ -269,7 +270,9 @@ class PeriodicTestCase(base.TestCase):
                                           self.cluster3, self.cluster5]
         mock_get_driver.return_value = self.mock_driver
 
-        periodic.MagnumPeriodicTasks(CONF).sync_cluster_status(None)
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        pt.sync_cluster_status(None)
+        pt.status_sync.wait()
 
         self.assertEqual(cluster_status.CREATE_IN_PROGRESS,
                          self.cluster1.status)
@@ -286,8 +289,6 @@ class PeriodicTestCase(base.TestCase):
         notifications = fake_notifier.NOTIFICATIONS
         self.assertEqual(0, len(notifications))
 
-    @mock.patch('oslo_service.loopingcall.FixedIntervalLoopingCall',
-                new=fakes.FakeLoopingCall)
     @mock.patch('magnum.drivers.common.driver.Driver.get_driver_for_cluster')
     @mock.patch('magnum.objects.Cluster.list')
     @mock.patch.object(dbapi.Connection, 'destroy_cluster')
@@ -304,7 +305,9 @@ class PeriodicTestCase(base.TestCase):
 
         with mock.patch.object(dbapi.Connection, 'list_cluster_nodegroups',
                                mock_nodegroup_list):
-            periodic.MagnumPeriodicTasks(CONF).sync_cluster_status(None)
+            pt = periodic.MagnumPeriodicTasks(CONF)
+            pt.sync_cluster_status(None)
+            pt.status_sync.wait()
 
             self.assertEqual(cluster_status.CREATE_FAILED,
                              self.cluster1.status)
@@ -323,8 +326,6 @@ class PeriodicTestCase(base.TestCase):
             notifications = fake_notifier.NOTIFICATIONS
             self.assertEqual(5, len(notifications))
 
-    @mock.patch('oslo_service.loopingcall.FixedIntervalLoopingCall',
-                new=fakes.FakeLoopingCall)
     @mock.patch('magnum.conductor.monitors.create_monitor')
     @mock.patch('magnum.objects.Cluster.list')
     @mock.patch('magnum.common.rpc.get_notifier')
@@ -343,10 +344,232 @@ class PeriodicTestCase(base.TestCase):
         monitor = mock.MagicMock(spec=k8s_monitor.K8sMonitor, name='test',
                                  data=health)
         mock_create_monitor.return_value = monitor
-        periodic.MagnumPeriodicTasks(CONF).sync_cluster_health_status(
-            self.context)
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        pt.sync_cluster_health_status(self.context)
+        pt.health_sync.wait()
 
         self.assertEqual(cluster_health_status.UNHEALTHY,
                          self.cluster4.health_status)
         self.assertEqual({'api': 'ok', 'node-0.Ready': 'False'},
                          self.cluster4.health_status_reason)
+
+    @mock.patch.dict(periodic._health_stats, {'updates': 0, 'unchanged': 0})
+    @mock.patch('magnum.conductor.monitors.create_monitor')
+    def test_update_health_status_unchanged(self, mock_create_monitor):
+        self.cluster4.health_status = cluster_health_status.UNHEALTHY
+        self.cluster4.health_status_reason = {'api': 'ok',
+                                              'node-0.Ready': 'False'}
+        health = {'health_status': cluster_health_status.UNHEALTHY,
+                  'health_status_reason': {'api': 'ok', 'node-0.Ready': False}}
+        mock_create_monitor.return_value = mock.MagicMock(
+            spec=k8s_monitor.K8sMonitor, data=health)
+
+        with mock.patch.object(self.cluster4, 'save') as mock_save:
+            periodic.ClusterHealthUpdateJob(
+                self.context, self.cluster4)._update_health_status()
+            mock_save.assert_not_called()
+
+            health['health_status_reason']['node-0.Ready'] = True
+            periodic.ClusterHealthUpdateJob(
+                self.context, self.cluster4)._update_health_status()
+            mock_save.assert_called_once_with()
+
+        self.assertEqual({'updates': 1, 'unchanged': 1, 'skip_ratio': 0.5},
+                         periodic.health_stats())
+
+    @mock.patch('magnum.common.hash_ring.ServiceHashRing.refresh')
+    @mock.patch('magnum.objects.MagnumService.list')
+    @mock.patch('magnum.objects.Cluster.list')
+    def test_sync_cluster_status_sharded(self, mock_cluster_list,
+                                         mock_service_list, mock_refresh):
+        self.config(periodic_sync_sharding=True, group='conductor')
+        mock_cluster_list.return_value = [self.cluster1, self.cluster2]
+        mock_service_list.return_value = [self._service('host2')]
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        owned = {self.cluster2.uuid}
+
+        with mock.patch.object(pt.hash_ring, 'owns',
+                               side_effect=lambda key: key in owned), \
+                mock.patch.object(pt.status_sync, 'run') as mock_run:
+            pt.sync_cluster_status(None)
+
+        mock_refresh.assert_called_once_with(['host2'])
+        mock_run.assert_called_once_with([self.cluster2], mock.ANY)
+
+    def _service(self, host, binary='magnum-conductor', disabled=False,
+                 forced_down=False, age=0):
+        last_seen_up = timeutils.utcnow(True) - datetime.timedelta(
+            seconds=age)
+        return objects.MagnumService(
+            self.context, host=host, binary=binary, disabled=disabled,
+            forced_down=forced_down, last_seen_up=last_seen_up)
+
+    @mock.patch('magnum.objects.MagnumService.list')
+    def test_live_conductors(self, mock_service_list):
+        self.config(periodic_sync_sharding=True, group='conductor')
+        mock_service_list.return_value = [
+            self._service('host1'),
+            self._service('host2'),
+            self._service('host3', age=3600),
+            self._service('host4', disabled=True),
+            self._service('host5', forced_down=True),
+            self._service('host6', binary='magnum-api'),
+        ]
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        self.assertEqual(['host1', 'host2'],
+                         pt._live_conductors(self.context))
+
+    @mock.patch('magnum.common.hash_ring.ServiceHashRing.refresh')
+    @mock.patch('magnum.objects.MagnumService.list')
+    def test_owned_clusters_keeps_ring_on_error(self, mock_service_list,
+                                                mock_refresh):
+        self.config(periodic_sync_sharding=True, group='conductor')
+        mock_service_list.side_effect = Exception('db down')
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        with mock.patch.object(pt.hash_ring, 'owns', return_value=True):
+            self.assertEqual(
+                [self.cluster1],
+                pt._owned_clusters(self.context, [self.cluster1]))
+        mock_refresh.assert_not_called()
+
+    @mock.patch('magnum.objects.Cluster.list')
+    def test_sync_cluster_status_not_sharded(self, mock_cluster_list):
+        mock_cluster_list.return_value = [self.cluster1, self.cluster2]
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        self.assertIsNone(pt.hash_ring)
+
+        with mock.patch.object(pt.status_sync, 'run') as mock_run:
+            pt.sync_cluster_status(None)
+
+        mock_run.assert_called_once_with([self.cluster1, self.cluster2],
+                                         mock.ANY)
+
+    @mock.patch('magnum.conductor.k8s_watch.prune_watchers')
+    @mock.patch('magnum.objects.Cluster.get_by_uuid')
+    @mock.patch('magnum.objects.Cluster.list')
+    def test_sync_cluster_health_status_watch(self, mock_cluster_list,
+                                              mock_get_by_uuid, mock_prune):
+        self.config(health_watch_enabled=True, group='kubernetes')
+        self.addCleanup(k8s_watch.set_change_callback, None)
+        mock_cluster_list.return_value = [self.cluster1]
+        mock_get_by_uuid.return_value = self.cluster2
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        self.assertEqual(pt._nodes_changed, k8s_watch._change_callback)
+
+        with mock.patch.object(pt.health_sync, 'run') as mock_run:
+            pt.sync_cluster_health_status(None)
+            mock_prune.assert_called_once_with([self.cluster1.uuid])
+            mock_run.assert_called_once_with([self.cluster1], mock.ANY)
+
+            mock_run.reset_mock()
+            pt._nodes_changed(self.cluster2.uuid)
+            mock_run.assert_called_once_with([self.cluster2], mock.ANY)
+
+    @mock.patch.object(periodic.LOG, 'debug')
+    @mock.patch('magnum.conductor.handlers.common.cert_manager.'
+                'ca_keys_cache_stats')
+    @mock.patch('magnum.conductor.handlers.common.cert_manager.'
+                'client_certs_cache_stats')
+    @mock.patch('magnum.common.cinder.volume_type_cache_stats')
+    @mock.patch('magnum.common.keystone.trustee_cache_stats')
+    @mock.patch('magnum.common.x509.key_pool.stats')
+    def test_log_stats(self, mock_key_pool_stats, mock_trustee_cache_stats,
+                       mock_volume_type_cache_stats,
+                       mock_client_certs_cache_stats,
+                       mock_ca_keys_cache_stats, mock_debug):
+        pt = periodic.MagnumPeriodicTasks(CONF)
+        mock_key_pool_stats.return_value = None
+        mock_trustee_cache_stats.return_value = {
+            'hits': 5, 'misses': 1, 'size': 1}
+        mock_volume_type_cache_stats.return_value = {
+            'hits': 3, 'misses': 2, 'size': 2}
+        mock_client_certs_cache_stats.return_value = {
+            'hits': 7, 'misses': 3, 'size': 3}
+        mock_ca_keys_cache_stats.return_value = {
+            'hits': 4, 'misses': 2, 'size': 1}
+        pt.log_stats(None)
+        mock_debug.assert_has_calls([
+            mock.call(mock.ANY, mock_trustee_cache_stats.return_value),
+            mock.call(mock.ANY, mock_volume_type_cache_stats.return_value),
+            mock.call(mock.ANY, mock_client_certs_cache_stats.return_value),
+            mock.call(mock.ANY, mock_ca_keys_cache_stats.return_value)])
+        self.assertEqual(4, mock_debug.call_count)
+
+        mock_debug.reset_mock()
+        mock_key_pool_stats.return_value = {
+            'depth': 4, 'pending': 1, 'hits': 10, 'misses': 2,
+            'refill_latency': 0.5}
+        pt.log_stats(None)
+        mock_debug.assert_has_calls([
+            mock.call(mock.ANY, mock_key_pool_stats.return_value),
+            mock.call(mock.ANY, mock_trustee_cache_stats.return_value),
+            mock.call(mock.ANY, mock_volume_type_cache_stats.return_value),
+            mock.call(mock.ANY, mock_client_certs_cache_stats.return_value),
+            mock.call(mock.ANY, mock_ca_keys_cache_stats.return_value)])
+
+
+class ClusterSyncSchedulerTestCase(base.TestCase):
+
+    def _clusters(self, count):
+        return [mock.MagicMock(uuid=uuidutils.generate_uuid())
+                for _ in range(count)]
+
+    def test_run_bounded_concurrency(self):
+        scheduler = periodic.ClusterSyncScheduler('Test', 2)
+        running = []
+        peak = []
+
+        def job():
+            running.append(1)
+            peak.append(len(running))
+            eventlet.sleep(0)
+            running.pop()
+
+        tick = scheduler.run(self._clusters(5), lambda cluster: job)
+        scheduler.wait()
+
+        self.assertEqual(5, tick.submitted)
+        self.assertEqual(0, tick.pending)
+        self.assertEqual(2, max(peak))
+        self.assertIsNotNone(tick.duration)
+        self.assertEqual(frozenset(), scheduler.in_flight)
+
+    def test_run_skips_in_flight_clusters(self):
+        scheduler = periodic.ClusterSyncScheduler('Test', 4)
+        clusters = self._clusters(2)
+        release = eventlet.event.Event()
+        calls = []
+
+        def job_factory(cluster):
+            def job():
+                calls.append(cluster.uuid)
+                release.wait()
+            return job
+
+        first = scheduler.run(clusters, job_factory)
+        eventlet.sleep(0)
+        second = scheduler.run(clusters, job_factory)
+        release.send()
+        scheduler.wait()
+
+        self.assertEqual(2, first.submitted)
+        self.assertEqual(0, second.submitted)
+        self.assertEqual(2, second.skipped)
+        self.assertEqual(2, len(calls))
+
+    def test_run_job_failure(self):
+        scheduler = periodic.ClusterSyncScheduler('Test', 4)
+        clusters = self._clusters(2)
+
+        def job():
+            raise exception.MagnumException()
+
+        tick = scheduler.run(clusters, lambda cluster: job)
+        scheduler.wait()
+
+        self.assertEqual(2, tick.failed)
+        self.assertEqual(frozenset(), scheduler.in_flight)
+        # The failed clusters are picked up again on the next run.
+        tick = scheduler.run(clusters, lambda cluster: job)
+        scheduler.wait()
+        self.assertEqual(2, tick.submitted)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the request throughput of magnum-api in each server mode.
+
+Starts magnum-api with each [api]server_mode on a local port, and sends
+it --requests GET requests of --path from --concurrency client threads,
+each request on a new connection. The default path is served by the API
+without reaching the DB or the conductor, so that the figures measure the
+cost of serving a request rather than of the request itself.
+
+Usage: python tools/benchmarks/api_throughput.py [--workers N]
+"""
+
+import argparse
+import concurrent.futures
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+CONFIG = """
+[DEFAULT]
+use_stderr = false
+
+[api]
+host = 127.0.0.1
+port = %(port)d
+workers = %(workers)d
+threads = %(threads)d
+server_mode = %(mode)s
+api_paste_config = %(paste)s
+"""
+
+SERVER = 'import sys; from magnum.cmd import api; sys.exit(api.main())'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError('magnum-api did not start on port %d' % port)
+
+
+def _request(port, path):
+    start = time.monotonic()
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        conn.request('GET', path)
+        response = conn.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError('GET %s returned %d' % (path, response.status))
+    finally:
+        conn.close()
+    return time.monotonic() - start
+
+
+def run(mode, args):
+    port = _free_port()
+    with tempfile.NamedTemporaryFile('w', suffix='.conf') as conf:
+        conf.write(CONFIG % {
+            'port': port, 'workers': args.workers, 'threads': args.threads,
+            'mode': mode,
+            'paste': os.path.join(REPO, 'etc', 'magnum', 'api-paste.ini')})
+        conf.flush()
+        server = subprocess.Popen(
+            [sys.executable, '-c', SERVER, '--config-file', conf.name],
+            cwd=REPO, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_for_port(port)
+            # Warm up, so that startup is not measured.
+            for _ in range(args.workers * 2):
+                _request(port, args.path)
+
+            start = time.monotonic()
+            with concurrent.futures.ThreadPoolExecutor(
+                    args.concurrency) as executor:
+                latencies = sorted(executor.map(
+                    lambda _: _request(port, args.path),
+                    range(args.requests)))
+            elapsed = time.monotonic() - start
+        finally:
+            server.terminate()
+            server.wait()
+
+    return (args.requests / elapsed,
+            latencies[len(latencies) // 2],
+            latencies[int(len(latencies) * 0.99)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Number of requests sent to each server.')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Number of client threads.')
+    parser.add_argument('--workers', type=int, default=2,
+                        help='Value of [api]workers.')
+    parser.add_argument('--threads', type=int, default=100,
+                        help='Value of [api]threads.')
+    parser.add_argument('--path', default='/',
+                        help='Path requested.')
+    args = parser.parse_args()
+
+    for mode in ('werkzeug', 'prefork'):
+        throughput, p50, p99 = run(mode, args)
+        print('%-10s %8.1f requests/s %8.1f ms p50 %8.1f ms p99'
+              % (mode, throughput, p50 * 1000, p99 * 1000))
+
+
+if __name__ == '__main__':
+    main()
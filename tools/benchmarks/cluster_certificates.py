@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the generation of the certificates of a cluster.
+
+Generates the certificates of several clusters concurrently, as the
+conductor does for concurrent creates, and reports the time taken and the
+longest time the eventlet hub was blocked. The certificate backend is
+replaced by one which takes --store-latency seconds to store a certificate.
+
+The "sequential" run generates the certificates one after the other, with
+the keys generated in the greenthread, as generate_certificates_to_cluster
+used to do.
+
+Usage: python tools/benchmarks/cluster_certificates.py [--clusters N]
+"""
+
+import eventlet
+eventlet.monkey_patch()
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+from unittest import mock  # noqa: E402
+
+from magnum.common.x509 import key_pool  # noqa: E402
+from magnum.conductor.handlers.common import cert_manager  # noqa: E402
+import magnum.conf  # noqa: E402
+
+CONF = magnum.conf.CONF
+
+
+def sequential_generate_certificates(cluster, context=None):
+    issuer_name = cert_manager._get_issuer_name(cluster)
+    _, ca_cert, ca_password = cert_manager._generate_ca_cert(issuer_name)
+    cert_manager._generate_ca_cert(issuer_name)
+    cert_manager._generate_ca_cert(issuer_name)
+    cert_manager._generate_client_cert(issuer_name, ca_cert, ca_password)
+
+
+def run(generate, clusters, store_latency):
+    def store_cert(**kwargs):
+        eventlet.sleep(store_latency)
+        return 'ref'
+
+    stalls = []
+    running = [True]
+
+    def ticker():
+        last = time.monotonic()
+        while running[0]:
+            eventlet.sleep(0.001)
+            now = time.monotonic()
+            stalls.append(now - last)
+            last = now
+
+    backend = mock.Mock()
+    backend.CertManager.store_cert.side_effect = store_cert
+    with mock.patch.object(cert_manager.cert_manager, 'get_backend',
+                           return_value=backend):
+        tick = eventlet.spawn(ticker)
+        start = time.monotonic()
+        pool = eventlet.GreenPool()
+        for i in range(clusters):
+            pool.spawn(generate, mock.Mock(uuid='cluster-%d' % i))
+        pool.waitall()
+        elapsed = time.monotonic() - start
+        running[0] = False
+        tick.wait()
+    return elapsed, max(stalls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clusters', type=int, default=4,
+                        help='Number of clusters created concurrently.')
+    parser.add_argument('--key-size', type=int, default=4096,
+                        help='Size of the RSA keys.')
+    parser.add_argument('--store-latency', type=float, default=0.05,
+                        help='Seconds taken to store a certificate.')
+    args = parser.parse_args()
+
+    CONF([], project='magnum')
+    CONF.set_override('rsa_key_size', args.key_size, group='x509')
+
+    def inline_key(key_size):
+        return key_pool.generate_private_key(key_size)
+
+    with mock.patch.object(key_pool, 'get_private_key', inline_key):
+        sequential = run(sequential_generate_certificates, args.clusters,
+                         args.store_latency)
+    concurrent = run(cert_manager.generate_certificates_to_cluster,
+                     args.clusters, args.store_latency)
+
+    for name, (elapsed, stall) in (('sequential', sequential),
+                                   ('concurrent', concurrent)):
+        print('%-12s %8.2f s total %8.1f ms longest hub stall'
+              % (name, elapsed, stall * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of attribute lookups on API controllers.
+
+Compares the controllers of the API with controllers overriding
+__getattribute__ to select versioned methods on each access, as
+magnum.api.controllers.base.Controller used to do. The lookups are those
+pecan makes on the clusters controller to route a request for
+GET /v1/clusters/<ident>.
+
+Usage: python tools/benchmarks/controller_dispatch.py [--number N]
+"""
+
+import argparse
+import timeit
+from unittest import mock
+
+import pecan
+from webob import exc
+
+from magnum.api.controllers import base
+from magnum.api.controllers.v1 import cluster
+from magnum.api.controllers import versions
+
+# Attributes pecan looks up on the clusters controller for a GET request
+# of a single cluster.
+ROUTE_LOOKUPS = ['_custom_actions', '_lookup_child', '_handle_get',
+                 '_find_sub_controllers', '_lookup', 'get_one', 'get_all',
+                 'get', '_get_args_for_controller', 'detail', 'actions',
+                 '_route', '_handle_lookup', 'get_one', '_custom_actions',
+                 'get_one', 'get_one', '_handle_unknown_method',
+                 '_handle_bad_rest_arguments', 'get_one']
+
+
+class LegacyClustersController(cluster.ClustersController):
+    """Clusters controller selecting versioned methods on each access."""
+
+    def __getattribute__(self, key):
+        def version_select():
+            ver = pecan.request.version
+            func_list = self.versioned_methods[key]
+            for func in func_list:
+                if ver.matches(func.start_version, func.end_version):
+                    return func.func
+            raise exc.HTTPNotAcceptable()
+
+        try:
+            version_meth_dict = object.__getattribute__(
+                self, base.VER_METHOD_ATTR)
+        except AttributeError:
+            return object.__getattribute__(self, key)
+        if version_meth_dict and key in version_meth_dict:
+            return version_select().__get__(self, self.__class__)
+
+        return object.__getattribute__(self, key)
+
+
+def route(controller):
+    for name in ROUTE_LOOKUPS:
+        getattr(controller, name, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=10000,
+                        help='Number of simulated requests to time.')
+    args = parser.parse_args()
+
+    request = mock.Mock(version=versions.Version(
+        '', '', '', versions.CURRENT_MAX_VER))
+    with mock.patch.object(pecan, 'request', request):
+        for name, controller in (
+                ('__getattribute__', LegacyClustersController()),
+                ('dispatch table', cluster.ClustersController())):
+            elapsed = timeit.timeit(lambda: route(controller),
+                                    number=args.number)
+            print('%-18s %8.2f us/request %8.3f us/lookup'
+                  % (name, elapsed / args.number * 1e6,
+                     elapsed / args.number / len(ROUTE_LOOKUPS) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of Driver.get_driver_for_cluster.
+
+Compares loading the driver through stevedore on every call, as
+get_driver used to do, with the shared driver instances. The cluster
+template lookup is stubbed out so that only the driver loading is timed.
+
+Usage: python tools/benchmarks/get_driver.py [--number N]
+"""
+
+import argparse
+import timeit
+from unittest import mock
+
+from stevedore import driver as stevedore_driver
+
+import magnum.conf
+from magnum.drivers.common import driver
+from magnum.objects import cluster_template
+
+CONF = magnum.conf.CONF
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000,
+                        help='Number of calls to time.')
+    args = parser.parse_args()
+
+    ct = mock.Mock(server_type='vm', cluster_distro='fedora-coreos',
+                   coe='kubernetes')
+    cluster = mock.Mock(cluster_template_id='fake-uuid')
+    definitions = driver.Driver.get_drivers()
+    entry_point_name = definitions[
+        (ct.server_type, ct.cluster_distro, ct.coe)]['entry_point_name']
+
+    def stevedore_get_driver_for_cluster():
+        cluster_template.ClusterTemplate.get_by_uuid(
+            None, cluster.cluster_template_id)
+        return stevedore_driver.DriverManager(
+            "magnum.drivers", entry_point_name).driver()
+
+    def cached_get_driver_for_cluster():
+        return driver.Driver.get_driver_for_cluster(None, cluster)
+
+    with mock.patch.object(cluster_template.ClusterTemplate, 'get_by_uuid',
+                           return_value=ct):
+        for name, func in (
+                ('stevedore per call', stevedore_get_driver_for_cluster),
+                ('shared instance', cached_get_driver_for_cluster)):
+            elapsed = timeit.timeit(func, number=args.number)
+            print('%-20s %10.2f us/call' % (name,
+                                            elapsed / args.number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the cost of parsing the Kubernetes quantities of a pod list.
+
+Builds a list of --pods pods with one to three containers each, whose
+limits are mostly the usual values (500m, 1Gi, ...) and sometimes odd ones,
+as in a real cluster. Parses the quantities of their limits with the
+regular expressions magnum.common.utils.get_k8s_quantity used to search
+for on each call, with the current get_k8s_quantity, with the bulk
+get_k8s_quantities, and times K8sMonitor._parse_pod_info over the list.
+
+Usage: python tools/benchmarks/k8s_quantity.py [--pods N]
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from magnum.common import exception
+from magnum.common import utils
+from magnum.drivers.common import k8s_monitor
+
+CPU_LIMITS = ['100m', '250m', '500m', '1', '2']
+MEMORY_LIMITS = ['128Mi', '256Mi', '512Mi', '1Gi', '2Gi', '4G']
+
+
+def legacy_get_k8s_quantity(quantity):
+    """get_k8s_quantity, as it was before its grammar got compiled."""
+    signed_num_regex = r"(^\d+\.\d+)|(^\d+\.)|(\.\d+)|(^\d+)"
+    matched_signed_number = re.search(signed_num_regex, quantity)
+    if matched_signed_number is None:
+        raise exception.UnsupportedK8sQuantityFormat()
+    else:
+        signed_number = matched_signed_number.group(0)
+    suffix = quantity.replace(signed_number, '', 1)
+    if suffix == '':
+        return float(quantity)
+    if re.search(r"^(Ki|Mi|Gi|Ti|Pi|Ei|m|k|M|G|T|P|E|'')$", suffix):
+        return float(signed_number) * utils.MEMORY_UNITS[suffix]
+    elif re.search(r"^[E|e][+|-]?(\d+\.\d+$)|(\d+\.$)|(\.\d+$)|(\d+$)",
+                   suffix):
+        return float(signed_number) * (10 ** float(suffix[1:]))
+    else:
+        raise exception.UnsupportedK8sQuantityFormat()
+
+
+def make_pods(count, rand):
+    pods = []
+    for _ in range(count):
+        containers = []
+        for _ in range(rand.randint(1, 3)):
+            if rand.random() < 0.05:
+                # An odd value, such as one computed by an operator.
+                limits = {'cpu': '%dm' % rand.randint(1, 4000),
+                          'memory': '%dKi' % rand.randint(1, 2 ** 22)}
+            else:
+                limits = {'cpu': rand.choice(CPU_LIMITS),
+                          'memory': rand.choice(MEMORY_LIMITS)}
+            containers.append({'resources': {'limits': limits}})
+        pods.append({'spec': {'containers': containers}})
+    return {'items': pods}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pods', type=int, default=10000,
+                        help='Number of pods in the list.')
+    parser.add_argument('--number', type=int, default=10,
+                        help='Number of times the list is parsed.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the generated pods.')
+    args = parser.parse_args()
+
+    pods = make_pods(args.pods, random.Random(args.seed))
+    quantities = [value
+                  for pod in pods['items']
+                  for container in pod['spec']['containers']
+                  for value in container['resources']['limits'].values()]
+    monitor = k8s_monitor.K8sMonitor(None, None)
+
+    for name, parse in (
+            ('legacy', lambda: [legacy_get_k8s_quantity(quantity)
+                                for quantity in quantities]),
+            ('get_k8s_quantity', lambda: [utils.get_k8s_quantity(quantity)
+                                          for quantity in quantities]),
+            ('get_k8s_quantities',
+             lambda: utils.get_k8s_quantities(quantities)),
+            ('_parse_pod_info', lambda: monitor._parse_pod_info(pods))):
+        elapsed = timeit.timeit(parse, number=args.number)
+        print('%-20s %8.2f ms/list %8.3f us/quantity'
+              % (name, elapsed / args.number * 1e3,
+                 elapsed / args.number / len(quantities) * 1e6))
+    print('%d quantities, %s' % (len(quantities),
+                                 utils.get_k8s_quantity.cache_info()))
+
+
+if __name__ == '__main__':
+    main()